@@ -0,0 +1,109 @@
+"""Benchmark compiled CodeTemplate rendering against per-token regex substitution.
+
+Renders every stock .template file from an engine install, or a synthetic
+ActorClass.h-like template when no engine is given.
+
+Example: python benchmarks/bench_code_templates.py --engine "C:/Program Files/Epic Games/UE_4.27"
+"""
+
+# Standard Library
+import argparse
+import copy
+import re
+import timeit
+from typing import Dict, List
+
+# CrazyHusk
+from crazyhusk.code import CodeTemplate
+from crazyhusk.engine import UnrealEngine
+
+SYNTHETIC_TEMPLATE = """%COPYRIGHT_LINE%
+
+#pragma once
+
+#include "CoreMinimal.h"
+%BASE_CLASS_INCLUDE_DIRECTIVE%
+#include "%UNPREFIXED_CLASS_NAME%.generated.h"
+
+%CLASS_FUNCTION_DECLARATIONS%
+UCLASS(%UCLASS_SPECIFIER_LIST%)
+class %CLASS_MODULE_API_MACRO%%UNPREFIXED_CLASS_NAME% : public %BASE_CLASS_NAME%
+{
+\tGENERATED_BODY()
+%CLASS_PROPERTIES%
+public:
+\t// Sets default values for this actor's properties
+\t%PREFIXED_CLASS_NAME%();
+
+protected:
+\t%CLASS_FUNCTION_DEFINITIONS%
+};
+"""
+
+
+def legacy_make_instance(template: CodeTemplate, **tokens: str) -> str:
+    """Render a template the way CodeTemplate.make_instance did before compiled segments."""
+    missing = {
+        token
+        for match in CodeTemplate.TOKEN_RE.finditer(template.template_string)
+        for token in match.groups()
+    } - set(tokens.keys())
+    if len(missing):
+        raise ValueError(missing)
+    template_string = copy.copy(template.template_string)
+    for token, value in tokens.items():
+        template_string = re.sub(f"%{token}%", value, template_string)
+    return template_string
+
+
+def load_templates(engine_dir: str) -> List[CodeTemplate]:
+    """Load the stock .template files from an engine install."""
+    return list(UnrealEngine.list_engine_code_templates(UnrealEngine(engine_dir)))
+
+
+def make_rows(template: CodeTemplate, count: int) -> List[Dict[str, str]]:
+    """Make token values for rendering a template once per generated class."""
+    return [
+        {token: f"{token.title()}{index}" for token in template.tokens}
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--engine", help="engine base directory with stock templates")
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    templates = load_templates(args.engine) if args.engine else []
+    if not templates:
+        templates = [CodeTemplate("ActorClass.h", SYNTHETIC_TEMPLATE)]
+    batches = [(template, make_rows(template, args.classes)) for template in templates]
+
+    for template, rows in batches:
+        assert template.render_many(rows) == [
+            legacy_make_instance(template, **row) for row in rows
+        ]
+
+    def render_legacy() -> None:
+        for template, rows in batches:
+            for row in rows:
+                legacy_make_instance(template, **row)
+
+    def render_compiled() -> None:
+        for template, rows in batches:
+            template.render_many(rows)
+
+    legacy_time = min(timeit.repeat(render_legacy, number=1, repeat=args.repeat))
+    compiled_time = min(timeit.repeat(render_compiled, number=1, repeat=args.repeat))
+
+    print(f"templates:        {len(templates)} x {args.classes} classes")
+    print(f"per-token re.sub: {legacy_time * 1000:.1f} ms")
+    print(f"render_many:      {compiled_time * 1000:.1f} ms")
+    print(f"speedup:          {legacy_time / compiled_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
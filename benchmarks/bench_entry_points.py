@@ -0,0 +1,66 @@
+"""Benchmark UnrealPlugin.validate with cached entry points against per-call entry point resolution.
+
+Example: python benchmarks/bench_entry_points.py --plugins 10000
+"""
+
+# Standard Library
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+try:
+    # Standard Library
+    from importlib.metadata import entry_points  # type: ignore
+except ImportError:
+    # Third Party
+    from importlib_metadata import entry_points  # type: ignore
+
+# CrazyHusk
+from crazyhusk.plugin import UnrealPlugin
+
+
+def validate_uncached(plugin: UnrealPlugin) -> None:
+    """Validate a plugin the way UnrealPlugin.validate did before crazyhusk.registry."""
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        group = eps.select(group="crazyhusk.plugin.validators")
+    else:
+        group = eps.get("crazyhusk.plugin.validators", [])
+    for entry_point in group:
+        entry_point.load()(plugin)
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plugins", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        plugin_file = os.path.join(root, "Basic.uplugin")
+        with open(plugin_file, "w", encoding="utf-8") as _plugin_file:
+            _plugin_file.write("{}")
+        plugins: List[UnrealPlugin] = [
+            UnrealPlugin(plugin_file) for _ in range(args.plugins)
+        ]
+
+        start = time.perf_counter()
+        for plugin in plugins:
+            validate_uncached(plugin)
+        uncached_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for plugin in plugins:
+            plugin.validate()
+        cached_time = time.perf_counter() - start
+
+    print(f"plugins validated:   {args.plugins}")
+    print(f"entry_points():      {args.plugins / uncached_time:,.0f} calls/s")
+    print(f"crazyhusk.registry:  {args.plugins / cached_time:,.0f} calls/s")
+    print(f"speedup:             {uncached_time / cached_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
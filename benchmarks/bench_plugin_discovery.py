@@ -0,0 +1,91 @@
+"""Benchmark plugin discovery against a synthetic Plugins tree.
+
+Example: python benchmarks/bench_plugin_discovery.py --plugins 500
+"""
+
+# Standard Library
+import argparse
+import os
+import tempfile
+import timeit
+from typing import List
+
+# CrazyHusk
+from crazyhusk.discovery import PluginIndex, find_plugin_files
+
+
+def make_plugins_tree(root: str, plugin_count: int, files_per_dir: int) -> None:
+    """Create a Plugins tree shaped like an engine install: categories, plugins, and heavy payload folders."""
+    for index in range(plugin_count):
+        plugin_dir = os.path.join(root, f"Category{index % 12}", f"Plugin{index}")
+        for payload in ("Content", "Source", "Binaries", "Intermediate", "Resources"):
+            for depth in range(3):
+                payload_dir = os.path.join(
+                    plugin_dir, payload, *[f"Sub{depth}"] * depth
+                )
+                os.makedirs(payload_dir, exist_ok=True)
+                for file_index in range(files_per_dir):
+                    open(
+                        os.path.join(payload_dir, f"File{file_index}.bin"), "w"
+                    ).close()
+        with open(
+            os.path.join(plugin_dir, f"Plugin{index}.uplugin"), "w", encoding="utf-8"
+        ) as plugin_file:
+            plugin_file.write("{}")
+
+
+def walk_plugin_files(plugins_dir: str) -> List[str]:
+    """Discover plugins the way UnrealEngine.plugins did before find_plugin_files."""
+    found = []
+    for _root, _dirs, _files in os.walk(plugins_dir):
+        for _file in _files:
+            if os.path.splitext(_file)[-1] == ".uplugin":
+                found.append(os.path.join(_root, _file))
+                break
+    return found
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plugins", type=int, default=500)
+    parser.add_argument("--files-per-dir", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as cache:
+        make_plugins_tree(root, args.plugins, args.files_per_dir)
+        walked = walk_plugin_files(root)
+        scanned = list(find_plugin_files(root))
+        assert sorted(walked) == sorted(scanned)
+
+        walk_time = min(
+            timeit.repeat(lambda: walk_plugin_files(root), number=1, repeat=args.repeat)
+        )
+        scan_time = min(
+            timeit.repeat(
+                lambda: list(find_plugin_files(root)), number=1, repeat=args.repeat
+            )
+        )
+
+        cold_index = PluginIndex.for_directory(root, cache)
+        for plugin_file in cold_index.plugin_files():
+            cold_index.descriptor_data(plugin_file)
+        cold_index.save()
+
+        def warm_lookup() -> None:
+            index = PluginIndex.for_directory(root, cache)
+            for plugin_file in index.plugin_files():
+                index.descriptor_data(plugin_file)
+
+        index_time = min(timeit.repeat(warm_lookup, number=1, repeat=args.repeat))
+
+    print(f"plugins discovered:  {len(scanned)}")
+    print(f"os.walk:             {walk_time * 1000:.1f} ms")
+    print(f"find_plugin_files:   {scan_time * 1000:.1f} ms")
+    print(f"speedup:             {walk_time / scan_time:.1f}x")
+    print(f"warm PluginIndex:    {index_time * 1000:.1f} ms (including descriptors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark log processing over many sequential UnrealEngine.run invocations.
+
+Compares adding run filters to the shared logger on every run, as UnrealEngine.run
+used to, with a RunLogPipeline built per run. Process output is simulated so only
+the log processing cost is measured.
+
+Example: python benchmarks/bench_run_log_filters.py --runs 1000
+"""
+
+# Standard Library
+import argparse
+import logging
+import time
+from typing import Callable, List
+
+# CrazyHusk
+from crazyhusk.logs import (
+    FilterEngineRun,
+    FilterUBTWarnings,
+    FilterUE4Logs,
+    RunLogPipeline,
+)
+
+OUTPUT_LINES = [
+    "[2021.11.29-21.06.49:745][  0]LogConfig: Setting CVar [[r.BloomQuality:5]]",
+    "[2021.11.29-21.06.49:746][  0]LogInit: Warning: Incompatible or missing module",
+    "/path/to/myfile.cpp(32): error C3861: 'assert': identifier not found",
+    "@progress 'Compiling C++ source code...' 59%",
+    "LogPluginManager: Mounting plugin SunPosition",
+]
+
+
+def make_logger(name: str) -> logging.Logger:
+    """Create an isolated logger which handles records without writing them anywhere."""
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def legacy_run(logger: logging.Logger, lines: List[str]) -> None:
+    """Log one run's output the way UnrealEngine.run did before RunLogPipeline."""
+    logger.addFilter(FilterEngineRun("UE4Editor-Cmd", "-run=Test"))
+    for log_filter in (FilterUBTWarnings, FilterUE4Logs):
+        logger.addFilter(log_filter())
+    for line in lines:
+        logger.info(line)
+
+
+def pipeline_run(logger: logging.Logger, lines: List[str]) -> None:
+    """Log one run's output through a per-run RunLogPipeline."""
+    with RunLogPipeline(
+        "UE4Editor-Cmd",
+        "-run=Test",
+        logger=logger,
+        filters=[FilterUBTWarnings(), FilterUE4Logs()],
+    ) as run_log:
+        for line in lines:
+            run_log.log(line)
+
+
+def time_runs(
+    run: Callable[[logging.Logger, List[str]], None],
+    logger: logging.Logger,
+    lines: List[str],
+    runs: int,
+) -> List[float]:
+    """Time each of a number of sequential runs."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run(logger, lines)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=50)
+    parser.add_argument(
+        "--legacy-runs",
+        type=int,
+        default=200,
+        help="runs of the legacy approach, which slows down quadratically",
+    )
+    args = parser.parse_args()
+
+    lines = (OUTPUT_LINES * (args.lines // len(OUTPUT_LINES) + 1))[: args.lines]
+    legacy_logger = make_logger("bench.legacy")
+    pipeline_logger = make_logger("bench.pipeline")
+
+    legacy = time_runs(legacy_run, legacy_logger, lines, args.legacy_runs)
+    pipeline = time_runs(pipeline_run, pipeline_logger, lines, args.runs)
+
+    print(
+        f"runs x lines:        {args.runs} (legacy {args.legacy_runs}) x {args.lines}"
+    )
+    print(f"legacy filters left: {len(legacy_logger.filters)}")
+    print(f"pipeline filters:    {len(pipeline_logger.filters)}")
+    print(
+        f"legacy:   first run {legacy[0] * 1000:.2f} ms, last run {legacy[-1] * 1000:.2f} ms, total {sum(legacy):.2f} s"
+    )
+    print(
+        f"pipeline: first run {pipeline[0] * 1000:.2f} ms, last run {pipeline[-1] * 1000:.2f} ms, total {sum(pipeline):.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
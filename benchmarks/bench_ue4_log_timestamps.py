@@ -0,0 +1,80 @@
+"""Benchmark parsing timestamps of a synthetic UE4Editor log.
+
+Compares datetime.strptime and calendar.timegm, as FilterUE4Logs used to, with
+parse_ue4_timestamp, both on their own and through FilterUE4Logs.
+
+Example: python benchmarks/bench_ue4_log_timestamps.py --lines 1000000
+"""
+
+# Standard Library
+import argparse
+import calendar
+import logging
+import time
+from datetime import datetime
+from typing import List
+
+# CrazyHusk
+from crazyhusk.logs import FilterUE4Logs, parse_ue4_timestamp
+
+START = 1638220009
+
+
+def make_lines(count: int, lines_per_second: int) -> List[str]:
+    """Make editor log lines with timestamps advancing lines_per_second at a time."""
+    lines = []
+    for index in range(count):
+        msecs = START * 1000 + index * 1000 // lines_per_second
+        timestamp = time.strftime("%Y.%m.%d-%H.%M.%S", time.gmtime(msecs // 1000))
+        lines.append(
+            f"[{timestamp}:{msecs % 1000:03d}][{index % 1000:3d}]LogTemp: Display: line {index}"
+        )
+    return lines
+
+
+def legacy_parse(timestamp: str) -> float:
+    """Parse a timestamp the way FilterUE4Logs did before parse_ue4_timestamp."""
+    return calendar.timegm(
+        datetime.strptime(timestamp, "%Y.%m.%d-%H.%M.%S:%f").timetuple()
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--lines-per-second", type=int, default=500)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines, args.lines_per_second)
+    timestamps = [line[1:24] for line in lines]
+
+    start = time.perf_counter()
+    for timestamp in timestamps:
+        legacy_parse(timestamp)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for timestamp in timestamps:
+        parse_ue4_timestamp(timestamp)
+    parse_time = time.perf_counter() - start
+
+    log_filter = FilterUE4Logs()
+    records = [
+        logging.LogRecord("bench", logging.INFO, "", 0, line, (), None)
+        for line in lines
+    ]
+    start = time.perf_counter()
+    for record in records:
+        log_filter.filter(record)
+    filter_time = time.perf_counter() - start
+
+    print(f"lines:               {args.lines}")
+    print(f"strptime + timegm:   {legacy_time:.2f} s")
+    print(f"parse_ue4_timestamp: {parse_time:.2f} s")
+    print(f"speedup:             {legacy_time / parse_time:.1f}x")
+    print(f"FilterUE4Logs:       {filter_time:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
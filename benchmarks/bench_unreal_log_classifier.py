@@ -0,0 +1,72 @@
+"""Benchmark classifying mixed UnrealBuildTool and editor output.
+
+Compares running FilterUBTWarnings and FilterUE4Logs on every line, as the
+default crazyhusk.engine.filters used to, with the single FilterUnrealLogs.
+The mix includes long lines, such as shader compiler dumps.
+
+Example: python benchmarks/bench_unreal_log_classifier.py --lines 200000
+"""
+
+# Standard Library
+import argparse
+import logging
+import time
+from typing import Any, List, Sequence
+
+# CrazyHusk
+from crazyhusk.logs import FilterUBTWarnings, FilterUE4Logs, FilterUnrealLogs
+
+OUTPUT_LINES = [
+    "[2021.11.29-21.06.49:745][  0]LogConfig: Setting CVar [[r.BloomQuality:5]]",
+    "[2021.11.29-21.06.49:746][  0]LogInit: Warning: Incompatible or missing module",
+    "[2021.11.29-21.06.50:112][ 12]LogShaderCompilers: Display: "
+    + "Shader [Struct] (Param) ] " * 200,
+    "/path/to/myfile.cpp(32): error C3861: 'assert': identifier not found",
+    "C:\\Program Files (x86)\\MyFile.cpp(32,5): warning C4996: 'x': deprecated",
+    "@progress 'Compiling C++ source code...' 59%",
+    "[8/17] MainMenuPlayerController.gen.cpp",
+    "Module.Engine.cpp (" + "define(X) " * 400,
+    "LogPluginManager: Mounting plugin SunPosition",
+]
+
+
+def make_records(lines: List[str]) -> List[logging.LogRecord]:
+    """Make a fresh LogRecord for every line."""
+    return [
+        logging.LogRecord("bench", logging.INFO, "", 0, line, (), None)
+        for line in lines
+    ]
+
+
+def time_filters(filters: Sequence[Any], lines: List[str]) -> float:
+    """Time applying a chain of filters to a LogRecord of every line."""
+    records = make_records(lines)
+    start = time.perf_counter()
+    for record in records:
+        for log_filter in filters:
+            log_filter.filter(record)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=200000)
+    args = parser.parse_args()
+
+    lines = (OUTPUT_LINES * (args.lines // len(OUTPUT_LINES) + 1))[: args.lines]
+    separate_time = time_filters([FilterUBTWarnings(), FilterUE4Logs()], lines)
+    combined_time = time_filters([FilterUnrealLogs()], lines)
+
+    print(f"lines:                             {args.lines}")
+    print(
+        f"FilterUBTWarnings + FilterUE4Logs: {args.lines / separate_time:,.0f} lines/s"
+    )
+    print(
+        f"FilterUnrealLogs:                  {args.lines / combined_time:,.0f} lines/s"
+    )
+    print(f"speedup:                           {separate_time / combined_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
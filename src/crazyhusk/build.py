@@ -6,7 +6,10 @@ from __future__ import annotations
 # Standard Library
 import platform
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
+
+# CrazyHusk
+from crazyhusk.logs import FilterUBTDiagnostics
 
 if TYPE_CHECKING:
     # CrazyHusk
@@ -110,9 +113,22 @@ class UnrealBuild(object):
         configuration: Optional[str] = None,
         build_platform: Optional[str] = None,
         static_analyzer: Optional[str] = None,
+        aggregate_diagnostics: bool = False,
+        diagnostics_file: Optional[str] = None,
     ) -> None:
-        """Initialize a new UnrealBuild."""
+        """Initialize a new UnrealBuild.
+
+        When aggregate_diagnostics is set or a diagnostics_file is given, repeats of each
+        UnrealBuildTool diagnostic are suppressed from the log of a run, and counted in
+        diagnostics. A summary is written to diagnostics_file when a run ends, as SARIF
+        if it ends with .sarif, otherwise as JSON.
+        """
         self.buildable = buildable
+        self.aggregate_diagnostics: bool = aggregate_diagnostics or (
+            diagnostics_file is not None
+        )
+        self.diagnostics_file: Optional[str] = diagnostics_file
+        self.diagnostics: Optional[FilterUBTDiagnostics] = None
         if target is None:
             self.target = self.buildable.default_build_target()
         else:
@@ -182,10 +198,51 @@ class UnrealBuild(object):
         **extra_parameters: str,
     ) -> int:
         """Execute the currently configured build subprocess for this UnrealBuild."""
+        engine, cmd = self.__build_command(*extra_switches, **extra_parameters)
+        log_filters = self.__log_filters()
+        try:
+            with engine:
+                return engine.run(
+                    *cmd, expected_retcodes={0, 2}, log_filters=log_filters
+                )
+        finally:
+            self.__write_diagnostics()
+
+    async def run_async(
+        self,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> int:
+        """Execute the currently configured build in an asyncio subprocess for this UnrealBuild."""
+        engine, cmd = self.__build_command(*extra_switches, **extra_parameters)
+        log_filters = self.__log_filters()
+        try:
+            return await engine.run_async(
+                *cmd, expected_retcodes={0, 2}, log_filters=log_filters
+            )
+        finally:
+            self.__write_diagnostics()
+
+    def __log_filters(self) -> List[Any]:
+        if not self.aggregate_diagnostics:
+            return []
+        self.diagnostics = FilterUBTDiagnostics()
+        return [self.diagnostics]
+
+    def __write_diagnostics(self) -> None:
+        if self.diagnostics is not None and self.diagnostics_file is not None:
+            self.diagnostics.dump(self.diagnostics_file)
+
+    def __build_command(
+        self,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> Tuple[UnrealEngine, List[str]]:
         if not self.buildable.is_buildable():
             raise ValueError(f"Buildable: {self.buildable!r} cannot be built.")
 
-        if self.buildable.engine is None:
+        engine = self.buildable.engine
+        if engine is None:
             raise ValueError(
                 f"Buildable: {self.buildable!r} could not resolve a valid UnrealEngine."
             )
@@ -193,14 +250,12 @@ class UnrealBuild(object):
         if self.static_analyzer is not None:
             extra_parameters["StaticAnalyzer"] = self.static_analyzer
 
-        with self.buildable.engine:
-            return self.buildable.engine.run(
-                *self.buildable.get_build_command(
-                    self.target,
-                    self.configuration,
-                    self.platform,
-                    *extra_switches,
-                    **extra_parameters,
-                ),
-                expected_retcodes={0, 2},
+        return engine, list(
+            self.buildable.get_build_command(
+                self.target,
+                self.configuration,
+                self.platform,
+                *extra_switches,
+                **extra_parameters,
             )
+        )
@@ -1,9 +1,27 @@
 """Wrapper objects for Unreal code templates."""
 
+# Future Standard Library
+from __future__ import annotations
+
 # Standard Library
-import copy
+import os
 import re
-from typing import Set
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 
 class CodeTemplateError(Exception):
@@ -14,35 +32,245 @@ class CodeTemplate(object):
     """Object wrapper for working with Unreal's code templating system for C++."""
 
     TOKEN_RE = re.compile(r"\%([A-Z_]+)\%", flags=re.MULTILINE)
+    SEGMENT_RE = re.compile(r"\%([A-Z_][A-Z0-9_]*)\%")
+
+    def __init__(
+        self,
+        name: str,
+        template_string: Optional[str] = None,
+        template_file: Optional[str] = None,
+    ) -> None:
+        """Initialize a new CodeTemplate.
 
-    def __init__(self, name: str, template_string: str = "") -> None:
-        """Initialize a new CodeTemplate."""
+        When only a template_file is given, its contents are read on first use.
+        """
         self.name: str = name
-        self.template_string: str = template_string
+        self.template_file: Optional[str] = template_file
+        self.__template_string: Optional[str] = None
+        self.__segments: Optional[Tuple[str, ...]] = None
+        self.__tokens: Optional[Set[str]] = None
+        self.template_string = template_string  # type: ignore
 
     def __repr__(self) -> str:
         """Python interpreter representation of CodeTemplate."""
         return f"<CodeTemplate {self.name}>"
 
+    @staticmethod
+    def from_file(template_file: str) -> CodeTemplate:
+        """Create a CodeTemplate named after a .template file, without reading it yet."""
+        return CodeTemplate(
+            os.path.basename(os.path.splitext(template_file)[0]),
+            template_file=template_file,
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the text of this CodeTemplate is in memory."""
+        return self.__template_string is not None
+
+    @property
+    def template_string(self) -> str:
+        """Get the raw template text of this CodeTemplate, reading its template_file if needed."""
+        if self.__template_string is None:
+            if self.template_file is None:
+                return ""
+            with open(self.template_file, encoding="utf-8") as _template_file:
+                self.__template_string = _template_file.read()
+        return self.__template_string
+
+    @template_string.setter
+    def template_string(self, value: Optional[str]) -> None:
+        """Set the raw template text of this CodeTemplate, discarding any compiled form."""
+        self.__template_string = value
+        self.__segments = None
+        self.__tokens = None
+
+    @property
+    def segments(self) -> Tuple[str, ...]:
+        """Get the compiled template: literal text at even indices, token names at odd indices."""
+        if self.__segments is None:
+            self.__compile()
+        return self.__segments  # type: ignore
+
     @property
     def tokens(self) -> Set[str]:
         """Get the set of string replacement tokens expressed by this CodeTemplate."""
-        return {
-            token
-            for match in CodeTemplate.TOKEN_RE.finditer(self.template_string)
-            for token in match.groups()
-        }
+        if self.__tokens is None:
+            self.__compile()
+        return set(self.__tokens)  # type: ignore
 
     def make_instance(self, **tokens: str) -> str:
         """Create a templated string using the supplied tokens with this CodeTemplate."""
-        missing = self.tokens - set(tokens.keys())
+        return self.render(tokens)
+
+    def render(self, tokens: Mapping[str, str]) -> str:
+        """Create a templated string from a mapping of token values with this CodeTemplate."""
+        if self.__tokens is None:
+            self.__compile()
+        missing = self.__tokens - tokens.keys()  # type: ignore
         if len(missing):
             raise CodeTemplateError(
                 f"Cannot instantiate template: {self.name} - missing required tokens: {missing}"
             )
 
-        result = copy.copy(self.template_string)
-        for token, value in tokens.items():
-            result = re.sub(r"\%{}\%".format(token), value, result)
+        segments: Tuple[str, ...] = self.__segments  # type: ignore
+        parts: List[str] = list(segments)
+        for index in range(1, len(segments), 2):
+            value = tokens.get(segments[index])
+            if value is not None:
+                parts[index] = value
+            else:
+                parts[index] = f"%{segments[index]}%"
+        return "".join(parts)
+
+    def render_many(self, rows: Iterable[Mapping[str, str]]) -> List[str]:
+        """Create one templated string per mapping of token values."""
+        return [self.render(row) for row in rows]
+
+    def __compile(self) -> None:
+        template_string = self.template_string or ""
+        self.__segments = tuple(CodeTemplate.SEGMENT_RE.split(template_string))
+        # Required tokens are taken from the compiled segments, so every token
+        # reported by `tokens` is one that render() substitutes.
+        self.__tokens = {
+            token
+            for token in self.__segments[1::2]
+            if CodeTemplate.TOKEN_RE.fullmatch(f"%{token}%")
+        }
+
+
+class CodeTemplateCatalog(Mapping[str, CodeTemplate]):
+    """Read-only mapping of code template names to lazily loaded CodeTemplates.
+
+    Templates are discovered by name and path on first access only; their text is
+    read when a template is first rendered. A catalog may fall back to a parent
+    catalog, so a project's catalog shares the templates of its engine.
+    """
+
+    def __init__(
+        self,
+        discover: Callable[[], Iterable[CodeTemplate]],
+        parent: Optional[Mapping[str, CodeTemplate]] = None,
+    ) -> None:
+        """Initialize a new CodeTemplateCatalog."""
+        self.parent: Optional[Mapping[str, CodeTemplate]] = parent
+        self.__discover = discover
+        self.__templates: Optional[Dict[str, CodeTemplate]] = None
+        self.__lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of CodeTemplateCatalog."""
+        return f"<CodeTemplateCatalog {sorted(self)}>"
+
+    def __getitem__(self, name: str) -> CodeTemplate:
+        """Get a CodeTemplate by name, preferring this catalog over its parent."""
+        template = self.templates.get(name)
+        if template is not None:
+            return template
+        if self.parent is not None:
+            return self.parent[name]
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the names of every CodeTemplate in this catalog and its parent."""
+        yield from self.templates
+        if self.parent is not None:
+            for name in self.parent:
+                if name not in self.templates:
+                    yield name
+
+    def __len__(self) -> int:
+        """Count every CodeTemplate in this catalog and its parent."""
+        return sum(1 for _name in self)
+
+    @property
+    def templates(self) -> Dict[str, CodeTemplate]:
+        """Get the CodeTemplates discovered by this catalog, excluding its parent."""
+        if self.__templates is None:
+            with self.__lock:
+                if self.__templates is None:
+                    self.__templates = {
+                        template.name: template for template in self.__discover()
+                    }
+        return self.__templates
+
+    def refresh(self) -> None:
+        """Forget discovered CodeTemplates so they are listed again on next access."""
+        with self.__lock:
+            self.__templates = None
+
+
+@dataclass
+class CodeGenerationJob:
+    """A CodeTemplate to render with a mapping of tokens into a destination file."""
+
+    template: CodeTemplate
+    tokens: Mapping[str, str]
+    destination: str
+
+
+@dataclass
+class CodeGenerationResult:
+    """Destination files written or left untouched by generate_code."""
+
+    written: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+
+def write_if_changed(destination: str, content: str) -> bool:
+    """Atomically write content to a file, unless the file already holds exactly that content.
+
+    Unchanged files keep their mtime, so UnrealBuildTool does not rebuild their dependents.
+    """
+    data = content.encode("utf-8")
+    try:
+        if os.stat(destination).st_size == len(data):
+            with open(destination, "rb") as _existing_file:
+                if _existing_file.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    temp_file = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_file, "wb") as _temp_file:
+            _temp_file.write(data)
+        if os.path.exists(destination):
+            shutil.copymode(destination, temp_file)
+        os.replace(temp_file, destination)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    return True
+
+
+def generate_code(
+    jobs: Iterable[
+        Union[CodeGenerationJob, Tuple[CodeTemplate, Mapping[str, str], str]]
+    ],
+    max_workers: Optional[int] = None,
+) -> CodeGenerationResult:
+    """Render a batch of CodeTemplates into files using a thread pool, writing only files whose content changed."""
+    job_list = [
+        job if isinstance(job, CodeGenerationJob) else CodeGenerationJob(*job)
+        for job in jobs
+    ]
+    destinations = [os.path.abspath(job.destination) for job in job_list]
+    if len(set(destinations)) != len(destinations):
+        raise CodeTemplateError(
+            "Cannot generate code: multiple jobs share the same destination file."
+        )
+
+    def run_job(job: CodeGenerationJob) -> bool:
+        return write_if_changed(job.destination, job.template.render(job.tokens))
 
-        return result
+    result = CodeGenerationResult()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for job, written in zip(job_list, executor.map(run_job, job_list)):
+            if written:
+                result.written.append(job.destination)
+            else:
+                result.skipped.append(job.destination)
+    return result
@@ -1,8 +1,31 @@
 """Object wrappers for working with Unreal Engine config files."""
 
+# Future Standard Library
+from __future__ import annotations
+
 # Standard Library
+import codecs
 import configparser
+import json
+import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 CONFIG_CATEGORIES = frozenset(
     [
@@ -34,7 +57,11 @@ class UnrealConfigError(Exception):
 
 
 class UnrealConfigParser(configparser.RawConfigParser):
-    """Object wrapper representing a configuration stack."""
+    """Object wrapper representing a configuration stack.
+
+    Array operators are stripped from keys rather than applied, so only the last
+    value of each key survives; use ConfigSnapshot for Unreal's array semantics.
+    """
 
     RE_OPTION_SPECIALCHARS = re.compile(r"^([+-.!])")
 
@@ -45,3 +72,400 @@ class UnrealConfigParser(configparser.RawConfigParser):
     def optionxform(self, optionstr: str) -> str:
         """Transform the string used by ConfigParsers for use with key expression of options."""
         return UnrealConfigParser.RE_OPTION_SPECIALCHARS.sub("", optionstr)
+
+    @staticmethod
+    def from_files(config_files: Iterable[str]) -> UnrealConfigParser:
+        """Create a configuration stack from ini files, lowest priority first, using cached ConfigLayers."""
+        _config = UnrealConfigParser()
+        for config_file in config_files:
+            layer = ConfigLayer.load(config_file)
+            if layer is not None:
+                _config.read_layer(layer)
+        return _config
+
+    def read_layer(self, layer: ConfigLayer) -> None:
+        """Merge a parsed ConfigLayer on top of this configuration stack."""
+        for section, key, value in layer.entries:
+            if section != self.default_section and not self.has_section(section):
+                self.add_section(section)
+            self.set(section, key, value)
+
+
+class ConfigLayer(object):
+    """Parsed contents of a single ini file: an ordered sequence of (section, key, value) entries.
+
+    Keys keep their leading array operator (+, -, ., !). Use ConfigLayer.load to
+    share parsed layers, which are only parsed again when a file's mtime or size changes.
+    """
+
+    __cache: Dict[str, Tuple[int, int, ConfigLayer]] = {}
+    __cache_lock = threading.Lock()
+
+    def __init__(
+        self, config_file: str, entries: Tuple[Tuple[str, str, str], ...] = ()
+    ) -> None:
+        """Initialize a new ConfigLayer."""
+        self.config_file: str = config_file
+        self.entries: Tuple[Tuple[str, str, str], ...] = entries
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of ConfigLayer."""
+        return f"<ConfigLayer {self.config_file}>"
+
+    @staticmethod
+    def load(config_file: str) -> Optional[ConfigLayer]:
+        """Get the parsed ConfigLayer of an ini file, or None if it does not exist."""
+        try:
+            stat = os.stat(config_file)
+        except OSError:
+            return None
+
+        cached = ConfigLayer.__cache.get(config_file)
+        if (
+            cached is not None
+            and cached[0] == stat.st_mtime_ns
+            and cached[1] == stat.st_size
+        ):
+            return cached[2]
+
+        try:
+            with open(config_file, "rb") as _config_file:
+                data = _config_file.read()
+        except OSError:
+            return None
+        layer = ConfigLayer(config_file, ConfigLayer.parse(ConfigLayer.decode(data)))
+        with ConfigLayer.__cache_lock:
+            ConfigLayer.__cache[config_file] = (
+                stat.st_mtime_ns,
+                stat.st_size,
+                layer,
+            )
+        return layer
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget all cached ConfigLayers."""
+        with ConfigLayer.__cache_lock:
+            ConfigLayer.__cache.clear()
+
+    @staticmethod
+    def decode(data: bytes) -> str:
+        """Decode the raw bytes of an ini file, which Unreal saves as UTF-8 or UTF-16 with a BOM."""
+        if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return data.decode("utf-16", errors="replace")
+        return data.decode("utf-8-sig", errors="replace")
+
+    @staticmethod
+    def parse(text: str) -> Tuple[Tuple[str, str, str], ...]:
+        """Parse ini text into (section, key, value) entries, in file order.
+
+        Lines are trimmed, and lines outside a section, comments and lines without
+        a key are ignored, as they are by Unreal.
+        """
+        entries: List[Tuple[str, str, str]] = []
+        section: Optional[str] = None
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped[0] in ";#":
+                continue
+            if stripped[0] == "[" and stripped[-1] == "]":
+                section = stripped[1:-1].strip()
+                continue
+            if section is None:
+                continue
+            key, separator, value = stripped.partition("=")
+            key = key.strip()
+            if not separator or not key:
+                continue
+            entries.append((section, key, value.strip()))
+        return tuple(entries)
+
+
+class ConfigSnapshot(Mapping[str, Mapping[str, Tuple[str, ...]]]):
+    """Immutable, merged view of a configuration stack with Unreal's array operators applied.
+
+    Maps section names to mappings of keys to the tuple of values the key holds.
+    Section and key lookups through get_value and get_list are case-insensitive, as in Unreal.
+
+    Operators, applied in file order from the lowest priority file:
+        Key=Value   replace every value of Key with Value
+        +Key=Value  add Value, unless Key already holds it
+        .Key=Value  add Value, even if Key already holds it
+        -Key=Value  remove a single matching Value
+        !Key=Value  remove Key, clearing every value it holds
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        sections: Mapping[str, Mapping[str, Iterable[str]]],
+        config_files: Iterable[str] = (),
+    ) -> None:
+        """Initialize a new ConfigSnapshot from already merged sections."""
+        self.config_files: Tuple[str, ...] = tuple(config_files)
+        self.__sections: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType(
+            {
+                section: MappingProxyType(
+                    {key: tuple(values) for key, values in options.items()}
+                )
+                for section, options in sections.items()
+            }
+        )
+        self.__section_names: Dict[str, str] = {
+            section.lower(): section for section in self.__sections
+        }
+        self.__key_names: Dict[str, Dict[str, str]] = {
+            section.lower(): {key.lower(): key for key in options}
+            for section, options in self.__sections.items()
+        }
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of ConfigSnapshot."""
+        return f"<ConfigSnapshot of {len(self.config_files)} files>"
+
+    def __getitem__(self, section: str) -> Mapping[str, Tuple[str, ...]]:
+        """Get the options of a section by its exact name."""
+        return self.__sections[section]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate section names."""
+        return iter(self.__sections)
+
+    def __len__(self) -> int:
+        """Count sections."""
+        return len(self.__sections)
+
+    @staticmethod
+    def from_layers(layers: Iterable[ConfigLayer]) -> ConfigSnapshot:
+        """Merge ConfigLayers, lowest priority first, applying Unreal's array operators."""
+        sections: Dict[str, Dict[str, List[str]]] = {}
+        section_names: Dict[str, str] = {}
+        key_names: Dict[str, Dict[str, str]] = {}
+        config_files: List[str] = []
+        for layer in layers:
+            config_files.append(layer.config_file)
+            for section, raw_key, value in layer.entries:
+                section_name = section_names.setdefault(section.lower(), section)
+                options = sections.setdefault(section_name, {})
+                names = key_names.setdefault(section.lower(), {})
+
+                operator = raw_key[0]
+                if operator in "+-.!":
+                    key = raw_key[1:].strip()
+                else:
+                    operator = ""
+                    key = raw_key
+                if operator == "!":
+                    cleared = names.pop(key.lower(), None)
+                    if cleared is not None:
+                        options.pop(cleared, None)
+                    continue
+                key = names.setdefault(key.lower(), key)
+                values = options.setdefault(key, [])
+
+                if operator == "":
+                    values[:] = [value]
+                elif operator == "+":
+                    if value not in values:
+                        values.append(value)
+                elif operator == ".":
+                    values.append(value)
+                elif operator == "-":
+                    if value in values:
+                        values.remove(value)
+        return ConfigSnapshot(sections, config_files)
+
+    @staticmethod
+    def from_files(config_files: Iterable[str]) -> ConfigSnapshot:
+        """Merge ini files, lowest priority first, using cached ConfigLayers."""
+        layers = []
+        for config_file in config_files:
+            layer = ConfigLayer.load(config_file)
+            if layer is not None:
+                layers.append(layer)
+        return ConfigSnapshot.from_layers(layers)
+
+    @staticmethod
+    def from_json(data: str) -> ConfigSnapshot:
+        """Create a ConfigSnapshot from a string produced by to_json."""
+        dct = json.loads(data)
+        if not isinstance(dct, dict) or dct.get("Version") != ConfigSnapshot.VERSION:
+            raise UnrealConfigError("Unsupported config snapshot data.")
+        return ConfigSnapshot(dct.get("Sections", {}), dct.get("Files", []))
+
+    @staticmethod
+    def load(snapshot_file: str) -> ConfigSnapshot:
+        """Read a ConfigSnapshot from a file written by dump."""
+        with open(snapshot_file, encoding="utf-8") as _snapshot_file:
+            return ConfigSnapshot.from_json(_snapshot_file.read())
+
+    def dump(self, snapshot_file: str) -> None:
+        """Write this ConfigSnapshot to a JSON file."""
+        with open(snapshot_file, "w", encoding="utf-8") as _snapshot_file:
+            _snapshot_file.write(self.to_json())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON serializable representation of this ConfigSnapshot."""
+        return {
+            "Version": ConfigSnapshot.VERSION,
+            "Files": list(self.config_files),
+            "Sections": {
+                section: {key: list(values) for key, values in options.items()}
+                for section, options in self.__sections.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        """Serialize this ConfigSnapshot to a JSON string."""
+        return json.dumps(self.to_dict())
+
+    def get_list(self, section: str, key: str) -> Tuple[str, ...]:
+        """Get every value of a key, or an empty tuple if the key is not set."""
+        section_name = self.__section_names.get(section.lower())
+        if section_name is None:
+            return ()
+        key_name = self.__key_names[section.lower()].get(key.lower())
+        if key_name is None:
+            return ()
+        return self.__sections[section_name][key_name]
+
+    def get_value(
+        self, section: str, key: str, fallback: Optional[str] = None
+    ) -> Optional[str]:
+        """Get the last value of a key, or fallback if the key holds no values."""
+        values = self.get_list(section, key)
+        if not values:
+            return fallback
+        return values[-1]
+
+
+def list_config_platforms(*config_dirs: str) -> List[str]:
+    """List the platform subdirectories of Config directories, which hold {Platform}*.ini files."""
+    platforms = set()
+    for config_dir in config_dirs:
+        try:
+            scanner = os.scandir(config_dir)
+        except OSError:
+            continue
+        with scanner:
+            for entry in scanner:
+                if not entry.is_dir():
+                    continue
+                try:
+                    filenames = os.listdir(entry.path)
+                except OSError:
+                    continue
+                if any(
+                    filename.endswith(".ini")
+                    and (
+                        filename.startswith(entry.name)
+                        or filename.startswith(f"Base{entry.name}")
+                    )
+                    for filename in filenames
+                ):
+                    platforms.add(entry.name)
+    return sorted(platforms)
+
+
+@dataclass
+class ConfigMatrixStats:
+    """Timing statistics of building a ConfigMatrix."""
+
+    combinations: int = 0
+    files_read: int = 0
+    read_seconds: float = 0.0
+    merge_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+
+@dataclass
+class ConfigMatrix:
+    """ConfigSnapshots for every evaluated (category, platform) pair, with timing statistics."""
+
+    snapshots: Dict[Tuple[str, Optional[str]], ConfigSnapshot] = field(
+        default_factory=dict
+    )
+    stats: ConfigMatrixStats = field(default_factory=ConfigMatrixStats)
+
+    @staticmethod
+    def build(
+        stacks: Mapping[Tuple[str, Optional[str]], Sequence[str]],
+        max_workers: Optional[int] = None,
+    ) -> ConfigMatrix:
+        """Evaluate config file stacks keyed by (category, platform), reading every distinct ini file once.
+
+        Files are read and parsed, then stacks are merged, in a thread pool.
+        """
+        start = time.perf_counter()
+        config_files = list(
+            dict.fromkeys(
+                config_file for stack in stacks.values() for config_file in stack
+            )
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            layers = dict(
+                zip(config_files, executor.map(ConfigLayer.load, config_files))
+            )
+            read_end = time.perf_counter()
+
+            keys = list(stacks)
+            snapshots = executor.map(
+                lambda key: ConfigSnapshot.from_layers(
+                    layer
+                    for layer in (layers[config_file] for config_file in stacks[key])
+                    if layer is not None
+                ),
+                keys,
+            )
+            matrix = ConfigMatrix(dict(zip(keys, snapshots)))
+        end = time.perf_counter()
+
+        matrix.stats = ConfigMatrixStats(
+            combinations=len(keys),
+            files_read=sum(1 for layer in layers.values() if layer is not None),
+            read_seconds=read_end - start,
+            merge_seconds=end - read_end,
+            total_seconds=end - start,
+        )
+        return matrix
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON serializable representation of this ConfigMatrix."""
+        return {
+            "Stats": {
+                "Combinations": self.stats.combinations,
+                "FilesRead": self.stats.files_read,
+                "ReadSeconds": self.stats.read_seconds,
+                "MergeSeconds": self.stats.merge_seconds,
+                "TotalSeconds": self.stats.total_seconds,
+            },
+            "Configs": [
+                {
+                    "Category": category,
+                    "Platform": platform,
+                    "Config": snapshot.to_dict(),
+                }
+                for (category, platform), snapshot in self.snapshots.items()
+            ],
+        }
+
+
+def config_matrix_to_json(json_file: str, path: str) -> None:
+    """Write the effective config of every category and platform of a .uproject or engine directory to JSON."""
+    # CrazyHusk
+    from crazyhusk.engine import UnrealEngine
+    from crazyhusk.project import UnrealProject
+
+    if os.path.splitext(path)[-1] == ".uproject":
+        matrix = UnrealProject(path).config_matrix()
+    else:
+        matrix = UnrealEngine.get_engine(path).config_matrix()
+
+    with open(json_file, "w", encoding="utf-8") as _json_file:
+        json.dump(matrix.to_dict(), _json_file, indent=4)
+    logging.info(
+        f"Evaluated {matrix.stats.combinations} configs from {matrix.stats.files_read} files "
+        f"in {matrix.stats.total_seconds:.3f}s (read {matrix.stats.read_seconds:.3f}s, "
+        f"merge {matrix.stats.merge_seconds:.3f}s)"
+    )
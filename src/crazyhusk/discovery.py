@@ -0,0 +1,316 @@
+"""Filesystem discovery utilities for Unreal Engine directory layouts."""
+
+# Future Standard Library
+from __future__ import annotations
+
+# Standard Library
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+__all__ = ["PluginIndex", "SourceIndex", "default_cache_dir", "find_plugin_files"]
+
+# Directories which never contain nested plugins, but can contain a very large number of files.
+PLUGIN_SKIP_DIRS = frozenset(
+    [
+        "Binaries",
+        "Content",
+        "DerivedDataCache",
+        "Intermediate",
+        "Resources",
+        "Saved",
+        "Source",
+    ]
+)
+
+
+def default_cache_dir() -> str:
+    """Get the per-user directory used for crazyhusk's persistent caches."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "crazyhusk")
+
+
+def scan_plugin_dir(directory: str) -> Tuple[Optional[str], List[str]]:
+    """Scan a single directory, returning its .uplugin file if any, otherwise the subdirectories worth searching."""
+    subdirs: List[str] = []
+    try:
+        scanner = os.scandir(directory)
+    except OSError:
+        return None, subdirs
+
+    with scanner:
+        for entry in scanner:
+            if entry.name.endswith(".uplugin") and entry.is_file():
+                return entry.path, []
+            if (
+                entry.name not in PLUGIN_SKIP_DIRS
+                and not entry.name.startswith(".")
+                and entry.is_dir(follow_symlinks=False)
+            ):
+                subdirs.append(entry.path)
+    return None, subdirs
+
+
+def find_plugin_files(plugins_dir: str) -> Iterable[str]:
+    """Iterate .uplugin file paths beneath a Plugins directory.
+
+    Mirrors the way Unreal's plugin manager discovers plugins: once a directory
+    holds a .uplugin file, none of its subdirectories are searched.
+    """
+    pending: List[str] = [plugins_dir]
+    while pending:
+        plugin_file, subdirs = scan_plugin_dir(pending.pop())
+        if plugin_file is not None:
+            yield plugin_file
+        else:
+            pending.extend(reversed(subdirs))
+
+
+class PluginIndex(object):
+    """Persistent on-disk index of the plugins found beneath a Plugins directory.
+
+    Directory listings are keyed by directory mtime, so only subtrees which changed
+    since the index was saved are scanned again. Raw .uplugin contents are keyed by
+    file mtime and size.
+    """
+
+    VERSION = 1
+
+    def __init__(self, plugins_dir: str, cache_file: str) -> None:
+        """Initialize a new PluginIndex, loading any previously saved state."""
+        self.plugins_dir: str = plugins_dir
+        self.cache_file: str = cache_file
+        self.__dirs: Dict[str, Dict[str, Any]] = {}
+        self.__descriptors: Dict[str, Dict[str, Any]] = {}
+        self.__dirty: bool = False
+        self.load()
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of PluginIndex."""
+        return f"<PluginIndex {self.plugins_dir} at {self.cache_file}>"
+
+    @staticmethod
+    def for_directory(plugins_dir: str, cache_dir: str) -> PluginIndex:
+        """Create a PluginIndex for a Plugins directory, stored in a shared cache directory."""
+        digest = hashlib.sha1(  # nosec
+            os.path.realpath(plugins_dir).encode("utf-8")
+        ).hexdigest()[:16]
+        return PluginIndex(
+            plugins_dir, os.path.join(cache_dir, f"plugins-{digest}.json")
+        )
+
+    def load(self) -> None:
+        """Load index state from the cache file, discarding it if unreadable or stale."""
+        self.__dirs = {}
+        self.__descriptors = {}
+        try:
+            with open(self.cache_file, encoding="utf-8") as _cache_file:
+                data = json.load(_cache_file)
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("Version") != PluginIndex.VERSION
+            or data.get("PluginsDir") != self.plugins_dir
+        ):
+            return
+        self.__dirs = data.get("Dirs", {})
+        self.__descriptors = data.get("Descriptors", {})
+
+    def save(self) -> None:
+        """Write index state to the cache file, if it changed since it was loaded."""
+        if not self.__dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        temp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as _cache_file:
+            json.dump(
+                {
+                    "Version": PluginIndex.VERSION,
+                    "PluginsDir": self.plugins_dir,
+                    "Dirs": self.__dirs,
+                    "Descriptors": self.__descriptors,
+                },
+                _cache_file,
+            )
+        os.replace(temp_file, self.cache_file)
+        self.__dirty = False
+
+    def plugin_files(self) -> List[str]:
+        """Get the .uplugin file paths beneath this index's Plugins directory, scanning only changed directories."""
+        found: List[str] = []
+        visited = set()
+        pending: List[str] = [self.plugins_dir]
+        while pending:
+            directory = pending.pop()
+            visited.add(directory)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = self.__dirs.get(directory)
+            if cached is None or cached.get("Mtime") != mtime:
+                plugin_file, subdirs = scan_plugin_dir(directory)
+                cached = {"Mtime": mtime, "Plugin": plugin_file, "Subdirs": subdirs}
+                self.__dirs[directory] = cached
+                self.__dirty = True
+
+            if cached["Plugin"] is not None:
+                found.append(cached["Plugin"])
+            else:
+                pending.extend(reversed(cached["Subdirs"]))
+
+        for directory in set(self.__dirs) - visited:
+            del self.__dirs[directory]
+            self.__dirty = True
+        for plugin_file in set(self.__descriptors) - set(found):
+            del self.__descriptors[plugin_file]
+            self.__dirty = True
+        return found
+
+    def descriptor_data(self, plugin_file: str) -> Optional[Dict[str, Any]]:
+        """Get the decoded JSON contents of a .uplugin file, reading it only if it changed."""
+        try:
+            stat = os.stat(plugin_file)
+        except OSError:
+            return None
+
+        cached = self.__descriptors.get(plugin_file)
+        if (
+            cached is not None
+            and cached.get("Mtime") == stat.st_mtime_ns
+            and cached.get("Size") == stat.st_size
+        ):
+            data: Optional[Dict[str, Any]] = cached.get("Data")
+            return data
+
+        try:
+            with open(plugin_file, encoding="utf-8") as json_plugin_file:
+                data = json.load(json_plugin_file)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict):
+            data = None
+
+        self.__descriptors[plugin_file] = {
+            "Mtime": stat.st_mtime_ns,
+            "Size": stat.st_size,
+            "Data": data,
+        }
+        self.__dirty = True
+        return data
+
+
+class SourceIndex(object):
+    """Index of the *.Build.cs and *.Target.cs files beneath a Source directory.
+
+    The tree is walked once on first use. refresh() only lists directories whose
+    mtime changed since the previous walk. Use SourceIndex.for_directory to share
+    one index per Source directory across engines, projects, plugins and modules.
+    """
+
+    __instances: Dict[str, SourceIndex] = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(self, source_dir: str) -> None:
+        """Initialize a new, not yet built, SourceIndex."""
+        self.source_dir: str = source_dir
+        self.__dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self.__build_files: Dict[str, List[str]] = {}
+        self.__target_files: Dict[str, str] = {}
+        self.__built: bool = False
+        self.__lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of SourceIndex."""
+        return f"<SourceIndex {self.source_dir}>"
+
+    @staticmethod
+    def for_directory(source_dir: str) -> SourceIndex:
+        """Get the shared SourceIndex for a Source directory."""
+        real_source_dir = os.path.realpath(source_dir)
+        with SourceIndex.__instances_lock:
+            index = SourceIndex.__instances.get(real_source_dir)
+            if index is None:
+                index = SourceIndex(real_source_dir)
+                SourceIndex.__instances[real_source_dir] = index
+            return index
+
+    @staticmethod
+    def clear_instances() -> None:
+        """Forget all shared SourceIndex instances."""
+        with SourceIndex.__instances_lock:
+            SourceIndex.__instances.clear()
+
+    def build_files(self, module_name: str) -> List[str]:
+        """Get the paths of every {module_name}.Build.cs file in this Source directory."""
+        self.__ensure_built()
+        return list(self.__build_files.get(module_name, []))
+
+    def target_files(self) -> Dict[str, str]:
+        """Get a mapping of target names to *.Target.cs file paths in this Source directory."""
+        self.__ensure_built()
+        return dict(self.__target_files)
+
+    def refresh(self) -> None:
+        """Bring the index up to date, listing only directories which changed since the last walk."""
+        with self.__lock:
+            dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+            pending: List[str] = [self.source_dir]
+            while pending:
+                directory = pending.pop()
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                cached = self.__dirs.get(directory)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, *SourceIndex.__scan(directory))
+                dirs[directory] = cached
+                pending.extend(cached[2])
+
+            build_files: Dict[str, List[str]] = {}
+            target_files: Dict[str, str] = {}
+            for directory in sorted(dirs):
+                for filename in dirs[directory][1]:
+                    if filename.endswith(".Build.cs"):
+                        build_files.setdefault(
+                            filename[: -len(".Build.cs")], []
+                        ).append(os.path.join(directory, filename))
+                    else:
+                        target_files[filename.split(".")[0]] = os.path.join(
+                            directory, filename
+                        )
+
+            self.__dirs = dirs
+            self.__build_files = build_files
+            self.__target_files = target_files
+            self.__built = True
+
+    def __ensure_built(self) -> None:
+        if not self.__built:
+            self.refresh()
+
+    @staticmethod
+    def __scan(directory: str) -> Tuple[List[str], List[str]]:
+        filenames: List[str] = []
+        subdirs: List[str] = []
+        try:
+            scanner = os.scandir(directory)
+        except OSError:
+            return filenames, subdirs
+        with scanner:
+            for entry in scanner:
+                if entry.name.startswith("."):
+                    continue
+                if entry.name.endswith((".Build.cs", ".Target.cs")):
+                    if entry.is_file():
+                        filenames.append(entry.name)
+                elif entry.is_dir():
+                    subdirs.append(entry.path)
+        return filenames, subdirs
@@ -4,25 +4,50 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
 import glob
 import json
 import logging
 import os
 import subprocess  # nosec
+import threading
+import time
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
-try:
-    # Standard Library
-    from importlib.metadata import entry_points  # type:ignore
-except ImportError:
-    # Third Party
-    from importlib_metadata import entry_points  # type:ignore
-
 # CrazyHusk
 from crazyhusk.build import Buildable
-from crazyhusk.code import CodeTemplate
-from crazyhusk.config import CONFIG_CATEGORIES, UnrealConfigParser
-from crazyhusk.logs import FilterEngineRun
+from crazyhusk.code import CodeTemplate, CodeTemplateCatalog
+from crazyhusk.config import (
+    CONFIG_CATEGORIES,
+    ConfigMatrix,
+    ConfigSnapshot,
+    UnrealConfigParser,
+    list_config_platforms,
+)
+from crazyhusk.discovery import PluginIndex, SourceIndex, find_plugin_files
+from crazyhusk.logs import (
+    BACKPRESSURE_BLOCK,
+    DEFAULT_ABORT_PATTERNS,
+    DEFAULT_LOG_QUEUE_SIZE,
+    AbortPatterns,
+    LogQueueMetrics,
+    QueuedRunLogPipeline,
+    RunLogPipeline,
+)
+from crazyhusk.process import (
+    DEFAULT_KILL_GRACE,
+    DEFAULT_TAIL_LINES,
+    AsyncProcess,
+    OutputCapture,
+    ProcessSampler,
+    ProcessStreams,
+    ProcessUsage,
+    RunResult,
+    Watchdog,
+    kill_process_tree,
+    wait_process,
+)
+from crazyhusk.registry import load_entry_points
 
 if TYPE_CHECKING:
     # CrazyHusk
@@ -31,6 +56,12 @@ if TYPE_CHECKING:
 
 __all__ = ["UnrealEngine", "UnrealEngineError"]
 
+# Interned UnrealEngine instances, keyed by real base directory, with the on-disk signature they were created against.
+_ENGINES: Dict[str, Tuple[Tuple[Optional[int], ...], UnrealEngine]] = {}
+# Real base directories of engines previously resolved by EngineAssociation.
+_ASSOCIATIONS: Dict[str, str] = {}
+_ENGINES_LOCK = threading.RLock()
+
 
 class UnrealEngineError(Exception):
     """Custom exception representing errors encountered with UnrealEngine."""
@@ -40,6 +71,26 @@ class UnrealExecutionError(Exception):
     """Custom exception representing errors encountered within a subprocess call of Unreal Engine executables."""
 
 
+class UnrealExecutionAbortedError(UnrealExecutionError):
+    """Custom exception representing a subprocess of an Unreal Engine executable stopped by one of its abort patterns."""
+
+    def __init__(self, message: str, line: str, matched: str) -> None:
+        """Initialize a new UnrealExecutionAbortedError with the line of output which matched."""
+        super().__init__(message)
+        self.line: str = line
+        self.matched: str = matched
+
+
+class UnrealExecutionTimeoutError(UnrealExecutionError):
+    """Custom exception representing a subprocess of an Unreal Engine executable stopped by its timeout or idle_timeout."""
+
+    def __init__(self, message: str, limit: str, seconds: float) -> None:
+        """Initialize a new UnrealExecutionTimeoutError with the limit which expired."""
+        super().__init__(message)
+        self.limit: str = limit
+        self.seconds: float = seconds
+
+
 class UnrealVersion(object):
     """Object wrapper representing a Build.version file."""
 
@@ -123,8 +174,17 @@ class UnrealVersion(object):
 class UnrealEngine(Buildable):
     """Object wrapper representing an Unreal Engine."""
 
-    def __init__(self, base_dir: str, association_name: Optional[str] = None) -> None:
-        """Initialize a new UnrealEngine."""
+    def __init__(
+        self,
+        base_dir: str,
+        association_name: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """Initialize a new UnrealEngine.
+
+        Plugin discovery is cached on disk beneath cache_dir, or the CRAZYHUSK_CACHE_DIR
+        environment variable when cache_dir is not given. Caching is disabled when neither is set.
+        """
         if base_dir is None:
             raise UnrealEngineError("UnrealEngine base directory must not be None.")
         if base_dir == "":
@@ -132,12 +192,16 @@ class UnrealEngine(Buildable):
 
         self.base_dir: str = os.path.realpath(base_dir)
         self.association_name: Optional[str] = association_name
+        self.cache_dir: Optional[str] = cache_dir or os.environ.get(
+            "CRAZYHUSK_CACHE_DIR"
+        )
         self.__build_targets: Optional[Dict[str, str]] = None
         self.__version: Optional[UnrealVersion] = None
         self.__in_context: bool = False
         self.__plugins: Optional[Dict[str, UnrealPlugin]] = None
         self.__process: Optional[object] = None
-        self.__code_templates: Optional[Dict[str, CodeTemplate]] = None
+        self.log_metrics: Optional[LogQueueMetrics] = None
+        self.__code_templates: Optional[CodeTemplateCatalog] = None
 
     def __repr__(self) -> str:
         """Python interpreter representation of this instance."""
@@ -167,10 +231,10 @@ class UnrealEngine(Buildable):
     ) -> None:
         """Context wrapper exit point.
 
-        Ensures any running subprocesses are terminated.
+        Ensures any running subprocesses, and the processes they started, are terminated.
         """
         if isinstance(self.__process, subprocess.Popen):
-            self.__process.kill()
+            kill_process_tree(self.__process)
         self.__in_context = False
 
     @property
@@ -202,12 +266,9 @@ class UnrealEngine(Buildable):
     def build_targets(self) -> Dict[str, str]:
         """Get a mapping of this UnrealEngine's available build targets."""
         if self.__build_targets is None:
-            self.__build_targets = {}
-            for target_file in glob.iglob(
-                os.path.join(self.source_dir, "**", "*.Target.cs"), recursive=True
-            ):
-                target_name = os.path.basename(target_file).split(".")[0]
-                self.__build_targets[target_name] = target_file
+            self.__build_targets = SourceIndex.for_directory(
+                self.source_dir
+            ).target_files()
         return self.__build_targets
 
     @property
@@ -220,18 +281,10 @@ class UnrealEngine(Buildable):
         return None
 
     @property
-    def code_templates(self) -> Dict[str, CodeTemplate]:
-        """Get a mapping of this UnrealEngine's available C++ code templates."""
+    def code_templates(self) -> CodeTemplateCatalog:
+        """Get a lazily loaded mapping of this UnrealEngine's available C++ code templates."""
         if self.__code_templates is None:
-            self.__code_templates = {}
-            items = [self]  # type: List[Union[UnrealEngine,UnrealPlugin]]
-            if self.plugins is not None:
-                for _plugin in self.plugins.values():
-                    items.append(_plugin)
-            for entry_point in entry_points().get("crazyhusk.code.listers", []):
-                for item in items:
-                    for template in entry_point.load()(item):
-                        self.__code_templates[template.name] = template
+            self.__code_templates = CodeTemplateCatalog(self.__list_code_templates)
         return self.__code_templates
 
     @property
@@ -263,16 +316,28 @@ class UnrealEngine(Buildable):
     def plugins(self) -> Optional[Dict[str, UnrealPlugin]]:
         """Get a mapping of the available plugins installed with this Engine."""
         # CrazyHusk
-        from crazyhusk.plugin import UnrealPlugin
+        from crazyhusk.plugin import PluginDescriptor, UnrealPlugin
 
         if self.__plugins is None:
             self.__plugins = {}
-            for _root, _dirs, _files in os.walk(self.plugins_dir):
-                for _file in _files:
-                    if os.path.splitext(_file)[-1] == ".uplugin":
-                        plugin = UnrealPlugin(os.path.join(_root, _file))
-                        self.__plugins[plugin.name] = plugin
-                        break
+            if self.cache_dir is None:
+                for plugin_file in find_plugin_files(self.plugins_dir):
+                    plugin = UnrealPlugin(plugin_file)
+                    self.__plugins[plugin.name] = plugin
+            else:
+                index = PluginIndex.for_directory(self.plugins_dir, self.cache_dir)
+                for plugin_file in index.plugin_files():
+                    plugin = UnrealPlugin(plugin_file)
+                    data = index.descriptor_data(plugin_file)
+                    if data is not None:
+                        descriptor = PluginDescriptor.to_object(data)
+                        if isinstance(descriptor, PluginDescriptor):
+                            plugin.descriptor = descriptor
+                    self.__plugins[plugin.name] = plugin
+                try:
+                    index.save()
+                except OSError as err:
+                    logging.debug(f"Could not save plugin index {index!r}: {err}")
         return self.__plugins
 
     @property
@@ -291,18 +356,87 @@ class UnrealEngine(Buildable):
 
     @staticmethod
     def find_engine(association: str) -> Optional[UnrealEngine]:
-        """Find an engine distribution from EngineAssociation string."""
-        for entry_point in entry_points().get("crazyhusk.engine.finders", []):
-            engine = entry_point.load()(association)
+        """Find an engine distribution from EngineAssociation string.
+
+        Engines are interned, so every lookup of the same installation returns the same UnrealEngine.
+        """
+        with _ENGINES_LOCK:
+            base_dir = _ASSOCIATIONS.get(association)
+            if base_dir is not None:
+                cached = UnrealEngine.get_interned_engine(base_dir)
+                if cached is not None:
+                    return cached
+                del _ASSOCIATIONS[association]
+
+        for finder in load_entry_points("crazyhusk.engine.finders"):
+            engine = finder(association)
             if isinstance(engine, UnrealEngine):
+                engine = UnrealEngine.intern_engine(engine)
+                with _ENGINES_LOCK:
+                    _ASSOCIATIONS[association] = engine.base_dir
                 return engine
         return None
 
+    @staticmethod
+    def get_engine(
+        base_dir: str, association_name: Optional[str] = None
+    ) -> UnrealEngine:
+        """Get the interned UnrealEngine for a base directory, creating it on first use."""
+        with _ENGINES_LOCK:
+            engine = UnrealEngine.get_interned_engine(base_dir)
+            if engine is None:
+                engine = UnrealEngine.intern_engine(
+                    UnrealEngine(base_dir, association_name)
+                )
+            return engine
+
+    @staticmethod
+    def get_interned_engine(base_dir: str) -> Optional[UnrealEngine]:
+        """Get the interned UnrealEngine for a base directory, if it is still current on disk."""
+        real_base_dir = os.path.realpath(base_dir)
+        with _ENGINES_LOCK:
+            cached = _ENGINES.get(real_base_dir)
+            if cached is None:
+                return None
+            signature, engine = cached
+            if signature != engine.disk_signature():
+                del _ENGINES[real_base_dir]
+                return None
+            return engine
+
+    @staticmethod
+    def intern_engine(engine: UnrealEngine) -> UnrealEngine:
+        """Get the canonical instance for an UnrealEngine's installation, registering this one if there is none."""
+        if not isinstance(engine, UnrealEngine):
+            raise TypeError(
+                f"Must provide an instance of crazyhusk.engine.UnrealEngine, got: {engine!r}"
+            )
+        with _ENGINES_LOCK:
+            cached = UnrealEngine.get_interned_engine(engine.base_dir)
+            if cached is not None:
+                return cached
+            _ENGINES[engine.base_dir] = (engine.disk_signature(), engine)
+            return engine
+
+    @staticmethod
+    def invalidate_engines(base_dir: Optional[str] = None) -> None:
+        """Forget interned engines, for one installation or all of them."""
+        with _ENGINES_LOCK:
+            if base_dir is None:
+                _ENGINES.clear()
+                _ASSOCIATIONS.clear()
+                return
+            real_base_dir = os.path.realpath(base_dir)
+            _ENGINES.pop(real_base_dir, None)
+            for association, associated_dir in list(_ASSOCIATIONS.items()):
+                if associated_dir == real_base_dir:
+                    del _ASSOCIATIONS[association]
+
     @staticmethod
     def list_all_engines() -> Iterable[UnrealEngine]:
         """List all available engine installations."""
-        for entry_point in entry_points().get("crazyhusk.engine.listers", []):
-            for engine in entry_point.load()():
+        for lister in load_entry_points("crazyhusk.engine.listers"):
+            for engine in lister():
                 yield engine
 
     @staticmethod
@@ -320,6 +454,14 @@ class UnrealEngine(Buildable):
         for engine in sorted(UnrealEngine.list_all_engines()):
             logging.info(engine)
 
+    def __list_code_templates(self) -> Iterable[CodeTemplate]:
+        items = [self]  # type: List[Union[UnrealEngine,UnrealPlugin]]
+        if self.plugins is not None:
+            items.extend(self.plugins.values())
+        for lister in load_entry_points("crazyhusk.code.listers"):
+            for item in items:
+                yield from lister(item)
+
     # crazyhusk.code.listers
     @staticmethod
     def list_engine_code_templates(engine: UnrealEngine) -> Iterable[CodeTemplate]:
@@ -328,14 +470,7 @@ class UnrealEngine(Buildable):
             for template_filename in glob.iglob(
                 os.path.join(engine.content_dir, "Editor", "Templates", "*.template")
             ):
-                with open(
-                    template_filename,
-                    encoding="utf-8",
-                ) as _template_file:
-                    yield CodeTemplate(
-                        os.path.basename(os.path.splitext(template_filename)[0]),
-                        _template_file.read(),
-                    )
+                yield CodeTemplate.from_file(template_filename)
 
     # crazyhusk.engine.sanitizers
     @staticmethod
@@ -368,6 +503,18 @@ class UnrealEngine(Buildable):
                 f"Specified executable: {os.path.realpath(executable)}\nis not part of the provided engine distribution: {engine!r}"
             )
 
+    # crazyhusk.engine.reporters
+    @staticmethod
+    def log_run_result(engine: UnrealEngine, result: RunResult) -> None:
+        """Log the resources used by a run of an Unreal executable."""
+        if not isinstance(engine, UnrealEngine):
+            raise TypeError(
+                f"Must provide an instance of crazyhusk.engine.UnrealEngine, got: {engine!r}"
+            )
+        logging.debug(
+            f"{result!r}: user_time={result.user_time} system_time={result.system_time} max_rss={result.max_rss} samples={len(result.samples)}\nCommand: {result.cmd}"
+        )
+
     # crazyhusk.engine.validators
     @staticmethod
     def engine_dir_exists(engine: UnrealEngine) -> None:
@@ -383,9 +530,30 @@ class UnrealEngine(Buildable):
         self, config_category: Optional[str] = None, platform: Optional[str] = None
     ) -> UnrealConfigParser:
         """Create a configuration object associated with this engine by category and platform."""
-        _config = UnrealConfigParser()
-        _config.read(self.config_files(config_category, platform))
-        return _config
+        return UnrealConfigParser.from_files(
+            self.config_files(config_category, platform)
+        )
+
+    def config_matrix(self, max_workers: Optional[int] = None) -> ConfigMatrix:
+        """Evaluate configuration snapshots of this engine for every config category and platform."""
+        platforms: List[Optional[str]] = [None]
+        platforms.extend(list_config_platforms(self.config_dir))
+        return ConfigMatrix.build(
+            {
+                (config_category, platform): list(
+                    self.config_files(config_category, platform)
+                )
+                for config_category in sorted(CONFIG_CATEGORIES)
+                for platform in platforms
+            },
+            max_workers=max_workers,
+        )
+
+    def config_snapshot(
+        self, config_category: Optional[str] = None, platform: Optional[str] = None
+    ) -> ConfigSnapshot:
+        """Create an immutable configuration snapshot associated with this engine by category and platform."""
+        return ConfigSnapshot.from_files(self.config_files(config_category, platform))
 
     def config_files(
         self, config_category: Optional[str] = None, platform: Optional[str] = None
@@ -406,10 +574,24 @@ class UnrealEngine(Buildable):
         """Get the default build target for this Buildable."""
         return "UE4Editor"
 
+    def disk_signature(self) -> Tuple[Optional[int], ...]:
+        """Get modification times of the files and directories which cached engine state is derived from."""
+        signature: List[Optional[int]] = []
+        for path in (
+            os.path.join(self.build_dir, "Build.version"),
+            self.plugins_dir,
+            self.source_dir,
+        ):
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
     def executable_path(self, executable_name: str) -> Optional[str]:
         """Resolve an expected real path for an executable member of this engine for a given executable name."""
-        for entry_point in entry_points().get("crazyhusk.engine.resolvers", []):
-            path = entry_point.load()(self, executable_name)
+        for resolver in load_entry_points("crazyhusk.engine.resolvers"):
+            path = resolver(self, executable_name)
             if path is not None:
                 return str(path)
         return None
@@ -511,20 +693,58 @@ class UnrealEngine(Buildable):
 
     def validate(self) -> None:
         """Raise exceptions if this instance is misconfigured."""
-        for entry_point in entry_points().get("crazyhusk.engine.validators", []):
-            entry_point.load()(self)
+        for validator in load_entry_points("crazyhusk.engine.validators"):
+            validator(self)
 
     def sanitize_commandline(self, executable: str, *args: str) -> List[str]:
         """Raise exceptions if we are about to run unsafe commands in the subprocess."""
-        for entry_point in entry_points().get("crazyhusk.engine.sanitizers", []):
-            entry_point.load()(self, executable, *args)
+        for sanitizer in load_entry_points("crazyhusk.engine.sanitizers"):
+            sanitizer(self, executable, *args)
         cmd = [executable, *args]
         return cmd
 
     def run(
-        self, executable: str, *args: str, expected_retcodes: Optional[Set[int]] = None
-    ) -> int:
-        """Run an associated Unreal executable in a subprocess, and process output line by line."""
+        self,
+        executable: str,
+        *args: str,
+        expected_retcodes: Optional[Set[int]] = None,
+        log_backpressure: str = BACKPRESSURE_BLOCK,
+        log_queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+        log_filters: Iterable[Any] = (),
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        output_file: Optional[str] = None,
+        abort_patterns: Optional[AbortPatterns] = None,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        kill_grace: float = DEFAULT_KILL_GRACE,
+        sample_interval: Optional[float] = None,
+        reporters: Iterable[Any] = (),
+    ) -> RunResult:
+        """Run an associated Unreal executable in a subprocess, and process output line by line.
+
+        Output lines are filtered and logged on a worker thread, through a queue of
+        log_queue_size lines; log_backpressure chooses what happens when it is full.
+        Queue metrics of the run are kept in log_metrics. log_filters are applied after
+        the crazyhusk.engine.filters entry points.
+
+        The last tail_lines lines of output are included in the UnrealExecutionError
+        raised for an unexpected return code. All output is also written to output_file
+        if given, compressed if it ends with .gz or .xz.
+
+        When a line of output matches abort_patterns, the process and every process it
+        started are killed right away, and UnrealExecutionAbortedError is raised.
+
+        When the run takes longer than timeout seconds, or writes no output for
+        idle_timeout seconds, its process tree is terminated, then killed if still running
+        kill_grace seconds later, and UnrealExecutionTimeoutError is raised with the limit.
+        Output still held open kill_grace seconds after the kill is no longer read.
+
+        Returns a RunResult with the return code, wall time, CPU time and peak memory of
+        the run. Its process tree is also sampled every sample_interval seconds if given.
+        Every run is passed to the crazyhusk.engine.reporters entry points, then reporters,
+        as reporter(engine, result), before any error is raised. Exceptions raised by a
+        reporter are logged, and do not replace the result or error of the run.
+        """
         if not self.__in_context:
             raise UnrealExecutionError(
                 "UnrealEngine.run commands must be called with UnrealEngine as a context wrapper."
@@ -536,45 +756,251 @@ class UnrealEngine(Buildable):
         self.validate()
         cmd = self.sanitize_commandline(executable, *args)
 
-        logger = logging.getLogger("UnrealEngine.run")
-        logger.addFilter(FilterEngineRun(executable, *args))
-        for entry_point in entry_points().get("crazyhusk.engine.filters", []):
-            logger.addFilter(entry_point.load()())
-        logger.info(" ".join(cmd))
+        aborted: Optional[Tuple[str, str]] = None
+        with OutputCapture(tail_lines, output_file) as capture, QueuedRunLogPipeline(
+            executable,
+            *args,
+            filters=[
+                *(
+                    log_filter()
+                    for log_filter in load_entry_points("crazyhusk.engine.filters")
+                ),
+                *log_filters,
+            ],
+            maxsize=log_queue_size,
+            backpressure=log_backpressure,
+        ) as run_log:
+            self.log_metrics = run_log.metrics
+            run_log.log(" ".join(cmd))
+
+            self.__process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                shell=False,  # nosec
+                start_new_session=True,
+            )
 
-        self.__process = subprocess.Popen(
+            watchdog = Watchdog(timeout, idle_timeout, kill_grace)
+            sampler = ProcessSampler(self.__process.pid, sample_interval or 0)
+            if sample_interval:
+                sampler.start()
+            usage: Optional[ProcessUsage] = None
+            streams = ProcessStreams(self.__process)
+            try:
+                while not streams.closed and aborted is None and not watchdog.abandoned:
+                    lines = streams.read(watchdog.wait_time())
+                    if lines:
+                        watchdog.output()
+                    for line in lines:
+                        capture.write(line.text)
+                        output = line.text.strip()
+                        if not output:
+                            continue
+                        run_log.log(output, extra={"stream": line.stream})
+                        if abort_patterns:
+                            matched = abort_patterns.search(output)
+                            if matched is not None:
+                                kill_process_tree(self.__process)
+                                aborted = (output, matched)
+                                break
+                    watchdog.check(self.__process)
+                while aborted is None and self.__process.returncode is None:
+                    try:
+                        usage = wait_process(self.__process, watchdog.wait_time())
+                    except subprocess.TimeoutExpired:
+                        watchdog.check(self.__process)
+            except BaseException:
+                kill_process_tree(self.__process)
+                raise
+            finally:
+                streams.close()
+                sampler.stop()
+
+        if self.__process.returncode is None:
+            usage = wait_process(self.__process)
+        return_code = RunResult(
+            self.__process.returncode,  # type: ignore
             cmd,
-            stdout=subprocess.PIPE,
-            stdin=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=False,  # nosec
-            universal_newlines=True,
+            time.monotonic() - watchdog.started,
+            usage,
+            sampler.samples,
         )
+        self.__report(return_code, reporters)
+        if aborted is not None:
+            raise UnrealExecutionAbortedError(
+                f"Unreal executable was stopped after output matched an abort pattern: {aborted[0]}\nCommand: {cmd}\n{capture.format_tail()}",
+                *aborted,
+            )
+        if watchdog.expired is not None:
+            raise UnrealExecutionTimeoutError(
+                f"Unreal executable was stopped after exceeding its {watchdog.expired} of {watchdog.limit} seconds.\nCommand: {cmd}\n{capture.format_tail()}",
+                watchdog.expired,
+                watchdog.limit,  # type: ignore
+            )
+        if return_code not in expected_retcodes:
+            raise UnrealExecutionError(
+                f"Unreal executable returned exception with return code {return_code}.\nCommand: {cmd}\n{capture.format_tail()}"
+            )
+        return return_code
+
+    def open_process(self, executable: str, *args: str) -> AsyncProcess:
+        """Create a handle for running an associated Unreal executable with asyncio.
+
+        Each handle owns its own process, so one UnrealEngine can drive any number
+        of concurrent processes. Start it with ``async with``.
+        """
+        self.validate()
+        return AsyncProcess(*self.sanitize_commandline(executable, *args))
+
+    async def run_async(
+        self,
+        executable: str,
+        *args: str,
+        expected_retcodes: Optional[Set[int]] = None,
+        log_filters: Iterable[Any] = (),
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        output_file: Optional[str] = None,
+        abort_patterns: Optional[AbortPatterns] = None,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        kill_grace: float = DEFAULT_KILL_GRACE,
+        sample_interval: Optional[float] = None,
+        reporters: Iterable[Any] = (),
+    ) -> RunResult:
+        """Run an associated Unreal executable in an asyncio subprocess, and process output line by line.
+
+        Cancelling the awaiting task kills the subprocess. Output is captured,
+        abort_patterns, timeout and idle_timeout are enforced, and the run is sampled and
+        reported, as in run. The RunResult has no CPU time or max_rss, as asyncio reaps
+        the process.
+        """
+        if expected_retcodes is None:
+            expected_retcodes = set([0])
+
+        aborted: Optional[Tuple[str, str]] = None
+        process = self.open_process(executable, *args)
+        with OutputCapture(tail_lines, output_file) as capture, RunLogPipeline(
+            executable,
+            *args,
+            filters=[
+                *(
+                    log_filter()
+                    for log_filter in load_entry_points("crazyhusk.engine.filters")
+                ),
+                *log_filters,
+            ],
+        ) as run_log:
+            run_log.log(" ".join(process.cmd))
+            async with process:
+                pid: int = process.pid  # type: ignore
+                watchdog = Watchdog(timeout, idle_timeout, kill_grace)
+                sampler = ProcessSampler(pid, sample_interval or 0)
+                if sample_interval:
+                    sampler.start()
+                try:
+                    while aborted is None and not watchdog.abandoned:
+                        try:
+                            line = await process.readline(watchdog.wait_time())
+                        except asyncio.TimeoutError:
+                            watchdog.check(pid)
+                            continue
+                        if line is None:
+                            break
+                        watchdog.output()
+                        capture.write(line.text)
+                        output = line.text.strip()
+                        if output:
+                            run_log.log(output, extra={"stream": line.stream})
+                            if abort_patterns:
+                                matched = abort_patterns.search(output)
+                                if matched is not None:
+                                    process.kill_tree()
+                                    aborted = (output, matched)
+                        watchdog.check(pid)
+                    while (
+                        aborted is None
+                        and not watchdog.abandoned
+                        and process.returncode is None
+                    ):
+                        try:
+                            await asyncio.wait_for(
+                                asyncio.shield(process.wait()), watchdog.wait_time()
+                            )
+                        except asyncio.TimeoutError:
+                            watchdog.check(pid)
+                    if aborted is not None or watchdog.abandoned:
+                        # Output may be held open by a process which left the tree.
+                        await process.close()
+                    return_code = RunResult(
+                        await process.wait(),
+                        process.cmd,
+                        time.monotonic() - watchdog.started,
+                        None,
+                        sampler.samples,
+                    )
+                finally:
+                    sampler.stop()
+
+        self.__report(return_code, reporters)
 
-        if self.__process.stdout is not None:
-            while True:
-                output = self.__process.stdout.readline()
-                if not output and self.__process.poll() is not None:
-                    break
-                output = output.strip()
-                if not output:
-                    continue
-                logger.info(output)
-
-        return_code = self.__process.poll()
+        if aborted is not None:
+            raise UnrealExecutionAbortedError(
+                f"Unreal executable was stopped after output matched an abort pattern: {aborted[0]}\nCommand: {process.cmd}\n{capture.format_tail()}",
+                *aborted,
+            )
+        if watchdog.expired is not None:
+            raise UnrealExecutionTimeoutError(
+                f"Unreal executable was stopped after exceeding its {watchdog.expired} of {watchdog.limit} seconds.\nCommand: {process.cmd}\n{capture.format_tail()}",
+                watchdog.expired,
+                watchdog.limit,  # type: ignore
+            )
         if return_code not in expected_retcodes:
             raise UnrealExecutionError(
-                f"Unreal executable returned exception with return code {return_code}.\nCommand: {cmd}"
+                f"Unreal executable returned exception with return code {return_code}.\nCommand: {process.cmd}\n{capture.format_tail()}"
             )
         return return_code
 
+    def __report(self, result: RunResult, reporters: Iterable[Any]) -> None:
+        for reporter in (*load_entry_points("crazyhusk.engine.reporters"), *reporters):
+            try:
+                reporter(self, result)
+            except Exception:
+                # A failing reporter must not hide the outcome of the run.
+                logging.exception(f"Run reporter {reporter!r} failed for {self!r}")
+
     def run_commandlet(
         self,
         commandlet: UnrealCommandlet,
         *extra_switches: str,
         **extra_parameters: str,
     ) -> int:
-        """Run a commandlet for this project."""
+        """Run a commandlet for this project, stopping it if it crashes."""
+        cmd = self.__commandlet_command(commandlet, *extra_switches, **extra_parameters)
+        if cmd is not None:
+            with self:
+                return self.run(*cmd, abort_patterns=DEFAULT_ABORT_PATTERNS)
+        return -1
+
+    async def run_commandlet_async(
+        self,
+        commandlet: UnrealCommandlet,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> int:
+        """Run a commandlet for this project in an asyncio subprocess, stopping it if it crashes."""
+        cmd = self.__commandlet_command(commandlet, *extra_switches, **extra_parameters)
+        if cmd is not None:
+            return await self.run_async(*cmd, abort_patterns=DEFAULT_ABORT_PATTERNS)
+        return -1
+
+    def __commandlet_command(
+        self,
+        commandlet: UnrealCommandlet,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> Optional[List[str]]:
         commandlet.validate()
 
         switches = {
@@ -589,14 +1015,11 @@ class UnrealEngine(Buildable):
                 f"Commandlet '{commandlet.name}' is not valid for engine: {self!r}"
             )
         editor_cmd_path = self.executable_path("UE4Editor-Cmd")
-        if editor_cmd_path is not None:
-            with self:
-                return self.run(
-                    editor_cmd_path,
-                    f"-run={commandlet.name}",
-                    *commandlet.get_commandline_args(),
-                    *UnrealEngine.format_commandline_options(
-                        *switches, **extra_parameters
-                    ),
-                )
-        return -1
+        if editor_cmd_path is None:
+            return None
+        return [
+            editor_cmd_path,
+            f"-run={commandlet.name}",
+            *commandlet.get_commandline_args(),
+            *UnrealEngine.format_commandline_options(*switches, **extra_parameters),
+        ]
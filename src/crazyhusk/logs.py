@@ -1,10 +1,43 @@
 """Logging utilities for crazyhusk Unreal Engine object wrappers."""
+
+# Future Standard Library
+from __future__ import annotations
+
 # Standard Library
+import array
+import bisect
 import calendar
+import hashlib
+import json
 import logging
+import mmap
+import os
+import queue
 import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from types import TracebackType
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Type,
+)
 
 try:
     # Standard Library
@@ -21,6 +54,15 @@ RE_UBT_LOG_LINE = re.compile(
     r"^(?P<filename>.+?)\((?P<linenumber>\d+),?(?P<colnumber>\d+?)?\)\s?\:\s?(((?P<level>error|warning) \w+)|note)\:\s(?P<message>.+?)$"
 )
 
+# Anchored patterns used by FilterUnrealLogs, which avoid the leading wildcards of
+# the patterns above so long lines cannot cause heavy backtracking.
+RE_UE4_LOG_PREFIX = re.compile(
+    r"\[(?P<timestamp>[\d.:\-]+)\]\[[^\]]*\](?P<module>\w+): ?(?:(?P<level>Display|Info|Warning|Error): ?)?"
+)
+RE_UBT_DIAGNOSTIC = re.compile(
+    r"\((?P<linenumber>\d+)(?:,(?P<colnumber>\d+))?\)\s?:\s?(?:(?P<level>error|warning) (?P<code>\w+)|note):\s"
+)
+
 UE4_LOG_MAP = {
     "Info": logging.INFO,
     "Display": logging.INFO,
@@ -30,6 +72,51 @@ UE4_LOG_MAP = {
 
 UBT_LOG_MAP = {"warning": logging.WARNING, "error": logging.ERROR}
 
+UE4_TIMESTAMP_FORMAT = "%Y.%m.%d-%H.%M.%S:%f"
+
+# Epoch milliseconds of the "YYYY.MM.DD-HH.MM" prefix of recently parsed timestamps
+UE4_TIMESTAMP_PREFIX_CACHE_SIZE = 1024
+_TIMESTAMP_PREFIXES: Dict[str, int] = {}
+
+
+def parse_ue4_timestamp(timestamp: str) -> float:
+    """Convert a UE4 log timestamp, like 2021.11.29-21.06.49:745, to seconds since the epoch in UTC.
+
+    Fixed-width fields are sliced rather than parsed with strptime, and the epoch
+    of each date, hour and minute is cached, so only seconds and milliseconds are
+    converted for most lines.
+    """
+    if (
+        len(timestamp) < 21
+        or timestamp[4] != "."
+        or timestamp[10] != "-"
+        or timestamp[19] != ":"
+    ):
+        parsed = datetime.strptime(timestamp, UE4_TIMESTAMP_FORMAT)
+        return int(calendar.timegm(parsed.timetuple())) + parsed.microsecond / 1000000
+
+    prefix = timestamp[:16]
+    prefix_msecs = _TIMESTAMP_PREFIXES.get(prefix)
+    if prefix_msecs is None:
+        prefix_msecs = 1000 * int(
+            calendar.timegm(
+                (
+                    int(timestamp[0:4]),
+                    int(timestamp[5:7]),
+                    int(timestamp[8:10]),
+                    int(timestamp[11:13]),
+                    int(timestamp[14:16]),
+                    0,
+                )
+            )
+        )
+        if len(_TIMESTAMP_PREFIXES) >= UE4_TIMESTAMP_PREFIX_CACHE_SIZE:
+            _TIMESTAMP_PREFIXES.clear()
+        _TIMESTAMP_PREFIXES[prefix] = prefix_msecs
+
+    msecs = int(timestamp[20:23].ljust(3, "0"))
+    return (prefix_msecs + int(timestamp[17:19]) * 1000 + msecs) / 1000
+
 
 class FilterEngineRun(logging.Filter):
     """Filter to enhance log records when using UnrealEngine.run()."""
@@ -72,11 +159,1114 @@ class FilterUE4Logs(logging.Filter):
         if captured is not None:
             record.levelno = UE4_LOG_MAP.get(captured.group("level"), logging.INFO)
             record.levelname = logging.getLevelName(record.levelno)
-            record.created = calendar.timegm(
-                datetime.strptime(
-                    captured.group("timestamp"), "%Y.%m.%d-%H.%M.%S:%f"
-                ).timetuple()
-            )
+            record.created = parse_ue4_timestamp(captured.group("timestamp"))
+            record.msecs = (record.created - int(record.created)) * 1000
             record.module = captured.group("module")
             record.sub_msg = captured.group("message")
         return True
+
+
+class FilterUnrealLogs(logging.Filter):
+    """Filter to enhance log records generated by either UE4Editor/UE4Game or UnrealBuildTool.
+
+    Classifies each line by its first character before running a single pattern
+    without leading wildcards: lines starting with [ are parsed as UE4 logs, other
+    lines containing ( are searched for an UnrealBuildTool diagnostic following the
+    file path. Sets the same attributes as FilterUE4Logs and FilterUBTWarnings,
+    plus the code of UnrealBuildTool diagnostics.
+    """
+
+    def filter(self, record: Any) -> Literal[True]:
+        """Filter LogRecords emitted from UE4Editor/UE4Game or UnrealBuildTool."""
+        msg = record.msg
+        if not isinstance(msg, str) or not msg:
+            return True
+        if msg[0] == "[":
+            captured = RE_UE4_LOG_PREFIX.match(msg)
+            if captured is not None and captured.end() < len(msg):
+                end = captured.end()
+                level = captured.group("level")
+                record.levelno = UE4_LOG_MAP[level] if level else logging.INFO
+                record.levelname = logging.getLevelName(record.levelno)
+                record.created = parse_ue4_timestamp(captured.group("timestamp"))
+                record.msecs = (record.created - int(record.created)) * 1000
+                record.module = captured.group("module")
+                record.sub_msg = msg[end:]
+        elif "(" in msg:
+            # Not anchored to a fixed position: file paths may contain (, as in
+            # "Program Files (x86)", so the diagnostic starts at the first ( which
+            # opens one, where FilterUBTWarnings ends its lazy filename. A search
+            # finds it in a single scan, where matching at each ( would loop per
+            # parenthesis in Python on long lines.
+            captured = RE_UBT_DIAGNOSTIC.search(msg, 1)
+            if captured is not None and captured.end() < len(msg):
+                end = captured.end()
+                record.levelno = UBT_LOG_MAP.get(captured.group("level"), logging.WARN)
+                record.levelname = logging.getLevelName(record.levelno)
+                record.filename = msg[: captured.start()]
+                record.linenumber = captured.group("linenumber")
+                record.colnumber = captured.group("colnumber")
+                record.code = captured.group("code")
+                record.sub_msg = msg[end:]
+        return True
+
+
+@dataclass
+class UBTDiagnostic:
+    """A unique UnrealBuildTool diagnostic, with its first occurrence and how often it occurred."""
+
+    filename: str
+    linenumber: Optional[str]
+    colnumber: Optional[str]
+    code: Optional[str]
+    level: str
+    message: str
+    count: int = 1
+
+    @property
+    def uri(self) -> str:
+        """Get the file of this diagnostic as a URI, as used in SARIF."""
+        path = self.filename.replace("\\", "/")
+        if re.match(r"[A-Za-z]:/", path):
+            return f"file:///{path}"
+        if path.startswith("/"):
+            return f"file://{path}"
+        return path
+
+    def to_sarif(self) -> Dict[str, Any]:
+        """Get a SARIF 2.1.0 result representing this diagnostic."""
+        region: Dict[str, int] = {}
+        if self.linenumber is not None:
+            region["startLine"] = int(self.linenumber)
+        if self.colnumber is not None:
+            region["startColumn"] = int(self.colnumber)
+        location: Dict[str, Any] = {"artifactLocation": {"uri": self.uri}}
+        if region:
+            location["region"] = region
+        result: Dict[str, Any] = {
+            "level": self.level,
+            "message": {"text": self.message},
+            "locations": [{"physicalLocation": location}],
+            "occurrenceCount": self.count,
+        }
+        if self.code is not None:
+            result["ruleId"] = self.code
+        return result
+
+
+class FilterUBTDiagnostics(logging.Filter):
+    """Filter to aggregate UnrealBuildTool diagnostics, suppressing repeats of each one.
+
+    Diagnostics are keyed by file, line, column and code, as annotated by
+    FilterUnrealLogs or FilterUBTWarnings, so this filter must come after them. Only
+    the first occurrence of a diagnostic is logged; later ones are counted. Memory
+    use is bounded by the number of unique diagnostics.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new, empty, FilterUBTDiagnostics."""
+        logging.Filter.__init__(self)
+        self.diagnostics: Dict[
+            Tuple[str, Optional[str], Optional[str], Optional[str]], UBTDiagnostic
+        ] = {}
+        self.suppressed: int = 0
+
+    def filter(self, record: Any) -> bool:
+        """Count a diagnostic LogRecord, rejecting it if the diagnostic was already logged."""
+        linenumber = getattr(record, "linenumber", None)
+        if linenumber is None:
+            return True
+        code = getattr(record, "code", None)
+        key = (record.filename, linenumber, getattr(record, "colnumber", None), code)
+        diagnostic = self.diagnostics.get(key)
+        if diagnostic is not None:
+            diagnostic.count += 1
+            self.suppressed += 1
+            return False
+
+        if record.levelno >= logging.ERROR:
+            level = "error"
+        elif code is not None:
+            level = "warning"
+        else:
+            level = "note"
+        self.diagnostics[key] = UBTDiagnostic(
+            *key, level, getattr(record, "sub_msg", record.getMessage())
+        )
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON serializable summary of the diagnostics aggregated so far."""
+        levels: Dict[str, int] = {}
+        for diagnostic in self.diagnostics.values():
+            levels[diagnostic.level] = levels.get(diagnostic.level, 0) + 1
+        return {
+            "Unique": len(self.diagnostics),
+            "Suppressed": self.suppressed,
+            "Levels": levels,
+            "Diagnostics": [
+                {
+                    "File": diagnostic.filename,
+                    "Line": diagnostic.linenumber,
+                    "Column": diagnostic.colnumber,
+                    "Code": diagnostic.code,
+                    "Level": diagnostic.level,
+                    "Message": diagnostic.message,
+                    "Count": diagnostic.count,
+                }
+                for diagnostic in self.diagnostics.values()
+            ],
+        }
+
+    def to_sarif(self) -> Dict[str, Any]:
+        """Get a SARIF 2.1.0 log of the diagnostics aggregated so far."""
+        codes = sorted(
+            {
+                diagnostic.code
+                for diagnostic in self.diagnostics.values()
+                if diagnostic.code is not None
+            }
+        )
+        return {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": "UnrealBuildTool",
+                            "rules": [{"id": code} for code in codes],
+                        }
+                    },
+                    "results": [
+                        diagnostic.to_sarif()
+                        for diagnostic in self.diagnostics.values()
+                    ],
+                }
+            ],
+        }
+
+    def dump(self, summary_file: str) -> None:
+        """Write a summary of the diagnostics aggregated so far, as SARIF if summary_file ends with .sarif, otherwise as JSON."""
+        if summary_file.lower().endswith(".sarif"):
+            summary = self.to_sarif()
+        else:
+            summary = self.to_dict()
+        with open(summary_file, "w", encoding="utf-8") as _summary_file:
+            json.dump(summary, _summary_file, indent=4)
+
+
+class AbortPatterns(object):
+    """Set of patterns which stop a run as soon as a line of its output matches any of them.
+
+    The patterns are compiled into a single alternation, so each line is searched once.
+    """
+
+    def __init__(self, *patterns: str) -> None:
+        """Initialize and compile a new AbortPatterns."""
+        self.patterns: Tuple[str, ...] = patterns
+        self.__regex: Optional[Pattern[str]] = None
+        if patterns:
+            self.__regex = re.compile(
+                "|".join(f"(?:{pattern})" for pattern in patterns)
+            )
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of AbortPatterns."""
+        return f"<AbortPatterns {self.patterns!r}>"
+
+    def __bool__(self) -> bool:
+        """Whether there is any pattern to match."""
+        return self.__regex is not None
+
+    def __add__(self, other: AbortPatterns) -> AbortPatterns:
+        """Combine the patterns of two AbortPatterns."""
+        return AbortPatterns(*self.patterns, *other.patterns)
+
+    def search(self, line: str) -> Optional[str]:
+        """Get the text matched by the first pattern found in a line, or None if no pattern matches."""
+        if self.__regex is None:
+            return None
+        captured = self.__regex.search(line)
+        if captured is None:
+            return None
+        return captured.group(0)
+
+
+# Output printed by UE4Editor/UE4Game when it crashes, before it spends minutes in crash reporting.
+# Used by default when running commandlets, automation tests, and renders.
+DEFAULT_ABORT_PATTERNS = AbortPatterns(
+    r"Fatal error:", r"Assertion failed", r"=== Critical error: ==="
+)
+
+
+class RunLogPipeline(object):
+    """Fixed chain of log filters applied to the output of a single UnrealEngine.run.
+
+    Filters are applied to each record by the pipeline itself, rather than being
+    added to the shared logger, so nothing accumulates on the logger across runs.
+    """
+
+    def __init__(
+        self,
+        executable: str,
+        *args: str,
+        logger: Optional[logging.Logger] = None,
+        filters: Iterable[Any] = (),
+    ) -> None:
+        """Initialize a new RunLogPipeline."""
+        self.logger: logging.Logger = logger or logging.getLogger("UnrealEngine.run")
+        self.filters: Tuple[Any, ...] = (FilterEngineRun(executable, *args), *filters)
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of RunLogPipeline."""
+        return f"<RunLogPipeline {self.logger.name} with {len(self.filters)} filters>"
+
+    def __enter__(self) -> "RunLogPipeline":
+        """Use the pipeline for the duration of a run."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Tear down the pipeline after a run."""
+        self.close()
+
+    def close(self) -> None:
+        """Release this pipeline's filters."""
+        self.filters = ()
+
+    def log(
+        self,
+        msg: str,
+        level: int = logging.INFO,
+        extra: Optional[Mapping[str, Any]] = None,
+        created: Optional[float] = None,
+    ) -> None:
+        """Filter a line of output into a LogRecord and pass it to the logger's handlers.
+
+        Items of extra are set as attributes of the record before it is filtered.
+        created is the time the line was read, if not now.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        record = self.logger.makeRecord(
+            self.logger.name, level, "(unknown file)", 0, msg, (), None, extra=extra
+        )
+        if created is not None:
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+        for log_filter in self.filters:
+            if hasattr(log_filter, "filter"):
+                result = log_filter.filter(record)
+            else:
+                result = log_filter(record)
+            if not result:
+                return
+        self.logger.handle(record)
+
+
+BACKPRESSURE_BLOCK = "block"
+BACKPRESSURE_DROP_DEBUG = "drop_debug"
+BACKPRESSURE_SPILL = "spill"
+BACKPRESSURE_POLICIES = frozenset(
+    [BACKPRESSURE_BLOCK, BACKPRESSURE_DROP_DEBUG, BACKPRESSURE_SPILL]
+)
+
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# Lines which may be warnings or errors are never dropped by BACKPRESSURE_DROP_DEBUG.
+RE_SEVERE_LINE = re.compile(r"error|warning|fatal", flags=re.IGNORECASE)
+
+
+@dataclass
+class LogQueueMetrics:
+    """Counters describing the queue of a QueuedRunLogPipeline."""
+
+    enqueued: int = 0
+    processed: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    blocked_seconds: float = 0.0
+
+
+class QueuedRunLogPipeline(RunLogPipeline):
+    """RunLogPipeline which filters and emits records on a worker thread.
+
+    The thread reading the process only puts raw lines into a bounded queue, so
+    slow filters or handlers do not stop it from draining the pipes. When the
+    queue is full, the backpressure policy decides what happens to a new line:
+
+        block       wait for room in the queue, throttling the reader
+        drop_debug  drop the line unless it may be a warning or an error
+        spill       append the line to a spill file; later lines follow it there until
+                    the worker has emptied the queue and replayed the spill file in order,
+                    then the spill file is truncated
+    """
+
+    def __init__(
+        self,
+        executable: str,
+        *args: str,
+        logger: Optional[logging.Logger] = None,
+        filters: Iterable[Any] = (),
+        maxsize: int = DEFAULT_LOG_QUEUE_SIZE,
+        backpressure: str = BACKPRESSURE_BLOCK,
+        spill_file: Optional[str] = None,
+    ) -> None:
+        """Initialize a new QueuedRunLogPipeline, and start its worker thread."""
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown backpressure policy: {backpressure!r}, expected one of {sorted(BACKPRESSURE_POLICIES)}"
+            )
+        super().__init__(executable, *args, logger=logger, filters=filters)
+        self.backpressure: str = backpressure
+        self.spill_file: Optional[str] = spill_file
+        self.metrics: LogQueueMetrics = LogQueueMetrics()
+        self.__queue: queue.Queue[Optional[Tuple[Any, ...]]] = queue.Queue(maxsize)
+        self.__spill: Optional[IO[bytes]] = None
+        self.__spill_offset: int = 0
+        self.__spilling: bool = False
+        self.__spill_lock = threading.Lock()
+        self.__error: Optional[BaseException] = None
+        self.__worker: Optional[threading.Thread] = threading.Thread(
+            target=self.__work, name=f"{self!r}", daemon=True
+        )
+        self.__worker.start()
+
+    def __enter__(self) -> "QueuedRunLogPipeline":
+        """Use the pipeline for the duration of a run."""
+        return self
+
+    @property
+    def depth(self) -> int:
+        """Get the number of lines currently waiting in the queue."""
+        return self.__queue.qsize()
+
+    def log(
+        self,
+        msg: str,
+        level: int = logging.INFO,
+        extra: Optional[Mapping[str, Any]] = None,
+        created: Optional[float] = None,
+    ) -> None:
+        """Queue a line of output to be filtered and emitted by the worker thread."""
+        if self.__worker is None:
+            raise RuntimeError(f"{self!r} is closed.")
+        item = (msg, level, extra, created or time.time())
+        if self.backpressure == BACKPRESSURE_SPILL:
+            with self.__spill_lock:
+                if not self.__spilling:
+                    try:
+                        self.__queue.put_nowait(item)
+                    except queue.Full:
+                        self.__spilling = True
+                if self.__spilling:
+                    self.__spill_item(item)
+                    return
+        else:
+            try:
+                self.__queue.put_nowait(item)
+            except queue.Full:
+                if self.backpressure == BACKPRESSURE_DROP_DEBUG and (
+                    level < logging.INFO or RE_SEVERE_LINE.search(msg) is None
+                ):
+                    self.metrics.dropped += 1
+                    return
+                start = time.perf_counter()
+                self.__queue.put(item)
+                self.metrics.blocked_seconds += time.perf_counter() - start
+        self.metrics.enqueued += 1
+        self.metrics.max_depth = max(self.metrics.max_depth, self.__queue.qsize())
+
+    def close(self) -> None:
+        """Wait for queued and spilled lines to be emitted, then stop the worker thread.
+
+        Raises the first exception raised by a filter or handler, if any.
+        """
+        worker = self.__worker
+        if worker is not None:
+            self.__worker = None
+            self.__queue.put(None)
+            worker.join()
+            if self.__spill is not None:
+                self.__spill.close()
+                self.__spill = None
+        super().close()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def __work(self) -> None:
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                self.__replay_spill()
+                return
+            self.__emit(*item)
+            # Once spilling starts, no line is queued until the spill file is
+            # replayed, so an empty queue means every older line was emitted.
+            with self.__spill_lock:
+                replay = self.__spilling and self.__queue.empty()
+            if replay:
+                self.__replay_spill()
+
+    def __emit(
+        self,
+        msg: str,
+        level: int,
+        extra: Optional[Mapping[str, Any]],
+        created: Optional[float],
+    ) -> None:
+        try:
+            RunLogPipeline.log(self, msg, level, extra, created)
+        except Exception as err:
+            self.metrics.errors += 1
+            if self.__error is None:
+                self.__error = err
+        self.metrics.processed += 1
+
+    def __spill_item(self, item: Tuple[Any, ...]) -> None:
+        if self.__spill is None:
+            if self.spill_file is not None:
+                self.__spill = open(self.spill_file, "w+b")
+            else:
+                self.__spill = tempfile.TemporaryFile("w+b")
+        msg, level, extra, created = item
+        self.__spill.seek(0, os.SEEK_END)
+        self.__spill.write(
+            json.dumps([msg, level, dict(extra) if extra else None, created]).encode(
+                "utf-8"
+            )
+            + b"\n"
+        )
+        self.metrics.spilled += 1
+
+    def __replay_spill(self, batch_size: int = 1000) -> None:
+        while True:
+            with self.__spill_lock:
+                lines: List[bytes] = []
+                if self.__spill is not None:
+                    self.__spill.seek(self.__spill_offset)
+                    while len(lines) < batch_size:
+                        line = self.__spill.readline()
+                        if not line:
+                            break
+                        lines.append(line)
+                    self.__spill_offset = self.__spill.tell()
+                if not lines:
+                    # Caught up: start the spill file over, so it only holds unreplayed lines.
+                    if self.__spill is not None:
+                        self.__spill.seek(0)
+                        self.__spill.truncate()
+                    self.__spill_offset = 0
+                    self.__spilling = False
+                    return
+            for line in lines:
+                self.__emit(*json.loads(line))
+
+
+# Verbosities which may follow the category of a UE4 log entry
+UE4_VERBOSITIES = (
+    "Fatal",
+    "Error",
+    "Warning",
+    "Display",
+    "Log",
+    "Verbose",
+    "VeryVerbose",
+)
+
+RE_UE4_LOG_ENTRY = re.compile(
+    r"\[(?P<timestamp>[\d.:\-]+)\]\[ *(?P<frame>\d+)\](?P<category>\w+): ?"
+    rf"(?:(?P<verbosity>{'|'.join(UE4_VERBOSITIES)}): ?)?"
+)
+RE_UE4_LOG_UNTIMED_ENTRY = re.compile(
+    rf"(?P<category>\w+): (?:(?P<verbosity>{'|'.join(UE4_VERBOSITIES)}): ?)?"
+)
+
+
+class UnrealLogEntry(NamedTuple):
+    """A single, possibly multi-line, entry of a UE4Editor/UE4Game log file."""
+
+    offset: int
+    line: int
+    timestamp: Optional[float]
+    frame: Optional[int]
+    category: Optional[str]
+    verbosity: str
+    message: str
+
+
+def match_unreal_log_entry(
+    text: str, timed: bool
+) -> Optional[Tuple[Optional[float], Optional[int], str, str, int]]:
+    """Match a log line which starts a new entry.
+
+    Returns the timestamp, frame, category and verbosity of the entry, and the index its
+    message starts at, or None if the line continues the previous entry. timed is whether
+    a line with a [timestamp][frame] prefix came before this one.
+    """
+    if text[:1] == "[":
+        captured = RE_UE4_LOG_ENTRY.match(text)
+        if captured is not None:
+            try:
+                timestamp: Optional[float] = parse_ue4_timestamp(
+                    captured.group("timestamp")
+                )
+            except ValueError:
+                timestamp = None
+            return (
+                timestamp,
+                int(captured.group("frame")),
+                captured.group("category"),
+                captured.group("verbosity") or "Log",
+                captured.end(),
+            )
+    if timed:
+        return None
+    captured = RE_UE4_LOG_UNTIMED_ENTRY.match(text)
+    if captured is None:
+        return None
+    return (
+        None,
+        None,
+        captured.group("category"),
+        captured.group("verbosity") or "Log",
+        captured.end(),
+    )
+
+
+def iter_unreal_log(
+    buffer: Any, line: int = 1, timed: bool = False
+) -> Iterator[UnrealLogEntry]:
+    """Lazily parse entries from the current position of a binary buffer with readline and tell, such as an mmap of a log file.
+
+    A line starts a new entry when it has a [timestamp][frame] prefix. Until the first
+    such line, lines starting with Category: do too, which covers logs written without
+    timestamps and the header of a log. Any other line continues the previous entry,
+    except the first line read, which always starts one. line is the number of the
+    first line read, and timed whether a [timestamp][frame] line came before it.
+    """
+    header: Optional[
+        Tuple[int, int, Optional[float], Optional[int], Optional[str], str]
+    ] = None
+    message_lines: List[str] = []
+    next_offset = buffer.tell()
+    for line_number, raw_line in enumerate(iter(buffer.readline, b""), line):
+        offset = next_offset
+        next_offset += len(raw_line)
+        text = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if offset == 0:
+            text = text.lstrip("\ufeff")
+
+        matched = match_unreal_log_entry(text, timed)
+        if matched is None and header is not None:
+            message_lines.append(text)
+            continue
+
+        if header is not None:
+            yield UnrealLogEntry(*header, "\n".join(message_lines))
+        if matched is None:
+            header = (offset, line_number, None, None, None, "Log")
+            message_lines = [text]
+        else:
+            timestamp, frame, category, verbosity, end = matched
+            timed = timed or frame is not None
+            header = (offset, line_number, timestamp, frame, category, verbosity)
+            message_lines = [text[end:]]
+    if header is not None:
+        yield UnrealLogEntry(*header, "\n".join(message_lines))
+
+
+def read_unreal_log(log_file: str) -> Iterator[UnrealLogEntry]:
+    """Lazily parse entries from a UE4Editor/UE4Game log file, memory-mapping it so memory use does not grow with its size."""
+    with open(log_file, "rb") as _log_file:
+        if os.fstat(_log_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(_log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+            yield from iter_unreal_log(log_map)
+
+
+def unreal_log_to_jsonl(log_file: str, jsonl_file: str) -> int:
+    """Write the entries of a UE4Editor/UE4Game log file to JSON Lines, returning the number of entries."""
+    count = 0
+    with open(jsonl_file, "w", encoding="utf-8") as _jsonl_file:
+        for entry in read_unreal_log(log_file):
+            record = entry._asdict()
+            record["file"] = log_file
+            _jsonl_file.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def unreal_logs_to_jsonl(
+    jsonl_file: str, *log_files: str, max_workers: Optional[int] = None
+) -> None:
+    """Convert UE4Editor/UE4Game log files to a single JSON Lines file, parsing files in parallel."""
+    if max_workers is not None:
+        # max_workers is given as a string on the commandline
+        max_workers = int(max_workers)
+    if len(log_files) == 1:
+        count = unreal_log_to_jsonl(log_files[0], jsonl_file)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            part_files = [
+                os.path.join(temp_dir, f"{index}.jsonl")
+                for index in range(len(log_files))
+            ]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                count = sum(executor.map(unreal_log_to_jsonl, log_files, part_files))
+            with open(jsonl_file, "wb") as _jsonl_file:
+                for part_file in part_files:
+                    with open(part_file, "rb") as _part_file:
+                        shutil.copyfileobj(_part_file, _jsonl_file)
+    logging.info(
+        f"Wrote {count} log entries from {len(log_files)} files to {jsonl_file}"
+    )
+
+
+@contextmanager
+def _lock_file(lock_file: str) -> Iterator[None]:
+    """Hold an exclusive lock on a lock file, shared by every process using it."""
+    with open(lock_file, "a+b") as _lock_file:
+        if os.name == "posix":
+            # Standard Library
+            import fcntl
+
+            fcntl.flock(_lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+        else:
+            # Standard Library
+            import msvcrt
+
+            _lock_file.seek(0)
+            msvcrt.locking(_lock_file.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore
+            try:
+                yield
+            finally:
+                _lock_file.seek(0)
+                msvcrt.locking(_lock_file.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore
+
+
+class UnrealLogIndex(object):
+    """Sidecar index of the entries of a UE4Editor/UE4Game log file, for queries which seek instead of rescanning.
+
+    Maps verbosities and categories to the entries which have them, and each minute
+    to the range of entries timestamped within it. Only complete lines are indexed, so
+    update can resume where the previous pass stopped as the log grows; the index is
+    rebuilt from scratch if the log was truncated or replaced.
+
+    The sidecar file is a line of JSON header followed by chunks, each a line of JSON
+    describing the entries indexed by one update and their arrays in binary. save
+    appends a chunk for the entries indexed since the file was last read or written,
+    holding a lock file; if another process wrote the sidecar file in the meantime,
+    it is reloaded and rewritten whole instead.
+    """
+
+    VERSION = 2
+    HEAD_SIZE = 4096
+    # Byte offsets need 64 bits; line numbers and entry indices fit in 32.
+    OFFSET_TYPECODE = "q"
+    INDEX_TYPECODE = "I"
+
+    def __init__(self, log_file: str, index_file: Optional[str] = None) -> None:
+        """Initialize a new, empty, UnrealLogIndex."""
+        self.log_file: str = log_file
+        self.index_file: str = index_file or f"{log_file}.index"
+        self.reset()
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of UnrealLogIndex."""
+        return f"<UnrealLogIndex {self.log_file} with {len(self)} entries>"
+
+    def __len__(self) -> int:
+        """Count the entries indexed."""
+        return len(self.offsets)
+
+    @staticmethod
+    def open(log_file: str, index_file: Optional[str] = None) -> UnrealLogIndex:
+        """Load the sidecar index of a log file, bringing it up to date and saving it if the log grew."""
+        index = UnrealLogIndex(log_file, index_file)
+        if os.path.isfile(index.index_file):
+            try:
+                index.load()
+            except (OSError, EOFError, ValueError, KeyError, TypeError):
+                index.reset()
+        index.update()
+        index.save()
+        return index
+
+    @property
+    def categories(self) -> List[str]:
+        """Get the sorted names of every category indexed."""
+        return sorted(self.__categories)
+
+    @property
+    def verbosities(self) -> List[str]:
+        """Get the sorted names of every verbosity indexed."""
+        return sorted(self.__verbosities)
+
+    def reset(self) -> None:
+        """Forget every indexed entry."""
+        self.size: int = 0
+        self.line_count: int = 0
+        self.head: str = ""
+        self.first_timed: Optional[int] = None
+        self.offsets: array.array[int] = array.array(UnrealLogIndex.OFFSET_TYPECODE)
+        self.lines: array.array[int] = array.array(UnrealLogIndex.INDEX_TYPECODE)
+        self.__categories: Dict[str, array.array[int]] = {}
+        self.__verbosities: Dict[str, array.array[int]] = {}
+        self.__minutes: Dict[int, List[int]] = {}
+        self.__saved: Optional[int] = None
+        self.__saved_state: Optional[Tuple[int, int, str]] = None
+        self.__saved_chunk: int = 0
+        self.__saved_bytes: int = 0
+
+    def update(self) -> int:
+        """Index the complete lines appended to the log since the last update, returning the number of new entries."""
+        with open(self.log_file, "rb") as _log_file:
+            size = os.fstat(_log_file.fileno()).st_size
+            if size < self.size or self.__read_head(_log_file, self.size) != self.head:
+                self.reset()
+            if size == self.size:
+                return 0
+            with mmap.mmap(_log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+                count = self.__index(log_map)
+            self.head = self.__read_head(_log_file, self.size)
+        return count
+
+    def load(self) -> None:
+        """Read the index from its sidecar file, written by dump and save."""
+        with open(self.index_file, "rb") as _index_file:
+            header = json.loads(_index_file.readline())
+            if (
+                not isinstance(header, dict)
+                or header.get("Version") != UnrealLogIndex.VERSION
+            ):
+                raise ValueError(f"Unsupported log index file: {self.index_file}")
+            self.reset()
+            if header["ItemSizes"] != [self.offsets.itemsize, self.lines.itemsize]:
+                raise ValueError(f"Unsupported log index file: {self.index_file}")
+            swap = header["ByteOrder"] != sys.byteorder
+            while True:
+                chunk_offset = _index_file.tell()
+                chunk_line = _index_file.readline()
+                if not chunk_line:
+                    break
+                self.__read_chunk(_index_file, json.loads(chunk_line), swap)
+                self.__saved_chunk = chunk_offset
+            self.__saved_bytes = _index_file.tell()
+        self.__saved = len(self)
+
+    def dump(self) -> None:
+        """Atomically write the whole index to its sidecar file."""
+        with _lock_file(f"{self.index_file}.lock"):
+            self.__dump()
+
+    def save(self) -> None:
+        """Append the entries indexed since the sidecar file was last read or written, or dump the index if it was reset."""
+        if self.__saved is not None and self.__saved_state == (
+            self.size,
+            self.line_count,
+            self.head,
+        ):
+            return
+        with _lock_file(f"{self.index_file}.lock"):
+            if self.__saved is None:
+                self.__dump()
+                return
+            if not self.__is_saved():
+                # Another process wrote the sidecar file since it was read here.
+                try:
+                    self.load()
+                except (OSError, EOFError, ValueError, KeyError, TypeError):
+                    self.reset()
+                self.update()
+                self.__dump()
+                return
+            with open(self.index_file, "ab") as _index_file:
+                self.__write_chunk(_index_file, self.__saved)
+            self.__saved = len(self)
+
+    def __dump(self) -> None:
+        temp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(temp_file, "wb") as _index_file:
+            _index_file.write(
+                json.dumps(
+                    {
+                        "Version": UnrealLogIndex.VERSION,
+                        "ByteOrder": sys.byteorder,
+                        "ItemSizes": [
+                            self.offsets.itemsize,
+                            self.lines.itemsize,
+                        ],
+                    }
+                ).encode("utf-8")
+                + b"\n"
+            )
+            self.__write_chunk(_index_file, 0)
+        os.replace(temp_file, self.index_file)
+        self.__saved = len(self)
+
+    def __is_saved(self) -> bool:
+        """Whether the sidecar file still ends with the chunk last read or written by this index."""
+        try:
+            with open(self.index_file, "rb") as _index_file:
+                if os.fstat(_index_file.fileno()).st_size != self.__saved_bytes:
+                    return False
+                _index_file.seek(self.__saved_chunk)
+                chunk = json.loads(_index_file.readline())
+        except (OSError, ValueError):
+            return False
+        return isinstance(chunk, dict) and self.__saved_state == (
+            chunk.get("Size"),
+            chunk.get("Lines"),
+            chunk.get("Head"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON serializable representation of this UnrealLogIndex."""
+        return {
+            "Version": UnrealLogIndex.VERSION,
+            "Size": self.size,
+            "Lines": self.line_count,
+            "Head": self.head,
+            "FirstTimed": self.first_timed,
+            "Offsets": self.offsets.tolist(),
+            "LineNumbers": self.lines.tolist(),
+            "Categories": {
+                name: indices.tolist() for name, indices in self.__categories.items()
+            },
+            "Verbosities": {
+                name: indices.tolist() for name, indices in self.__verbosities.items()
+            },
+            "Minutes": {
+                str(minute): bounds for minute, bounds in self.__minutes.items()
+            },
+        }
+
+    def find(
+        self,
+        verbosity: Optional[str] = None,
+        category: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[int]:
+        """Get the indices of entries which may match a query, using only the index.
+
+        Entries are narrowed to the minutes from start to end, seconds since the epoch
+        in UTC; use query to also compare their exact timestamps.
+        """
+        first = 0
+        last = len(self) - 1
+        if start is not None or end is not None:
+            if not self.__minutes:
+                return []
+            start_minute = (
+                int(start // 60) if start is not None else min(self.__minutes)
+            )
+            end_minute = int(end // 60) if end is not None else max(self.__minutes)
+            bounds = [
+                bounds
+                for minute, bounds in self.__minutes.items()
+                if start_minute <= minute <= end_minute
+            ]
+            if not bounds:
+                return []
+            first = min(bound[0] for bound in bounds)
+            last = max(bound[1] for bound in bounds)
+
+        selections = []
+        if verbosity is not None:
+            selections.append(
+                self.__verbosities.get(
+                    verbosity, array.array(UnrealLogIndex.INDEX_TYPECODE)
+                )
+            )
+        if category is not None:
+            selections.append(
+                self.__categories.get(
+                    category, array.array(UnrealLogIndex.INDEX_TYPECODE)
+                )
+            )
+        if not selections:
+            return list(range(first, last + 1))
+
+        selections.sort(key=len)
+        lower = bisect.bisect_left(selections[0], first)
+        upper = bisect.bisect_right(selections[0], last)
+        indices = selections[0][lower:upper].tolist()
+        for selection in selections[1:]:
+            # Both arrays are sorted, so each lookup resumes after the previous match.
+            position = bisect.bisect_left(selection, first)
+            end_position = bisect.bisect_right(selection, last, position)
+            matches = []
+            for index in indices:
+                position = bisect.bisect_left(selection, index, position, end_position)
+                if position == end_position:
+                    break
+                if selection[position] == index:
+                    matches.append(index)
+            indices = matches
+        return indices
+
+    def query(
+        self,
+        verbosity: Optional[str] = None,
+        category: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Iterator[UnrealLogEntry]:
+        """Lazily read the entries with a verbosity and category, timestamped from start until before end.
+
+        Seeks directly to each matching entry in the log file.
+        """
+        indices = self.find(verbosity, category, start, end)
+        if not indices:
+            return
+        with open(self.log_file, "rb") as _log_file:
+            with mmap.mmap(_log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+                for index in indices:
+                    log_map.seek(self.offsets[index])
+                    timed = self.first_timed is not None and index > self.first_timed
+                    entry = next(
+                        iter_unreal_log(log_map, line=self.lines[index], timed=timed)
+                    )
+                    if start is not None or end is not None:
+                        if entry.timestamp is None:
+                            continue
+                        if start is not None and entry.timestamp < start:
+                            continue
+                        if end is not None and entry.timestamp >= end:
+                            continue
+                    yield entry
+
+    def __index(self, log_map: Any) -> int:
+        count = 0
+        offset = self.size
+        log_map.seek(offset)
+        for raw_line in iter(log_map.readline, b""):
+            if not raw_line.endswith(b"\n"):
+                break
+            line_offset = offset
+            offset += len(raw_line)
+            self.line_count += 1
+            text = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line_offset == 0:
+                text = text.lstrip("\ufeff")
+
+            matched = match_unreal_log_entry(text, self.first_timed is not None)
+            if matched is None and len(self):
+                continue
+
+            index = len(self)
+            self.offsets.append(line_offset)
+            self.lines.append(self.line_count)
+            count += 1
+            if matched is None:
+                self.__verbosities.setdefault(
+                    "Log", array.array(UnrealLogIndex.INDEX_TYPECODE)
+                ).append(index)
+                continue
+
+            timestamp, frame, category, verbosity, _end = matched
+            self.__categories.setdefault(
+                category, array.array(UnrealLogIndex.INDEX_TYPECODE)
+            ).append(index)
+            self.__verbosities.setdefault(
+                verbosity, array.array(UnrealLogIndex.INDEX_TYPECODE)
+            ).append(index)
+            if frame is not None and self.first_timed is None:
+                self.first_timed = index
+            if timestamp is not None:
+                bounds = self.__minutes.setdefault(int(timestamp // 60), [index, index])
+                bounds[1] = index
+        self.size = offset
+        return count
+
+    def __write_chunk(self, index_file: IO[bytes], start: int) -> None:
+        def tail(indices: array.array[int]) -> array.array[int]:
+            first = bisect.bisect_left(indices, start)
+            return indices[first:]
+
+        categories = [
+            (name, tail(indices))
+            for name, indices in self.__categories.items()
+            if indices and indices[-1] >= start
+        ]
+        verbosities = [
+            (name, tail(indices))
+            for name, indices in self.__verbosities.items()
+            if indices and indices[-1] >= start
+        ]
+        chunk = {
+            "Size": self.size,
+            "Lines": self.line_count,
+            "Head": self.head,
+            "FirstTimed": self.first_timed,
+            "Entries": len(self) - start,
+            "Categories": [[name, len(indices)] for name, indices in categories],
+            "Verbosities": [[name, len(indices)] for name, indices in verbosities],
+            "Minutes": {
+                str(minute): bounds
+                for minute, bounds in self.__minutes.items()
+                if bounds[1] >= start
+            },
+        }
+        self.__saved_chunk = index_file.tell()
+        index_file.write(json.dumps(chunk).encode("utf-8") + b"\n")
+        self.offsets[start:].tofile(index_file)  # type: ignore
+        self.lines[start:].tofile(index_file)  # type: ignore
+        for _name, indices in categories + verbosities:
+            indices.tofile(index_file)  # type: ignore
+        self.__saved_bytes = index_file.tell()
+        self.__saved_state = (self.size, self.line_count, self.head)
+
+    def __read_chunk(
+        self, index_file: IO[bytes], chunk: Dict[str, Any], swap: bool
+    ) -> None:
+        def read(indices: array.array[int], count: int) -> None:
+            start = len(indices)
+            indices.fromfile(index_file, count)  # type: ignore
+            if swap:
+                tail = indices[start:]
+                tail.byteswap()
+                indices[start:] = tail
+
+        read(self.offsets, chunk["Entries"])
+        read(self.lines, chunk["Entries"])
+        for name, count in chunk["Categories"]:
+            read(
+                self.__categories.setdefault(
+                    name, array.array(UnrealLogIndex.INDEX_TYPECODE)
+                ),
+                count,
+            )
+        for name, count in chunk["Verbosities"]:
+            read(
+                self.__verbosities.setdefault(
+                    name, array.array(UnrealLogIndex.INDEX_TYPECODE)
+                ),
+                count,
+            )
+        self.__minutes.update(
+            (int(minute), list(bounds)) for minute, bounds in chunk["Minutes"].items()
+        )
+        self.size = chunk["Size"]
+        self.line_count = chunk["Lines"]
+        self.head = chunk["Head"]
+        self.first_timed = chunk["FirstTimed"]
+        self.__saved_state = (self.size, self.line_count, self.head)
+
+    @staticmethod
+    def __read_head(log_file: IO[bytes], size: int) -> str:
+        log_file.seek(0)
+        return hashlib.sha1(
+            log_file.read(min(size, UnrealLogIndex.HEAD_SIZE))
+        ).hexdigest()  # nosec
@@ -4,10 +4,11 @@
 from __future__ import annotations
 
 # Standard Library
-import glob
-import os
 from typing import Any, Dict, List, Optional, Union
 
+# CrazyHusk
+from crazyhusk.discovery import SourceIndex
+
 __all__ = ["ModuleDescriptor"]
 
 HOST_TYPES = frozenset(
@@ -145,10 +146,13 @@ class ModuleDescriptor(object):
             raise UnrealModuleError(
                 f"Could not find module definition file. {owner!r} does not define a source_dir attribute."
             )
-        found = glob.glob(
-            os.path.join(owner.source_dir, "**", f"{self.name}.Build.cs"),
-            recursive=True,
-        )
+        if self.name is None:
+            return None
+        index = SourceIndex.for_directory(owner.source_dir)
+        found = index.build_files(self.name)
+        if len(found) == 0:
+            index.refresh()
+            found = index.build_files(self.name)
         if len(found) == 1:
             return found[0]
         return None
@@ -11,18 +11,10 @@ from typing import Any, Dict, Iterable, List, Optional, Union
 
 # CrazyHusk
 from crazyhusk.build import Buildable
+from crazyhusk.code import CodeTemplate, CodeTemplateCatalog
 from crazyhusk.engine import UnrealEngine
-
-try:
-    # Standard Library
-    from importlib.metadata import entry_points  # type:ignore
-except ImportError:
-    # Third Party
-    from importlib_metadata import entry_points  # type:ignore
-
-# CrazyHusk
-from crazyhusk.code import CodeTemplate
 from crazyhusk.module import ModuleDescriptor
+from crazyhusk.registry import load_entry_points
 
 __all__ = ["UnrealPlugin"]
 
@@ -254,21 +246,17 @@ class UnrealPlugin(Buildable):
         self.__name: Optional[str] = None
         self.__modules: Optional[Dict[str, ModuleDescriptor]] = None
         self.__plugin_refs: Optional[Dict[str, PluginReferenceDescriptor]] = None
-        self.__code_templates: Optional[Dict[str, CodeTemplate]] = None
+        self.__code_templates: Optional[CodeTemplateCatalog] = None
 
     def __repr__(self) -> str:
         """Python interpreter representation of UnrealPlugin."""
         return f"<UnrealPlugin at {self.plugin_file}>"
 
     @property
-    def code_templates(self) -> Dict[str, CodeTemplate]:
-        """Get a mapping of this UnrealPlugin's available C++ code templates."""
+    def code_templates(self) -> CodeTemplateCatalog:
+        """Get a lazily loaded mapping of this UnrealPlugin's available C++ code templates."""
         if self.__code_templates is None:
-            self.__code_templates = {
-                template.name: template
-                for entry_point in entry_points().get("crazyhusk.code.listers", [])
-                for template in entry_point.load()(self)
-            }
+            self.__code_templates = CodeTemplateCatalog(self.__list_code_templates)
         return self.__code_templates
 
     @property
@@ -284,6 +272,13 @@ class UnrealPlugin(Buildable):
 
         return self.__descriptor
 
+    @descriptor.setter
+    def descriptor(self, new_descriptor: PluginDescriptor) -> None:
+        """Set this UnrealPlugin's PluginDescriptor, such as one restored from a PluginIndex."""
+        self.__descriptor = new_descriptor
+        self.__modules = None
+        self.__plugin_refs = None
+
     @property
     def engine(self) -> Optional[UnrealEngine]:
         """Get the associated UnrealEngine object for this Buildable."""
@@ -339,6 +334,10 @@ class UnrealPlugin(Buildable):
         """Path to this plugin's Source directory."""
         return os.path.join(self.plugin_dir, "Source")
 
+    def __list_code_templates(self) -> Iterable[CodeTemplate]:
+        for lister in load_entry_points("crazyhusk.code.listers"):
+            yield from lister(self)
+
     # crazyhusk.code.listers
     @staticmethod
     def list_plugin_code_templates(plugin: UnrealPlugin) -> Iterable[CodeTemplate]:
@@ -347,14 +346,7 @@ class UnrealPlugin(Buildable):
             for template_filename in glob.iglob(
                 os.path.join(plugin.content_dir, "Editor", "Templates", "*.template")
             ):
-                with open(
-                    template_filename,
-                    encoding="utf-8",
-                ) as _template_file:
-                    yield CodeTemplate(
-                        os.path.basename(os.path.splitext(template_filename)[0]),
-                        _template_file.read(),
-                    )
+                yield CodeTemplate.from_file(template_filename)
 
     # crazyhusk.plugin.validators
     @staticmethod
@@ -431,5 +423,5 @@ class UnrealPlugin(Buildable):
 
     def validate(self) -> None:
         """Raise exceptions if this instance is misconfigured."""
-        for entry_point in entry_points().get("crazyhusk.plugin.validators", []):
-            entry_point.load()(self)
+        for validator in load_entry_points("crazyhusk.plugin.validators"):
+            validator(self)
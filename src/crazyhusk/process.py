@@ -0,0 +1,865 @@
+"""Deadlock-free reading of subprocess output for Unreal executables."""
+
+# Future Standard Library
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import codecs
+import collections
+import gzip
+import locale
+import lzma
+import os
+import queue
+import selectors
+import signal
+import subprocess  # nosec
+import sys
+import threading
+import time
+import weakref
+from types import TracebackType
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+READ_SIZE = 65536
+ASYNC_QUEUE_SIZE = 4096
+DEFAULT_TAIL_LINES = 100
+DEFAULT_FLUSH_SECONDS = 5.0
+DEFAULT_KILL_GRACE = 10.0
+DEFAULT_SAMPLE_SECONDS = 1.0
+
+TIMEOUT = "timeout"
+IDLE_TIMEOUT = "idle_timeout"
+
+
+def kill_process_tree(process: Union[int, subprocess.Popen]) -> None:  # type: ignore
+    """Kill a process and every process it started, right away.
+
+    On POSIX, kills the process group of a process started with start_new_session,
+    or only the process otherwise. Elsewhere, uses taskkill to kill the whole tree.
+    Given a Popen rather than a pid, nothing is signalled once wait_process has
+    reaped the process, as its pid may already be reused.
+    """
+    _signal_process_tree(process, force=True)
+
+
+def terminate_process_tree(process: Union[int, subprocess.Popen]) -> None:  # type: ignore
+    """Ask a process and every process it started to exit, as kill_process_tree does with SIGTERM."""
+    _signal_process_tree(process, force=False)
+
+
+def _signal_process_tree(
+    process: Union[int, subprocess.Popen], force: bool  # type: ignore
+) -> None:
+    if isinstance(process, subprocess.Popen):
+        # Reapers set returncode while holding the lock, so the pid is still ours here.
+        with _REAPERS_LOCK:
+            if process.returncode is None:
+                _signal_pid_tree(process.pid, force)
+    else:
+        _signal_pid_tree(process, force)
+
+
+def _signal_pid_tree(pid: int, force: bool) -> None:
+    if os.name == "posix":
+        sig = signal.SIGKILL if force else signal.SIGTERM  # type: ignore
+        try:
+            if os.getpgid(pid) == pid:
+                os.killpg(pid, sig)  # type: ignore
+            else:
+                os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+    else:
+        subprocess.run(  # nosec
+            ["taskkill", *(["/F"] if force else []), "/T", "/PID", str(pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+
+
+class Watchdog(object):
+    """Wall-clock and idle time limits of a subprocess, which stop its process tree when one expires.
+
+    The tree is terminated first, then killed if it is still running kill_grace seconds
+    later. If its output is still open kill_grace seconds after that, for example held
+    by a process which left the tree, the run is abandoned and callers stop reading.
+    Callers block on output or exit for at most wait_time() seconds before calling
+    check() again, so each deadline is enforced when it falls due.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        kill_grace: float = DEFAULT_KILL_GRACE,
+    ) -> None:
+        """Initialize a new Watchdog, starting its clocks."""
+        self.timeout: Optional[float] = None if timeout is None else float(timeout)
+        self.idle_timeout: Optional[float] = (
+            None if idle_timeout is None else float(idle_timeout)
+        )
+        self.kill_grace: float = float(kill_grace)
+        self.started: float = time.monotonic()
+        self.last_output: float = self.started
+        self.expired: Optional[str] = None
+        self.abandoned: bool = False
+        self.__kill_at: Optional[float] = None
+        self.__abandon_at: Optional[float] = None
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of Watchdog."""
+        return f"<Watchdog timeout={self.timeout} idle_timeout={self.idle_timeout}>"
+
+    @property
+    def elapsed(self) -> float:
+        """Get the seconds since the watchdog started."""
+        return time.monotonic() - self.started
+
+    @property
+    def limit(self) -> Optional[float]:
+        """Get the seconds allowed by the limit which expired, if any."""
+        if self.expired == IDLE_TIMEOUT:
+            return self.idle_timeout
+        if self.expired == TIMEOUT:
+            return self.timeout
+        return None
+
+    def output(self) -> None:
+        """Record output from the subprocess, restarting the idle timeout."""
+        self.last_output = time.monotonic()
+
+    def wait_time(self) -> Optional[float]:
+        """Get the seconds until the next limit or kill is due, or None if there is nothing left to enforce."""
+        deadlines: List[float] = []
+        if self.expired is None:
+            if self.timeout is not None:
+                deadlines.append(self.started + self.timeout)
+            if self.idle_timeout is not None:
+                deadlines.append(self.last_output + self.idle_timeout)
+        elif self.__kill_at is not None:
+            deadlines.append(self.__kill_at)
+        elif self.__abandon_at is not None:
+            deadlines.append(self.__abandon_at)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def check(self, process: Union[int, subprocess.Popen]) -> Optional[str]:  # type: ignore
+        """Terminate or kill the process tree of a pid or Popen if a limit or the kill grace expired, returning the expired limit.
+
+        Sets abandoned once the kill grace expired again after the kill.
+        """
+        now = time.monotonic()
+        if self.expired is None:
+            if self.timeout is not None and now >= self.started + self.timeout:
+                self.expired = TIMEOUT
+            elif (
+                self.idle_timeout is not None
+                and now >= self.last_output + self.idle_timeout
+            ):
+                self.expired = IDLE_TIMEOUT
+            if self.expired is not None:
+                terminate_process_tree(process)
+                self.__kill_at = now + self.kill_grace
+        elif self.__kill_at is not None and now >= self.__kill_at:
+            kill_process_tree(process)
+            self.__kill_at = None
+            self.__abandon_at = now + self.kill_grace
+        elif self.__abandon_at is not None and now >= self.__abandon_at:
+            self.abandoned = True
+            self.__abandon_at = None
+        return self.expired
+
+
+class ProcessUsage(NamedTuple):
+    """CPU time in seconds and peak resident memory in bytes of an exited process, as reported by os.wait4."""
+
+    user_time: float
+    system_time: float
+    max_rss: int
+
+
+def exit_code(status: int) -> int:
+    """Decode a wait status into a return code, negative for a process killed by a signal, as subprocess does."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class _ProcessReaper(threading.Thread):
+    """Thread blocking until a process exits, then reaping it with os.wait4, so waits with a timeout need not poll."""
+
+    def __init__(self, process: subprocess.Popen) -> None:  # type: ignore
+        super().__init__(name=f"wait4({process.pid})", daemon=True)
+        self.pid: int = process.pid
+        self.usage: Optional[ProcessUsage] = None
+        self.__process = weakref.ref(process)
+
+    def run(self) -> None:
+        try:
+            if hasattr(os, "waitid"):
+                # Wait without reaping, so the pid is not reused before returncode is set.
+                os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOWAIT)  # type: ignore
+                with _REAPERS_LOCK:
+                    self.__reaped(*os.wait4(self.pid, 0))  # type: ignore
+            else:
+                result = os.wait4(self.pid, 0)  # type: ignore
+                with _REAPERS_LOCK:
+                    self.__reaped(*result)
+        except ChildProcessError:
+            pass
+
+    def __reaped(self, _pid: int, status: int, rusage: Any) -> None:
+        process = self.__process()
+        if process is not None:
+            process.returncode = exit_code(status)
+        max_rss = rusage.ru_maxrss
+        if sys.platform != "darwin":
+            max_rss *= 1024
+        self.usage = ProcessUsage(rusage.ru_utime, rusage.ru_stime, max_rss)
+
+
+_REAPERS: weakref.WeakKeyDictionary[
+    subprocess.Popen, _ProcessReaper  # type: ignore
+] = weakref.WeakKeyDictionary()
+_REAPERS_LOCK = threading.Lock()
+
+
+def wait_process(
+    process: subprocess.Popen, timeout: Optional[float] = None  # type: ignore
+) -> Optional[ProcessUsage]:
+    """Wait for a process to exit, returning its resource usage where the platform reports it.
+
+    On POSIX, the process is reaped with os.wait4 on a helper thread, which sets its
+    returncode; a wait which times out is resumed by the next call. Elsewhere, this
+    is Popen.wait, returning None. Raises subprocess.TimeoutExpired on timeout.
+    """
+    if not hasattr(os, "wait4"):
+        process.wait(timeout)
+        return None
+
+    with _REAPERS_LOCK:
+        reaper = _REAPERS.get(process)
+        if reaper is None:
+            if process.returncode is not None:
+                return None
+            reaper = _REAPERS[process] = _ProcessReaper(process)
+            reaper.start()
+    reaper.join(timeout)
+    if reaper.is_alive():
+        raise subprocess.TimeoutExpired(process.args, timeout)  # type: ignore
+    with _REAPERS_LOCK:
+        _REAPERS.pop(process, None)
+    if process.returncode is None:
+        process.wait(timeout)
+    return reaper.usage
+
+
+class ResourceSample(NamedTuple):
+    """Memory in bytes and I/O of a process tree at a point of its run."""
+
+    elapsed: float
+    processes: int
+    rss: int
+    peak_rss: int
+    read_bytes: int
+    write_bytes: int
+
+
+class ProcessSampler(object):
+    """Sample memory and I/O of a process tree from /proc on a background thread.
+
+    The tree is the process group of a process started with start_new_session.
+    A sample is taken when started, then every interval seconds until stopped.
+    Nothing is sampled where /proc is not available.
+    """
+
+    def __init__(self, pid: int, interval: float = DEFAULT_SAMPLE_SECONDS) -> None:
+        """Initialize a new ProcessSampler."""
+        self.pid: int = pid
+        self.interval: float = float(interval)
+        self.samples: List[ResourceSample] = []
+        self.__started: float = time.monotonic()
+        self.__stopped = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of ProcessSampler."""
+        return f"<ProcessSampler of {self.pid} every {self.interval} seconds>"
+
+    def __enter__(self) -> ProcessSampler:
+        """Start sampling."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop sampling."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start sampling on a background thread."""
+        if self.__thread is None and os.path.isdir("/proc"):
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling, waiting for the background thread to finish."""
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def sample(self) -> Optional[ResourceSample]:
+        """Take a sample of the process tree now, or None if none of it is running."""
+        processes = rss = peak_rss = read_bytes = write_bytes = 0
+        for pid in self.__list_tree():
+            status = ProcessSampler.__read_fields(f"/proc/{pid}/status")
+            io = ProcessSampler.__read_fields(f"/proc/{pid}/io")
+            if not status or status.get("State", "").startswith("Z"):
+                continue
+            processes += 1
+            rss += int(status.get("VmRSS", "0 kB").split()[0]) * 1024
+            peak_rss += int(status.get("VmHWM", "0 kB").split()[0]) * 1024
+            read_bytes += int(io.get("read_bytes", 0))
+            write_bytes += int(io.get("write_bytes", 0))
+        if not processes:
+            return None
+        sample = ResourceSample(
+            time.monotonic() - self.__started,
+            processes,
+            rss,
+            peak_rss,
+            read_bytes,
+            write_bytes,
+        )
+        self.samples.append(sample)
+        return sample
+
+    def __run(self) -> None:
+        while True:
+            self.sample()
+            if self.__stopped.wait(self.interval):
+                return
+
+    def __list_tree(self) -> List[int]:
+        pids = [self.pid]
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit() or int(entry) == self.pid:
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as _stat_file:
+                    stat = _stat_file.read()
+            except OSError:
+                continue
+            fields = stat.rpartition(b")")[2].split()
+            if len(fields) > 2 and int(fields[2]) == self.pid:
+                pids.append(int(entry))
+        return pids
+
+    @staticmethod
+    def __read_fields(proc_file: str) -> Dict[str, str]:
+        try:
+            with open(proc_file, encoding="utf-8", errors="replace") as _proc_file:
+                lines = _proc_file.read().splitlines()
+        except OSError:
+            return {}
+        fields = {}
+        for line in lines:
+            name, _, value = line.partition(":")
+            fields[name] = value.strip()
+        return fields
+
+
+class RunResult(int):
+    """Return code of a run of a subprocess, with the resources the run used.
+
+    Compares and formats as its return code, so it can be used wherever a return code
+    is expected. CPU time and max_rss are None where the platform does not report
+    them, and samples is empty unless the run was sampled with a ProcessSampler.
+    """
+
+    cmd: List[str]
+    wall_time: float
+    user_time: Optional[float]
+    system_time: Optional[float]
+    max_rss: Optional[int]
+    samples: List[ResourceSample]
+
+    def __new__(
+        cls,
+        returncode: int,
+        cmd: Sequence[str] = (),
+        wall_time: float = 0.0,
+        usage: Optional[ProcessUsage] = None,
+        samples: Sequence[ResourceSample] = (),
+    ) -> RunResult:
+        """Create a new RunResult."""
+        result = super().__new__(cls, returncode)
+        result.cmd = list(cmd)
+        result.wall_time = wall_time
+        result.user_time = None if usage is None else usage.user_time
+        result.system_time = None if usage is None else usage.system_time
+        result.max_rss = None if usage is None else usage.max_rss
+        result.samples = list(samples)
+        return result
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of RunResult."""
+        return f"<RunResult {self.returncode} after {self.wall_time:.3f} seconds>"
+
+    def __str__(self) -> str:
+        """Format a RunResult as its return code."""
+        return str(self.returncode)
+
+    @property
+    def returncode(self) -> int:
+        """Get the return code of the run."""
+        return int(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON serializable summary of the run."""
+        return {
+            "returncode": self.returncode,
+            "cmd": self.cmd,
+            "wall_time": self.wall_time,
+            "user_time": self.user_time,
+            "system_time": self.system_time,
+            "max_rss": self.max_rss,
+            "samples": [sample._asdict() for sample in self.samples],
+        }
+
+
+class OutputLine(NamedTuple):
+    """A line of subprocess output, tagged with the stream it was written to."""
+
+    stream: str
+    text: str
+
+
+class LineDecoder(object):
+    """Incrementally decode raw bytes of a stream into complete lines."""
+
+    def __init__(self, encoding: str, errors: str = "replace") -> None:
+        """Initialize a new LineDecoder."""
+        self.__decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        self.__pending: str = ""
+
+    def feed(self, data: bytes) -> List[str]:
+        """Decode a chunk of bytes, returning the lines it completed without line endings."""
+        text = self.__pending + self.__decoder.decode(data)
+        lines = text.split("\n")
+        self.__pending = lines.pop()
+        return [line.rstrip("\r") for line in lines]
+
+    def flush(self) -> List[str]:
+        """Decode any buffered bytes at the end of the stream, returning the final unterminated line if any."""
+        text = self.__pending + self.__decoder.decode(b"", final=True)
+        self.__pending = ""
+        lines = text.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return [line.rstrip("\r") for line in lines]
+
+
+class ProcessStreams(object):
+    """Multiplexed reader of a subprocess's stdout and stderr pipes.
+
+    Both pipes are drained as soon as data is available, so a child writing heavily
+    to either stream can never block on a full pipe. Pipes are read as raw bytes
+    and decoded incrementally. Uses selectors on POSIX, and a reader thread per
+    stream elsewhere.
+    """
+
+    def __init__(
+        self,
+        process: subprocess.Popen,  # type: ignore
+        encoding: Optional[str] = None,
+        errors: str = "replace",
+    ) -> None:
+        """Initialize a new ProcessStreams for a process started with binary stdout/stderr pipes."""
+        self.process = process
+        self.encoding: str = encoding or locale.getpreferredencoding(False)
+        self.__decoders: Dict[str, LineDecoder] = {}
+        self.__streams: Dict[str, IO[bytes]] = {}
+        for name, stream in ((STDOUT, process.stdout), (STDERR, process.stderr)):
+            if stream is not None:
+                self.__streams[name] = stream
+                self.__decoders[name] = LineDecoder(self.encoding, errors)
+
+        self.__selector: Optional[selectors.BaseSelector] = None
+        self.__queue: Optional[queue.Queue[Tuple[str, bytes]]] = None
+        if os.name == "posix":
+            self.__selector = selectors.DefaultSelector()
+            for name, stream in self.__streams.items():
+                self.__selector.register(stream, selectors.EVENT_READ, name)
+        else:
+            self.__queue = queue.Queue()
+            for name, stream in self.__streams.items():
+                threading.Thread(
+                    target=ProcessStreams.__read_stream,
+                    args=(name, stream, self.__queue),
+                    daemon=True,
+                ).start()
+        self.__open: int = len(self.__streams)
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of ProcessStreams."""
+        return f"<ProcessStreams of {self.process.args!r}>"
+
+    def __iter__(self) -> Iterator[OutputLine]:
+        """Iterate output lines until both streams are closed by the process."""
+        while not self.closed:
+            yield from self.read()
+
+    @property
+    def closed(self) -> bool:
+        """Whether every stream reached end of file."""
+        return self.__open == 0
+
+    def read(self, timeout: Optional[float] = None) -> List[OutputLine]:
+        """Wait up to timeout seconds for output, returning the complete lines read.
+
+        Returns an empty list on timeout, or once every stream is closed.
+        """
+        if self.closed:
+            return []
+        if self.__selector is not None:
+            chunks = [
+                (key.data, os.read(key.fd, READ_SIZE))
+                for key, _events in self.__selector.select(timeout)
+            ]
+        else:
+            chunks = self.__get_chunks(timeout)
+
+        lines: List[OutputLine] = []
+        for name, data in chunks:
+            decoder = self.__decoders[name]
+            if data:
+                lines.extend(OutputLine(name, text) for text in decoder.feed(data))
+            else:
+                lines.extend(OutputLine(name, text) for text in decoder.flush())
+                self.__close_stream(name)
+        return lines
+
+    def close(self) -> None:
+        """Stop reading, closing any pipes which are still open."""
+        for name in list(self.__streams):
+            self.__close_stream(name)
+
+    def __close_stream(self, name: str) -> None:
+        stream = self.__streams.pop(name, None)
+        if stream is None:
+            return
+        if self.__selector is not None:
+            self.__selector.unregister(stream)
+        self.__open -= 1
+        if self.__selector is not None and self.closed:
+            self.__selector.close()
+        if self.__queue is None:
+            stream.close()
+
+    def __get_chunks(self, timeout: Optional[float]) -> List[Tuple[str, bytes]]:
+        if self.__queue is None:
+            return []
+        try:
+            chunks = [self.__queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                chunks.append(self.__queue.get_nowait())
+            except queue.Empty:
+                return chunks
+
+    @staticmethod
+    def __read_stream(
+        name: str, stream: IO[bytes], chunks: queue.Queue[Tuple[str, bytes]]
+    ) -> None:
+        try:
+            while True:
+                data = os.read(stream.fileno(), READ_SIZE)
+                chunks.put((name, data or b""))
+                if not data:
+                    break
+        except (OSError, ValueError):
+            chunks.put((name, b""))
+        finally:
+            stream.close()
+
+
+class AsyncProcess(object):
+    """Handle of a single asyncio subprocess, iterating its stdout and stderr as tagged lines.
+
+    Use as an async context manager: the process is started on entry, and killed on
+    exit if it is still running, including when the awaiting task is cancelled.
+    Output is buffered in a bounded queue, so the child is paused rather than memory
+    growing without bound when lines are not consumed; wait() discards unread lines.
+    """
+
+    def __init__(
+        self, *cmd: str, encoding: Optional[str] = None, errors: str = "replace"
+    ) -> None:
+        """Initialize a new, not yet started, AsyncProcess."""
+        self.cmd: List[str] = list(cmd)
+        self.encoding: str = encoding or locale.getpreferredencoding(False)
+        self.errors: str = errors
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.__lines: Optional[asyncio.Queue[Optional[OutputLine]]] = None
+        self.__readers: List[asyncio.Future[None]] = []
+        self.__open: int = 0
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of AsyncProcess."""
+        return f"<AsyncProcess {self.cmd!r}>"
+
+    async def __aenter__(self) -> AsyncProcess:
+        """Start the process."""
+        return await self.start()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Kill the process if it is still running, and release its pipes."""
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[OutputLine]:
+        """Iterate output lines until both streams are closed by the process."""
+        return self.__iter_lines()
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """Get the exit code of the process, or None while it is running."""
+        if self.process is None:
+            return None
+        return self.process.returncode
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Get the process id of the process, or None before it is started."""
+        if self.process is None:
+            return None
+        return self.process.pid
+
+    async def start(self) -> AsyncProcess:
+        """Start the process, and reading its output."""
+        if self.process is not None:
+            raise RuntimeError(f"{self!r} was already started.")
+        self.process = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        self.__lines = asyncio.Queue(maxsize=ASYNC_QUEUE_SIZE)
+        for name, stream in (
+            (STDOUT, self.process.stdout),
+            (STDERR, self.process.stderr),
+        ):
+            if stream is not None:
+                self.__open += 1
+                self.__readers.append(
+                    asyncio.ensure_future(self.__read_stream(name, stream))
+                )
+        return self
+
+    async def wait(self) -> int:
+        """Wait for the process to exit, discarding any output lines not yet read."""
+        if self.process is None:
+            raise RuntimeError(f"{self!r} was not started.")
+        async for _line in self:
+            pass
+        return await self.process.wait()
+
+    def kill(self) -> None:
+        """Kill the process, if it is running."""
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+    def kill_tree(self) -> None:
+        """Kill the process and every process it started, if it is running."""
+        if self.process is not None and self.process.returncode is None:
+            kill_process_tree(self.process.pid)
+
+    async def close(self) -> None:
+        """Kill the process and every process it started if it is still running, stop reading output, and reap the process.
+
+        Pipes still held open by a process which left the tree are closed through the
+        transport of the asyncio process, as asyncio has no public API to close them.
+        This is best-effort: where the event loop's process has no transport, the
+        pipes are released once that process exits.
+        """
+        self.kill_tree()
+        for reader in self.__readers:
+            reader.cancel()
+        if self.__readers:
+            await asyncio.gather(*self.__readers, return_exceptions=True)
+        self.__open = 0
+        if self.process is not None:
+            for stream in (self.process.stdout, self.process.stderr):
+                if stream is not None and not stream.at_eof():
+                    stream.feed_eof()
+            transport: Optional[asyncio.SubprocessTransport] = getattr(
+                self.process, "_transport", None
+            )
+            if isinstance(transport, asyncio.SubprocessTransport):
+                transport.close()
+            await asyncio.shield(self.process.wait())
+
+    async def readline(self, timeout: Optional[float] = None) -> Optional[OutputLine]:
+        """Wait up to timeout seconds for the next output line, or None once both streams are closed.
+
+        Raises asyncio.TimeoutError on timeout.
+        """
+        while self.__open and self.__lines is not None:
+            line = await asyncio.wait_for(self.__lines.get(), timeout)
+            if line is None:
+                self.__open -= 1
+            else:
+                return line
+        return None
+
+    async def __iter_lines(self) -> AsyncIterator[OutputLine]:
+        while True:
+            line = await self.readline()
+            if line is None:
+                return
+            yield line
+
+    async def __read_stream(self, name: str, stream: asyncio.StreamReader) -> None:
+        lines: asyncio.Queue[Optional[OutputLine]] = self.__lines  # type: ignore
+        decoder = LineDecoder(self.encoding, self.errors)
+        while True:
+            data = await stream.read(READ_SIZE)
+            if not data:
+                break
+            for text in decoder.feed(data):
+                await lines.put(OutputLine(name, text))
+        for text in decoder.flush():
+            await lines.put(OutputLine(name, text))
+        await lines.put(None)
+
+
+class OutputCapture(object):
+    """Keeps the last lines of a run's output in a ring buffer, and optionally streams all of it to a file.
+
+    The capture file is compressed with gzip or xz when its name ends with .gz or .xz.
+    It is flushed to a recoverable checkpoint every flush_seconds: gzip data is sync
+    flushed, and xz data is finished as a stream, with later output in a new stream of
+    the same file. A reader of a partial file sees output up to the last checkpoint.
+    """
+
+    def __init__(
+        self,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        capture_file: Optional[str] = None,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Initialize a new OutputCapture, creating capture_file if given."""
+        self.tail: Deque[str] = collections.deque(maxlen=tail_lines)
+        self.capture_file: Optional[str] = capture_file
+        self.flush_seconds: float = flush_seconds
+        self.encoding: str = encoding
+        self.lines: int = 0
+        self.__raw: Optional[IO[bytes]] = None
+        self.__stream: Optional[Any] = None
+        self.__next_flush: float = time.monotonic() + flush_seconds
+        if capture_file is not None:
+            self.__raw = open(capture_file, "wb")
+            self.__stream = self.__open_stream()
+
+    def __repr__(self) -> str:
+        """Python interpreter representation of OutputCapture."""
+        return f"<OutputCapture of {self.lines} lines>"
+
+    def __enter__(self) -> OutputCapture:
+        """Capture output for the duration of a run."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Finish writing the capture file."""
+        self.close()
+
+    def write(self, text: str) -> None:
+        """Capture a line of output, without its line ending."""
+        self.tail.append(text)
+        self.lines += 1
+        if self.__stream is not None:
+            self.__stream.write(text.encode(self.encoding, errors="replace") + b"\n")
+            if time.monotonic() >= self.__next_flush:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write a recoverable checkpoint of everything captured so far to the capture file."""
+        self.__next_flush = time.monotonic() + self.flush_seconds
+        if self.__stream is None or self.__raw is None:
+            return
+        if isinstance(self.__stream, lzma.LZMAFile):
+            self.__stream.close()
+            self.__stream = self.__open_stream()
+        else:
+            self.__stream.flush()
+        self.__raw.flush()
+
+    def format_tail(self) -> str:
+        """Format the captured tail of the output for an error message."""
+        if not self.tail:
+            return "No output."
+        skipped = self.lines - len(self.tail)
+        header = f"Last {len(self.tail)} of {self.lines} lines of output:"
+        if not skipped:
+            header = f"Output ({self.lines} lines):"
+        return "\n".join([header, *self.tail])
+
+    def close(self) -> None:
+        """Finish writing the capture file, if any."""
+        stream, self.__stream = self.__stream, None
+        raw, self.__raw = self.__raw, None
+        if stream is not None:
+            stream.close()
+        if raw is not None:
+            raw.close()
+
+    def __open_stream(self) -> Any:
+        name = (self.capture_file or "").lower()
+        if name.endswith(".gz"):
+            return gzip.GzipFile(fileobj=self.__raw, mode="wb")
+        if name.endswith(".xz"):
+            return lzma.LZMAFile(self.__raw, mode="wb")
+        return self.__raw
@@ -7,27 +7,30 @@ from __future__ import annotations
 import glob
 import json
 import os
-from copy import deepcopy
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+from collections import ChainMap
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Union
 
 if TYPE_CHECKING:
     # CrazyHusk
     from crazyhusk.commandlet.base import UnrealCommandlet
 
-try:
-    # Standard Library
-    from importlib.metadata import entry_points  # type:ignore
-except ImportError:
-    # Third Party
-    from importlib_metadata import entry_points  # type:ignore
-
 # CrazyHusk
 from crazyhusk.build import Buildable
-from crazyhusk.code import CodeTemplate
-from crazyhusk.config import CONFIG_CATEGORIES, UnrealConfigParser
+from crazyhusk.code import CodeTemplate, CodeTemplateCatalog
+from crazyhusk.config import (
+    CONFIG_CATEGORIES,
+    ConfigMatrix,
+    ConfigSnapshot,
+    UnrealConfigParser,
+    list_config_platforms,
+)
+from crazyhusk.discovery import find_plugin_files
 from crazyhusk.engine import UnrealEngine
+from crazyhusk.logs import DEFAULT_ABORT_PATTERNS, AbortPatterns
 from crazyhusk.module import ModuleDescriptor
 from crazyhusk.plugin import PluginReferenceDescriptor, UnrealPlugin
+from crazyhusk.registry import load_entry_points
 
 __all__ = ["UnrealProject"]
 
@@ -130,30 +133,26 @@ class UnrealProject(Buildable):
         self.__descriptor: Optional[ProjectDescriptor] = None
         self.__engine: Optional[UnrealEngine] = None
         self.__modules: Optional[Dict[str, ModuleDescriptor]] = None
-        self.__plugins: Optional[Dict[str, UnrealPlugin]] = None
-        self.__code_templates: Optional[Dict[str, CodeTemplate]] = None
+        self.__plugins: Optional[Mapping[str, UnrealPlugin]] = None
+        self.__project_plugins: Dict[str, UnrealPlugin] = {}
+        self.__code_templates: Optional[CodeTemplateCatalog] = None
 
     def __repr__(self) -> str:
         """Python interpreter representation."""
         return f"<UnrealProject {self.name} at {self.project_file}>"
 
     @property
-    def code_templates(self) -> Dict[str, CodeTemplate]:
-        """Get a mapping of this UnrealProject's available C++ code templates."""
+    def code_templates(self) -> CodeTemplateCatalog:
+        """Get a lazily loaded mapping of this UnrealProject's available C++ code templates.
+
+        Templates from the project and its own plugins take precedence over those
+        shared from the associated UnrealEngine's catalog.
+        """
         if self.__code_templates is None:
-            self.__code_templates = {}
-            items = []  # type: List[Union[UnrealProject,UnrealEngine,UnrealPlugin]]
-            if self.engine is not None:
-                items.append(self.engine)
-                if self.engine.plugins is not None and len(self.engine.plugins):
-                    items.append(*self.engine.plugins.values())
-            items.append(self)
-            if self.plugins is not None and len(self.plugins):
-                items.append(*self.plugins.values())
-            for entry_point in entry_points().get("crazyhusk.code.listers", []):
-                for item in items:
-                    for template in entry_point.load()(item):
-                        self.__code_templates[template.name] = template
+            self.__code_templates = CodeTemplateCatalog(
+                self.__list_code_templates,
+                parent=self.engine.code_templates if self.engine is not None else None,
+            )
         return self.__code_templates
 
     @property
@@ -174,7 +173,7 @@ class UnrealProject(Buildable):
         """Get the associated UnrealEngine object for this Buildable."""
         if self.__engine is None:
             if self.descriptor is not None and self.descriptor.engine_association == "":
-                self.__engine = UnrealEngine(
+                self.__engine = UnrealEngine.get_engine(
                     os.path.realpath(os.path.join(self.project_file, "..", "..")), ""
                 )
             elif (
@@ -227,21 +226,24 @@ class UnrealProject(Buildable):
         return self.__modules
 
     @property
-    def plugins(self) -> Optional[Dict[str, UnrealPlugin]]:
-        """Get a mapping of the available plugins installed with this UnrealProject."""
+    def plugins(self) -> Optional[Mapping[str, UnrealPlugin]]:
+        """Get a read-only mapping of the available plugins for this UnrealProject.
+
+        Project plugins take precedence over engine plugins of the same name. Engine
+        plugins are shared with the associated UnrealEngine rather than copied.
+        """
         if self.__plugins is None:
-            if self.engine is None:
-                self.__plugins = {}
-            else:
-                self.__plugins = deepcopy(self.engine.plugins)
-
-            for _root, _dirs, _files in os.walk(self.plugins_dir):
-                for _file in _files:
-                    if os.path.splitext(_file)[-1] == ".uplugin":
-                        plugin = UnrealPlugin(os.path.join(_root, _file))
-                        if self.__plugins is not None and plugin.name is not None:
-                            self.__plugins[plugin.name] = plugin
-                        break
+            project_plugins: Dict[str, UnrealPlugin] = {}
+            for plugin_file in find_plugin_files(self.plugins_dir):
+                plugin = UnrealPlugin(plugin_file)
+                if plugin.name is not None:
+                    project_plugins[plugin.name] = plugin
+
+            engine_plugins: Dict[str, UnrealPlugin] = {}
+            if self.engine is not None and self.engine.plugins is not None:
+                engine_plugins = self.engine.plugins
+            self.__project_plugins = project_plugins
+            self.__plugins = MappingProxyType(ChainMap(project_plugins, engine_plugins))
         return self.__plugins
 
     @property
@@ -259,6 +261,173 @@ class UnrealProject(Buildable):
         """Get the project's default Reports directory."""
         return os.path.join(self.project_dir, "Saved", "Reports")
 
+    def __list_tests_command(
+        self, editor: bool = True, *extra_switches: str, **extra_parameters: str
+    ) -> Optional[List[str]]:
+        switches = {
+            "buildmachine",
+            "unattended",
+            "nopause",
+            "nullrhi",
+            "stdout",
+            "nosplash",
+        } | set(extra_switches)
+
+        if editor:
+            switches.add("editortest")
+        else:
+            switches.add("game")
+
+        params = {
+            "ExecCmds": "Automation List; quit",
+            "TestExit": "Automation Test Queue Empty",
+        }
+        params.update(extra_parameters)
+
+        return self.__editor_command(
+            f'"{self.project_file}"',
+            *UnrealEngine.format_commandline_options(*switches, **params),
+        )
+
+    def __render_command(
+        self,
+        map_path: str,
+        LevelSequence: str,
+        vsync: bool = False,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> Optional[List[str]]:
+        switches = {
+            "game",
+            "noloadingscreen",
+            "unattended",
+            "nopause",
+            "noscreenmessages",
+            "stdout",
+            "nosplash",
+        } | set(extra_switches)
+
+        if vsync:
+            switches.add("VSync")
+        else:
+            switches.add("NoVSync")
+
+        params = {
+            "LevelSequence": LevelSequence,
+            "MovieCinematicMode": "yes",
+            "MovieSceneCaptureType": "/Script/MovieSceneCapture.AutomatedLevelSequenceCapture",
+        }
+        params.update(extra_parameters)
+
+        for validator in load_entry_points("crazyhusk.render.validators"):
+            validator(*switches, **params)
+
+        return self.__editor_command(
+            f'"{self.project_file}"',
+            map_path,
+            *UnrealEngine.format_commandline_options(*switches, **params),
+        )
+
+    def __commandlet_command(
+        self,
+        commandlet: UnrealCommandlet,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> Optional[List[str]]:
+        commandlet.validate()
+        if not commandlet.is_valid_for_project(self):
+            raise UnrealProjectError(
+                f"Commandlet '{commandlet.name}' is not valid for project: {self!r}"
+            )
+
+        switches = {
+            "unattended",
+            "nopause",
+            "stdout",
+            "nosplash",
+        } | set(extra_switches)
+
+        if self.engine is not None:
+            if not commandlet.is_valid_for_engine(self.engine):
+                raise UnrealProjectError(
+                    f"Commandlet '{commandlet.name}' is not valid for engine: {self.engine!r}"
+                )
+        return self.__editor_command(
+            f'"{self.project_file}"',
+            f"-run={commandlet.name}",
+            *commandlet.get_commandline_args(),
+            *UnrealEngine.format_commandline_options(*switches, **extra_parameters),
+        )
+
+    def __run_tests_command(
+        self,
+        tests: List[str],
+        report_path: Optional[str] = None,
+        editor: bool = True,
+        rhi: str = "nullrhi",
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> Optional[List[str]]:
+        if report_path is None:
+            report_path = self.reports_dir
+
+        switches = {
+            rhi,
+            "buildmachine",
+            "unattended",
+            "nopause",
+            "stdout",
+            "nosplash",
+        } | set(extra_switches)
+
+        if editor:
+            switches.add("editortest")
+        else:
+            switches.add("game")
+
+        params = {
+            "ExecCmds": "Automation RunTests " + "+".join(tests) + "; quit",
+            "TestExit": "Automation Test Queue Empty",
+            "ReportOutputPath": report_path,
+        }
+        params.update(extra_parameters)
+
+        return self.__editor_command(
+            f'"{self.project_file}"',
+            *UnrealEngine.format_commandline_options(*switches, **params),
+        )
+
+    def __editor_command(self, *args: str) -> Optional[List[str]]:
+        if self.engine is None:
+            return None
+        editor_cmd_path = self.engine.executable_path("UE4Editor-Cmd")
+        if editor_cmd_path is None:
+            return None
+        return [editor_cmd_path, *args]
+
+    def __run_editor(
+        self, cmd: Optional[List[str]], abort_patterns: Optional[AbortPatterns] = None
+    ) -> int:
+        if cmd is None or self.engine is None:
+            return -1
+        with self.engine:
+            return self.engine.run(*cmd, abort_patterns=abort_patterns)
+
+    async def __run_editor_async(
+        self, cmd: Optional[List[str]], abort_patterns: Optional[AbortPatterns] = None
+    ) -> int:
+        if cmd is None or self.engine is None:
+            return -1
+        return await self.engine.run_async(*cmd, abort_patterns=abort_patterns)
+
+    def __list_code_templates(self) -> Iterable[CodeTemplate]:
+        items = [self]  # type: List[Union[UnrealProject,UnrealPlugin]]
+        if self.plugins is not None:
+            items.extend(self.__project_plugins.values())
+        for lister in load_entry_points("crazyhusk.code.listers"):
+            for item in items:
+                yield from lister(item)
+
     # crazyhusk.code.listers
     @staticmethod
     def list_project_code_templates(project: UnrealProject) -> Iterable[CodeTemplate]:
@@ -267,14 +436,7 @@ class UnrealProject(Buildable):
             for template_filename in glob.iglob(
                 os.path.join(project.content_dir, "Editor", "Templates", "*.template")
             ):
-                with open(
-                    template_filename,
-                    encoding="utf-8",
-                ) as _template_file:
-                    yield CodeTemplate(
-                        os.path.basename(os.path.splitext(template_filename)[0]),
-                        _template_file.read(),
-                    )
+                yield CodeTemplate.from_file(template_filename)
 
     # crazyhusk.project.validators
     @staticmethod
@@ -303,12 +465,47 @@ class UnrealProject(Buildable):
         self, config_category: Optional[str] = None, platform: Optional[str] = None
     ) -> UnrealConfigParser:
         """Create a configuration object associated with this project by category and platform."""
-        _config = UnrealConfigParser()
+        return UnrealConfigParser.from_files(
+            self.__config_stack_files(config_category, platform)
+        )
+
+    def config_matrix(self, max_workers: Optional[int] = None) -> ConfigMatrix:
+        """Evaluate configuration snapshots of this project for every config category and platform."""
+        config_dirs = [self.config_dir]
         if isinstance(self.engine, UnrealEngine):
             self.engine.validate()
-            _config.read(self.engine.config_files(config_category, platform))
-        _config.read(self.config_files(config_category, platform))
-        return _config
+            config_dirs.insert(0, self.engine.config_dir)
+        platforms: List[Optional[str]] = [None]
+        platforms.extend(list_config_platforms(*config_dirs))
+
+        return ConfigMatrix.build(
+            {
+                (config_category, platform): self.__config_stack_files(
+                    config_category, platform
+                )
+                for config_category in sorted(CONFIG_CATEGORIES)
+                for platform in platforms
+            },
+            max_workers=max_workers,
+        )
+
+    def config_snapshot(
+        self, config_category: Optional[str] = None, platform: Optional[str] = None
+    ) -> ConfigSnapshot:
+        """Create an immutable configuration snapshot associated with this project by category and platform."""
+        return ConfigSnapshot.from_files(
+            self.__config_stack_files(config_category, platform)
+        )
+
+    def __config_stack_files(
+        self, config_category: Optional[str] = None, platform: Optional[str] = None
+    ) -> List[str]:
+        config_files: List[str] = []
+        if isinstance(self.engine, UnrealEngine):
+            self.engine.validate()
+            config_files.extend(self.engine.config_files(config_category, platform))
+        config_files.extend(self.config_files(config_category, platform))
+        return config_files
 
     def config_files(
         self, config_category: Optional[str] = None, platform: Optional[str] = None
@@ -359,36 +556,17 @@ class UnrealProject(Buildable):
         self, editor: bool = True, *extra_switches: str, **extra_parameters: str
     ) -> int:
         """List available automation tests for this project."""
-        switches = {
-            "buildmachine",
-            "unattended",
-            "nopause",
-            "nullrhi",
-            "stdout",
-            "nosplash",
-        } | set(extra_switches)
-
-        if editor:
-            switches.add("editortest")
-        else:
-            switches.add("game")
-
-        params = {
-            "ExecCmds": "Automation List; quit",
-            "TestExit": "Automation Test Queue Empty",
-        }
-        params.update(extra_parameters)
+        return self.__run_editor(
+            self.__list_tests_command(editor, *extra_switches, **extra_parameters)
+        )
 
-        if self.engine is not None:
-            editor_cmd_path = self.engine.executable_path("UE4Editor-Cmd")
-            if editor_cmd_path is not None:
-                with self.engine:
-                    return self.engine.run(
-                        editor_cmd_path,
-                        f'"{self.project_file}"',
-                        *UnrealEngine.format_commandline_options(*switches, **params),
-                    )
-        return -1
+    async def list_tests_async(
+        self, editor: bool = True, *extra_switches: str, **extra_parameters: str
+    ) -> int:
+        """List available automation tests for this project in an asyncio subprocess."""
+        return await self.__run_editor_async(
+            self.__list_tests_command(editor, *extra_switches, **extra_parameters)
+        )
 
     def render(
         self,
@@ -398,43 +576,29 @@ class UnrealProject(Buildable):
         *extra_switches: str,
         **extra_parameters: str,
     ) -> int:
-        """Run this project in movie scene capture mode."""
-        switches = {
-            "game",
-            "noloadingscreen",
-            "unattended",
-            "nopause",
-            "noscreenmessages",
-            "stdout",
-            "nosplash",
-        } | set(extra_switches)
-
-        if vsync:
-            switches.add("VSync")
-        else:
-            switches.add("NoVSync")
-
-        params = {
-            "LevelSequence": LevelSequence,
-            "MovieCinematicMode": "yes",
-            "MovieSceneCaptureType": "/Script/MovieSceneCapture.AutomatedLevelSequenceCapture",
-        }
-        params.update(extra_parameters)
-
-        for entry_point in entry_points().get("crazyhusk.render.validators", []):
-            entry_point.load()(*switches, **params)
+        """Run this project in movie scene capture mode, stopping it if it crashes."""
+        return self.__run_editor(
+            self.__render_command(
+                map_path, LevelSequence, vsync, *extra_switches, **extra_parameters
+            ),
+            DEFAULT_ABORT_PATTERNS,
+        )
 
-        if self.engine is not None:
-            editor_cmd_path = self.engine.executable_path("UE4Editor-Cmd")
-            if editor_cmd_path is not None:
-                with self.engine:
-                    return self.engine.run(
-                        editor_cmd_path,
-                        f'"{self.project_file}"',
-                        map_path,
-                        *UnrealEngine.format_commandline_options(*switches, **params),
-                    )
-        return -1
+    async def render_async(
+        self,
+        map_path: str,
+        LevelSequence: str,
+        vsync: bool = False,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> int:
+        """Run this project in movie scene capture mode in an asyncio subprocess, stopping it if it crashes."""
+        return await self.__run_editor_async(
+            self.__render_command(
+                map_path, LevelSequence, vsync, *extra_switches, **extra_parameters
+            ),
+            DEFAULT_ABORT_PATTERNS,
+        )
 
     def run_commandlet(
         self,
@@ -442,38 +606,23 @@ class UnrealProject(Buildable):
         *extra_switches: str,
         **extra_parameters: str,
     ) -> int:
-        """Run a commandlet for this project."""
-        commandlet.validate()
-        if not commandlet.is_valid_for_project(self):
-            raise UnrealProjectError(
-                f"Commandlet '{commandlet.name}' is not valid for project: {self!r}"
-            )
-
-        switches = {
-            "unattended",
-            "nopause",
-            "stdout",
-            "nosplash",
-        } | set(extra_switches)
+        """Run a commandlet for this project, stopping it if it crashes."""
+        return self.__run_editor(
+            self.__commandlet_command(commandlet, *extra_switches, **extra_parameters),
+            DEFAULT_ABORT_PATTERNS,
+        )
 
-        if self.engine is not None:
-            if not commandlet.is_valid_for_engine(self.engine):
-                raise UnrealProjectError(
-                    f"Commandlet '{commandlet.name}' is not valid for engine: {self.engine!r}"
-                )
-            editor_cmd_path = self.engine.executable_path("UE4Editor-Cmd")
-            if editor_cmd_path is not None:
-                with self.engine:
-                    return self.engine.run(
-                        editor_cmd_path,
-                        f'"{self.project_file}"',
-                        f"-run={commandlet.name}",
-                        *commandlet.get_commandline_args(),
-                        *UnrealEngine.format_commandline_options(
-                            *switches, **extra_parameters
-                        ),
-                    )
-        return -1
+    async def run_commandlet_async(
+        self,
+        commandlet: UnrealCommandlet,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> int:
+        """Run a commandlet for this project in an asyncio subprocess, stopping it if it crashes."""
+        return await self.__run_editor_async(
+            self.__commandlet_command(commandlet, *extra_switches, **extra_parameters),
+            DEFAULT_ABORT_PATTERNS,
+        )
 
     def run_tests(
         self,
@@ -484,41 +633,30 @@ class UnrealProject(Buildable):
         *extra_switches: str,
         **extra_parameters: str,
     ) -> int:
-        """Run named automation tests for this project."""
-        if report_path is None:
-            report_path = self.reports_dir
-
-        switches = {
-            rhi,
-            "buildmachine",
-            "unattended",
-            "nopause",
-            "stdout",
-            "nosplash",
-        } | set(extra_switches)
-
-        if editor:
-            switches.add("editortest")
-        else:
-            switches.add("game")
-
-        params = {
-            "ExecCmds": "Automation RunTests " + "+".join(tests) + "; quit",
-            "TestExit": "Automation Test Queue Empty",
-            "ReportOutputPath": report_path,
-        }
-        params.update(extra_parameters)
+        """Run named automation tests for this project, stopping them if the editor crashes."""
+        return self.__run_editor(
+            self.__run_tests_command(
+                tests, report_path, editor, rhi, *extra_switches, **extra_parameters
+            ),
+            DEFAULT_ABORT_PATTERNS,
+        )
 
-        if self.engine is not None:
-            editor_cmd_path = self.engine.executable_path("UE4Editor-Cmd")
-            if editor_cmd_path is not None:
-                with self.engine:
-                    return self.engine.run(
-                        editor_cmd_path,
-                        f'"{self.project_file}"',
-                        *UnrealEngine.format_commandline_options(*switches, **params),
-                    )
-        return -1
+    async def run_tests_async(
+        self,
+        tests: List[str],
+        report_path: Optional[str] = None,
+        editor: bool = True,
+        rhi: str = "nullrhi",
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> int:
+        """Run named automation tests for this project in an asyncio subprocess, stopping them if the editor crashes."""
+        return await self.__run_editor_async(
+            self.__run_tests_command(
+                tests, report_path, editor, rhi, *extra_switches, **extra_parameters
+            ),
+            DEFAULT_ABORT_PATTERNS,
+        )
 
     def unreal_path_to_file_path(
         self, unreal_path: str, ext: str = ".uasset"
@@ -582,5 +720,5 @@ class UnrealProject(Buildable):
 
     def validate(self) -> None:
         """Raise exceptions if this instance is misconfigured."""
-        for entry_point in entry_points().get("crazyhusk.project.validators", []):
-            entry_point.load()(self)
+        for validator in load_entry_points("crazyhusk.project.validators"):
+            validator(self)
@@ -0,0 +1,57 @@
+"""Process-wide registry of loaded crazyhusk entry point extensions."""
+
+# Standard Library
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    # Standard Library
+    from importlib.metadata import entry_points  # type: ignore
+except ImportError:
+    # Third Party
+    from importlib_metadata import entry_points  # type: ignore
+
+__all__ = ["load_entry_points", "refresh_entry_points"]
+
+_LOCK = threading.Lock()
+_ENTRY_POINTS: Optional[Any] = None
+_LOADED: Dict[str, Tuple[Any, ...]] = {}
+
+
+def iter_entry_points(group: str) -> Iterable[Any]:
+    """Iterate the unloaded entry point definitions registered for a group."""
+    global _ENTRY_POINTS
+    if _ENTRY_POINTS is None:
+        _ENTRY_POINTS = entry_points()
+    if hasattr(_ENTRY_POINTS, "select"):
+        return _ENTRY_POINTS.select(group=group)  # type: ignore
+    return _ENTRY_POINTS.get(group, [])  # type: ignore
+
+
+def load_entry_points(group: str) -> Tuple[Any, ...]:
+    """Get the loaded objects registered for an entry point group.
+
+    Installed distribution metadata is scanned and each entry point is loaded only
+    the first time a group is requested; later calls return the cached objects.
+    """
+    loaded = _LOADED.get(group)
+    if loaded is None:
+        with _LOCK:
+            loaded = _LOADED.get(group)
+            if loaded is None:
+                loaded = tuple(
+                    entry_point.load() for entry_point in iter_entry_points(group)
+                )
+                _LOADED[group] = loaded
+    return loaded
+
+
+def refresh_entry_points(group: Optional[str] = None) -> None:
+    """Discard cached entry points, for one group or all groups, so they are resolved again on next use."""
+    global _ENTRY_POINTS
+    with _LOCK:
+        _ENTRY_POINTS = None
+        if group is None:
+            _LOADED.clear()
+        else:
+            _LOADED.pop(group, None)
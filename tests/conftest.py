@@ -68,6 +68,12 @@ def mock_winreg(monkeypatch: Any) -> None:
     monkeypatch.setitem(sys.modules, "winreg", module)
 
 
+@pytest.fixture(scope="function")
+def interned_engines(monkeypatch: Any) -> None:
+    monkeypatch.setattr(engine, "_ENGINES", {})
+    monkeypatch.setattr(engine, "_ASSOCIATIONS", {})
+
+
 @pytest.fixture(scope="function")
 def null_code_template() -> code.CodeTemplate:
     yield code.CodeTemplate(None)
@@ -213,6 +219,52 @@ def engine_empty_version_egl_4_26_2(
     yield engine.UnrealEngine(tmp_engine_dir)
 
 
+FAKE_EXECUTABLE = """#!{python}
+import subprocess
+import sys
+import time
+
+exit_code = 0
+for arg in sys.argv[1:]:
+    name, _, value = arg.partition("=")
+    if name == "-stdout":
+        sys.stdout.write(value + "\\n")
+        sys.stdout.flush()
+    elif name == "-stderr":
+        sys.stderr.write(value + "\\n")
+        sys.stderr.flush()
+    elif name == "-flood":
+        chunk = (b"x" * 1023 + b"\\n") * 1024
+        for _ in range(int(value)):
+            sys.stderr.buffer.write(chunk)
+            sys.stdout.buffer.write(chunk)
+    elif name == "-sleep":
+        time.sleep(float(value))
+    elif name == "-detach":
+        # keeps the output pipes open from outside the process group
+        subprocess.Popen(
+            [sys.executable, "-c", f"import time; time.sleep({{value}})"],
+            start_new_session=True,
+        )
+    elif name == "-exit":
+        exit_code = int(value)
+sys.exit(exit_code)
+"""
+
+
+@pytest.fixture(scope="function")
+def fake_executable(engine_empty_version_egl_4_26_2: engine.UnrealEngine) -> str:
+    binaries_dir = os.path.join(
+        engine_empty_version_egl_4_26_2.engine_dir, "Binaries", "Linux"
+    )
+    os.makedirs(binaries_dir)
+    executable = os.path.join(binaries_dir, "FakeEditor")
+    with open(executable, "w", encoding="utf-8") as _executable:
+        _executable.write(FAKE_EXECUTABLE.format(python=sys.executable))
+    os.chmod(executable, 0o755)
+    yield executable
+
+
 @pytest.fixture(scope="function")
 def null_filter_engine_run() -> logs.FilterEngineRun:
     yield logs.FilterEngineRun(None)
@@ -456,8 +508,10 @@ def empty_file_content_unreal_project(tmp_path: Any) -> project.UnrealProject:
 
 
 @pytest.fixture(scope="function")
-def null_engine_unreal_project(tmp_path: Any) -> project.UnrealProject:
-    project.entry_points = lambda: {}
+def null_engine_unreal_project(
+    tmp_path: Any, monkeypatch: Any
+) -> project.UnrealProject:
+    monkeypatch.setattr(project, "load_entry_points", lambda group: ())
     project_file = tmp_path / "MyProject.uproject"
     project_file.write_text('{"EngineAssociation":"123456"}')
     _project = project.UnrealProject(project_file)
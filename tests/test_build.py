@@ -2,6 +2,10 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
+import json
+import logging
+import sys
 from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 # Third Party
@@ -9,6 +13,7 @@ import pytest
 
 # CrazyHusk
 from crazyhusk import build
+from crazyhusk.engine import UnrealExecutionError
 
 if TYPE_CHECKING:
     # CrazyHusk
@@ -95,3 +100,77 @@ def test_unreal_build() -> None:
     assert b.platform is not None
     b.platform = None
     assert b.platform is not None
+
+
+class CommandBuildable(MockBuildable):
+    def __init__(self, engine: UnrealEngine, *cmd: str) -> None:
+        super().__init__()
+        self.__engine = engine
+        self.cmd = cmd
+
+    @property
+    def engine(self) -> Optional[UnrealEngine]:
+        return self.__engine
+
+    def get_build_command(
+        self,
+        target: Optional[str] = None,
+        configuration: Optional[str] = None,
+        platform: Optional[str] = None,
+        *extra_switches: str,
+        **extra_parameters: str,
+    ) -> Iterable[str]:
+        return self.cmd
+
+    def is_buildable(self) -> bool:
+        return True
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable is a script")
+@pytest.mark.parametrize("summary_name", ["diagnostics.json", "diagnostics.sarif"])
+def test_unreal_build_diagnostics(
+    engine_empty_version_egl_4_26_2: UnrealEngine,
+    fake_executable: str,
+    summary_name: str,
+    tmp_path: Any,
+    caplog: Any,
+) -> None:
+    warning = "/MyProject/Source/Shared.h(12,5): warning C4996: 'Old': deprecated"
+    buildable = CommandBuildable(
+        engine_empty_version_egl_4_26_2,
+        fake_executable,
+        *[f"-stdout={warning}"] * 3,
+        "-stdout=/MyProject/Source/A.cpp(3): error C3861: 'assert': not found",
+        "-exit=3",
+    )
+
+    b = build.UnrealBuild(buildable)
+    with caplog.at_level(logging.INFO, logger="UnrealEngine.run"):
+        with pytest.raises(UnrealExecutionError):
+            b.run()
+    assert b.diagnostics is None
+    assert [record.getMessage() for record in caplog.records].count(warning) == 3
+
+    caplog.clear()
+    summary_file = str(tmp_path / summary_name)
+    b = build.UnrealBuild(buildable, diagnostics_file=summary_file)
+    assert b.aggregate_diagnostics
+    with caplog.at_level(logging.INFO, logger="UnrealEngine.run"):
+        with pytest.raises(UnrealExecutionError):
+            b.run()
+    assert [record.getMessage() for record in caplog.records].count(warning) == 1
+    assert b.diagnostics is not None
+    assert b.diagnostics.suppressed == 2
+    with open(summary_file, encoding="utf-8") as _summary_file:
+        summary = json.load(_summary_file)
+    if summary_name.endswith(".sarif"):
+        assert summary == b.diagnostics.to_sarif()
+    else:
+        assert summary == b.diagnostics.to_dict()
+
+    b = build.UnrealBuild(buildable, aggregate_diagnostics=True)
+    with caplog.at_level(logging.INFO, logger="UnrealEngine.run"):
+        with pytest.raises(UnrealExecutionError):
+            asyncio.run(b.run_async())
+    assert b.diagnostics is not None
+    assert b.diagnostics.suppressed == 2
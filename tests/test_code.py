@@ -1,5 +1,7 @@
 # Standard Library
-from typing import Any, Optional, Set, Type
+import os
+import sys
+from typing import Any, Dict, List, Optional, Set, Type
 
 # Third Party
 import pytest
@@ -77,3 +79,175 @@ def test_codetemplate_make_instance(
             code_template.make_instance(**tokens)
     else:
         assert code_template.make_instance(**tokens) == expected
+
+
+def test_codetemplate_make_instance_literal_values(
+    basic_code_template: code.CodeTemplate,
+) -> None:
+    value = r"C:\Users\test\1 \g<0> %TEST_TOKEN%"
+    assert basic_code_template.make_instance(TEST_TOKEN=value) == value
+
+
+def test_codetemplate_segments_recompiled(
+    basic_code_template: code.CodeTemplate,
+) -> None:
+    assert basic_code_template.segments == ("", "TEST_TOKEN", "")
+    basic_code_template.template_string = "// %OTHER_TOKEN%;"
+    assert basic_code_template.segments == ("// ", "OTHER_TOKEN", ";")
+    assert basic_code_template.tokens == {"OTHER_TOKEN"}
+    with pytest.raises(code.CodeTemplateError):
+        basic_code_template.make_instance(TEST_TOKEN="test")
+
+
+def test_codetemplate_tokens_match_segments() -> None:
+    code_template = code.CodeTemplate("Percent", "%1%NAME%")
+    assert code_template.tokens == {"NAME"}
+    assert code_template.segments == ("%1", "NAME", "")
+    assert code_template.make_instance(NAME="Foo") == "%1Foo"
+
+
+@pytest.mark.parametrize(
+    "code_template_fixture,rows,raises,expected",
+    [
+        ("null_code_template", [], None, []),
+        ("empty_code_template", [{}, {}], None, ["", ""]),
+        (
+            "basic_code_template",
+            [{"TEST_TOKEN": "a"}, {"TEST_TOKEN": "b"}],
+            None,
+            ["a", "b"],
+        ),
+        (
+            "basic_code_template",
+            [{"TEST_TOKEN": "a"}, {}],
+            code.CodeTemplateError,
+            [],
+        ),
+    ],
+)
+def test_codetemplate_render_many(
+    code_template_fixture: str,
+    rows: List[Dict[str, str]],
+    raises: Optional[Type[BaseException]],
+    expected: List[str],
+    request: Any,
+) -> None:
+    code_template = request.getfixturevalue(code_template_fixture)
+    if raises is not None:
+        with pytest.raises(raises):
+            code_template.render_many(rows)
+    else:
+        assert code_template.render_many(rows) == expected
+
+
+def test_codetemplate_from_file(tmp_path: Any) -> None:
+    template_file = tmp_path / "ActorClass.h.template"
+    template_file.write_text("class %CLASS_NAME%;", encoding="utf-8")
+    code_template = code.CodeTemplate.from_file(str(template_file))
+    assert code_template.name == "ActorClass.h"
+    assert not code_template.is_loaded
+    assert code_template.make_instance(CLASS_NAME="AActor") == "class AActor;"
+    assert code_template.is_loaded
+
+    template_file.unlink()
+    assert code_template.tokens == {"CLASS_NAME"}
+
+
+def test_codetemplate_catalog(
+    basic_code_template: code.CodeTemplate,
+    multiline_basic_code_template: code.CodeTemplate,
+) -> None:
+    calls = []
+
+    def discover_parent() -> List[code.CodeTemplate]:
+        calls.append("parent")
+        return [basic_code_template, multiline_basic_code_template]
+
+    override = code.CodeTemplate("Basic", "override")
+
+    def discover_child() -> List[code.CodeTemplate]:
+        calls.append("child")
+        return [override]
+
+    parent = code.CodeTemplateCatalog(discover_parent)
+    child = code.CodeTemplateCatalog(discover_child, parent=parent)
+    assert calls == []
+
+    assert child["Basic"] is override
+    assert child["MultilineBasic"] is multiline_basic_code_template
+    assert parent["Basic"] is basic_code_template
+    assert sorted(child) == ["Basic", "MultilineBasic"]
+    assert len(child) == 2
+    assert "Missing" not in child
+    with pytest.raises(KeyError):
+        child["Missing"]
+    assert calls == ["child", "parent"]
+
+    child.refresh()
+    assert child.get("Basic") is override
+    assert calls == ["child", "parent", "child"]
+
+
+def test_write_if_changed(tmp_path: Any) -> None:
+    destination = tmp_path / "Source" / "Generated.h"
+    assert code.write_if_changed(str(destination), "content")
+    assert destination.read_text(encoding="utf-8") == "content"
+
+    os.utime(destination, ns=(0, 0))
+    assert not code.write_if_changed(str(destination), "content")
+    assert destination.stat().st_mtime_ns == 0
+
+    assert code.write_if_changed(str(destination), "changed")
+    assert code.write_if_changed(str(destination), "chAnged")
+    assert destination.read_text(encoding="utf-8") == "chAnged"
+    assert os.listdir(destination.parent) == ["Generated.h"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+def test_write_if_changed_keeps_mode(tmp_path: Any) -> None:
+    destination = tmp_path / "Generated.sh"
+    destination.write_text("old", encoding="utf-8")
+    destination.chmod(0o751)
+    assert code.write_if_changed(str(destination), "new")
+    assert destination.stat().st_mode & 0o777 == 0o751
+
+
+def test_generate_code(
+    tmp_path: Any,
+    basic_code_template: code.CodeTemplate,
+) -> None:
+    jobs = [
+        (
+            basic_code_template,
+            {"TEST_TOKEN": f"value{index}"},
+            str(tmp_path / f"{index}.h"),
+        )
+        for index in range(8)
+    ]
+    result = code.generate_code(jobs, max_workers=4)
+    assert result.written == [job[2] for job in jobs]
+    assert result.skipped == []
+    assert (tmp_path / "3.h").read_text(encoding="utf-8") == "value3"
+
+    jobs[0] = code.CodeGenerationJob(
+        basic_code_template, {"TEST_TOKEN": "new"}, jobs[0][2]
+    )
+    result = code.generate_code(jobs)
+    assert result.written == [jobs[0].destination]
+    assert len(result.skipped) == 7
+
+
+def test_generate_code_errors(
+    tmp_path: Any,
+    basic_code_template: code.CodeTemplate,
+) -> None:
+    with pytest.raises(code.CodeTemplateError):
+        code.generate_code([(basic_code_template, {}, str(tmp_path / "A.h"))])
+    with pytest.raises(code.CodeTemplateError):
+        code.generate_code(
+            [
+                (basic_code_template, {"TEST_TOKEN": "a"}, str(tmp_path / "A.h")),
+                (basic_code_template, {"TEST_TOKEN": "b"}, str(tmp_path / "A.h")),
+            ]
+        )
+    assert not (tmp_path / "A.h").exists()
@@ -1,11 +1,14 @@
 # Standard Library
+import codecs
 import configparser
+import json
+from typing import Any, Dict, List, Tuple
 
 # Third Party
 import pytest
 
 # CrazyHusk
-from crazyhusk import config
+from crazyhusk import config, engine
 
 
 def test_config_init(empty_parser: config.UnrealConfigParser) -> None:
@@ -26,3 +29,232 @@ def test_config_optionxform(
     empty_parser: config.UnrealConfigParser, input_string: str, output_string: str
 ) -> None:
     assert empty_parser.optionxform(input_string) == output_string
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("", ()),
+        ("Key=Value", ()),
+        ("[Section]\nKey=Value", (("Section", "Key", "Value"),)),
+        (
+            "; comment\n[/Script/Engine.Engine]\n  +Paths = A=B \n# other\n\n-Paths=C\nNoValue\n=Empty",
+            (
+                ("/Script/Engine.Engine", "+Paths", "A=B"),
+                ("/Script/Engine.Engine", "-Paths", "C"),
+            ),
+        ),
+        (
+            "[A]\nKey=1\n[B]\r\nKey=2\n[A]\nKey=",
+            (("A", "Key", "1"), ("B", "Key", "2"), ("A", "Key", "")),
+        ),
+    ],
+)
+def test_config_layer_parse(
+    text: str, expected: Tuple[Tuple[str, str, str], ...]
+) -> None:
+    assert config.ConfigLayer.parse(text) == expected
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        (b"[A]", "[A]"),
+        (codecs.BOM_UTF8 + "[Ä]".encode("utf-8"), "[Ä]"),
+        (codecs.BOM_UTF16_LE + "[A]".encode("utf-16-le"), "[A]"),
+        (codecs.BOM_UTF16_BE + "[A]".encode("utf-16-be"), "[A]"),
+    ],
+)
+def test_config_layer_decode(data: bytes, expected: str) -> None:
+    assert config.ConfigLayer.decode(data) == expected
+
+
+def test_config_layer_load(tmp_path: Any) -> None:
+    config_file = tmp_path / "Base.ini"
+    assert config.ConfigLayer.load(str(config_file)) is None
+
+    config_file.write_text("[A]\nKey=1\n")
+    layer = config.ConfigLayer.load(str(config_file))
+    assert layer.entries == (("A", "Key", "1"),)
+    assert config.ConfigLayer.load(str(config_file)) is layer
+
+    config_file.write_text("[A]\nKey=22\n")
+    changed = config.ConfigLayer.load(str(config_file))
+    assert changed is not layer
+    assert changed.entries == (("A", "Key", "22"),)
+
+    config.ConfigLayer.clear_cache()
+    assert config.ConfigLayer.load(str(config_file)) is not changed
+
+
+def test_config_from_files(tmp_path: Any) -> None:
+    base_file = tmp_path / "Base.ini"
+    base_file.write_text("[DEFAULT]\nShared=1\n[A]\nKey=1\n+Paths=a\n[B]\nOther=x\n")
+    default_file = tmp_path / "DefaultEngine.ini"
+    default_file.write_text("[A]\nKey=2\n+Paths=b\n")
+
+    parser = config.UnrealConfigParser.from_files(
+        [str(base_file), str(tmp_path / "Missing.ini"), str(default_file)]
+    )
+    expected = config.UnrealConfigParser()
+    expected.read([str(base_file), str(default_file)])
+    assert {s: dict(parser[s]) for s in parser} == {
+        s: dict(expected[s]) for s in expected
+    }
+    assert parser.get("A", "Key") == "2"
+    assert parser.get("B", "Shared") == "1"
+
+
+@pytest.mark.parametrize(
+    "layers,expected",
+    [
+        ([], {}),
+        (["[A]\nKey=1"], {"A": {"Key": ("1",)}}),
+        (["[A]\nKey=1\nKey=2", "[A]\nKey=3"], {"A": {"Key": ("3",)}}),
+        (
+            ["[A]\n+Paths=a\n+Paths=b", "[A]\n+Paths=a\n+Paths=c"],
+            {"A": {"Paths": ("a", "b", "c")}},
+        ),
+        (["[A]\n.Paths=a\n.Paths=a", "[A]\n+Paths=a"], {"A": {"Paths": ("a", "a")}}),
+        (
+            ["[A]\n.Paths=a\n+Paths=b\n.Paths=a", "[A]\n-Paths=a\n-Paths=z"],
+            {"A": {"Paths": ("b", "a")}},
+        ),
+        (
+            ["[A]\n+Paths=a\n+Paths=b", "[A]\n!Paths=ClearArray\n+Paths=c"],
+            {"A": {"Paths": ("c",)}},
+        ),
+        (["[A]\n+Paths=a", "[a]\n+paths=b"], {"A": {"Paths": ("a", "b")}}),
+        (["[A]\n!Paths=ClearArray"], {"A": {}}),
+        (
+            ["[A]\n+Paths=a\nOther=b", "[a]\n!paths=ClearArray"],
+            {"A": {"Other": ("b",)}},
+        ),
+    ],
+)
+def test_config_snapshot_operators(
+    layers: List[str], expected: Dict[str, Dict[str, Tuple[str, ...]]]
+) -> None:
+    snapshot = config.ConfigSnapshot.from_layers(
+        config.ConfigLayer(f"{index}.ini", config.ConfigLayer.parse(text))
+        for index, text in enumerate(layers)
+    )
+    assert {section: dict(options) for section, options in snapshot.items()} == expected
+    assert snapshot.config_files == tuple(
+        f"{index}.ini" for index in range(len(layers))
+    )
+
+
+def test_config_snapshot_lookups() -> None:
+    snapshot = config.ConfigSnapshot(
+        {"/Script/Engine.Engine": {"Paths": ["a", "b"], "Empty": []}}
+    )
+    assert snapshot.get_list("/script/engine.engine", "PATHS") == ("a", "b")
+    assert snapshot.get_value("/Script/Engine.Engine", "Paths") == "b"
+    assert snapshot.get_value("/Script/Engine.Engine", "Empty", "x") == "x"
+    assert snapshot.get_value("Missing", "Paths") is None
+    assert snapshot.get_list("/Script/Engine.Engine", "Missing") == ()
+    with pytest.raises(TypeError):
+        snapshot["/Script/Engine.Engine"]["Paths"] = ("c",)  # type: ignore
+
+
+def test_config_snapshot_json(tmp_path: Any) -> None:
+    base_file = tmp_path / "Base.ini"
+    base_file.write_text("[A]\n+Paths=a\n.Paths=a\nKey=1\n")
+    snapshot = config.ConfigSnapshot.from_files(
+        [str(base_file), str(tmp_path / "Missing.ini")]
+    )
+    assert snapshot.config_files == (str(base_file),)
+
+    snapshot_file = str(tmp_path / "snapshot.json")
+    snapshot.dump(snapshot_file)
+    loaded = config.ConfigSnapshot.load(snapshot_file)
+    assert loaded == snapshot
+    assert loaded.config_files == snapshot.config_files
+    assert loaded.get_list("A", "Paths") == ("a", "a")
+    assert (
+        config.ConfigSnapshot.from_json(snapshot.to_json()).to_dict()
+        == snapshot.to_dict()
+    )
+
+    with pytest.raises(config.UnrealConfigError):
+        config.ConfigSnapshot.from_json('{"Version": 0}')
+
+
+def test_list_config_platforms(tmp_path: Any) -> None:
+    engine_config = tmp_path / "Engine" / "Config"
+    (engine_config / "Linux").mkdir(parents=True)
+    (engine_config / "Linux" / "BaseLinuxEngine.ini").write_text("")
+    (engine_config / "Layouts").mkdir()
+    (engine_config / "Layouts" / "DefaultLayout.ini").write_text("")
+    project_config = tmp_path / "Project" / "Config"
+    (project_config / "Windows").mkdir(parents=True)
+    (project_config / "Windows" / "WindowsGame.ini").write_text("")
+    (project_config / "Linux").mkdir()
+    (project_config / "Linux" / "LinuxEngine.ini").write_text("")
+
+    assert config.list_config_platforms(
+        str(engine_config), str(project_config), str(tmp_path / "Missing")
+    ) == ["Linux", "Windows"]
+
+
+def test_config_matrix_build(tmp_path: Any, monkeypatch: Any) -> None:
+    base_file = tmp_path / "Base.ini"
+    base_file.write_text("[A]\n+Paths=base\n")
+    engine_file = tmp_path / "BaseEngine.ini"
+    engine_file.write_text("[A]\n+Paths=engine\n")
+    linux_file = tmp_path / "LinuxEngine.ini"
+    linux_file.write_text("[A]\n-Paths=base\n")
+
+    loaded = []
+    load = config.ConfigLayer.load
+    monkeypatch.setattr(
+        config.ConfigLayer,
+        "load",
+        lambda config_file: loaded.append(config_file) or load(config_file),
+    )
+    matrix = config.ConfigMatrix.build(
+        {
+            ("Game", None): [str(base_file), str(tmp_path / "BaseGame.ini")],
+            ("Engine", None): [str(base_file), str(engine_file)],
+            ("Engine", "Linux"): [str(base_file), str(engine_file), str(linux_file)],
+        },
+        max_workers=2,
+    )
+    assert sorted(loaded) == sorted(
+        [
+            str(base_file),
+            str(engine_file),
+            str(linux_file),
+            str(tmp_path / "BaseGame.ini"),
+        ]
+    )
+    assert matrix.snapshots[("Game", None)].get_list("A", "Paths") == ("base",)
+    assert matrix.snapshots[("Engine", None)].get_list("A", "Paths") == (
+        "base",
+        "engine",
+    )
+    assert matrix.snapshots[("Engine", "Linux")].get_list("A", "Paths") == ("engine",)
+    assert matrix.stats.combinations == 3
+    assert matrix.stats.files_read == 3
+    assert matrix.stats.total_seconds >= matrix.stats.merge_seconds
+
+    dct = matrix.to_dict()
+    assert dct["Stats"]["Combinations"] == 3
+    assert [(c["Category"], c["Platform"]) for c in dct["Configs"]] == [
+        ("Game", None),
+        ("Engine", None),
+        ("Engine", "Linux"),
+    ]
+
+
+def test_config_matrix_to_json(
+    tmp_path: Any, engine_empty_version_egl_4_26_2: engine.UnrealEngine
+) -> None:
+    json_file = tmp_path / "matrix.json"
+    config.config_matrix_to_json(
+        str(json_file), engine_empty_version_egl_4_26_2.base_dir
+    )
+    dct = json.loads(json_file.read_text())
+    assert dct["Stats"]["Combinations"] == len(config.CONFIG_CATEGORIES)
+    assert dct["Stats"]["FilesRead"] == 1
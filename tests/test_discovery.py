@@ -0,0 +1,163 @@
+# Standard Library
+import os
+from typing import Any, List
+
+# Third Party
+import pytest
+
+# CrazyHusk
+from crazyhusk import discovery
+
+
+def make_plugin(plugins_dir: Any, *parts: str) -> str:
+    plugin_dir = plugins_dir.joinpath(*parts)
+    plugin_dir.mkdir(parents=True)
+    plugin_file = plugin_dir / f"{parts[-1]}.uplugin"
+    plugin_file.write_text("{}")
+    return str(plugin_file)
+
+
+def test_find_plugin_files_missing_dir(tmp_path: Any) -> None:
+    assert list(discovery.find_plugin_files(str(tmp_path / "Missing"))) == []
+
+
+def test_find_plugin_files(tmp_path: Any) -> None:
+    expected = [
+        make_plugin(tmp_path, "Runtime", "Alpha"),
+        make_plugin(tmp_path, "Runtime", "Nested", "Beta"),
+        make_plugin(tmp_path, "Gamma"),
+    ]
+    assert sorted(discovery.find_plugin_files(str(tmp_path))) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    "nested_parts",
+    [
+        ["Alpha", "Content", "Hidden"],
+        ["Alpha", "Source", "Hidden"],
+        ["Alpha", "Sub", "Hidden"],
+        ["Content", "Hidden"],
+        ["Intermediate", "Hidden"],
+        [".git", "Hidden"],
+    ],
+)
+def test_find_plugin_files_pruned(tmp_path: Any, nested_parts: List[str]) -> None:
+    alpha = make_plugin(tmp_path, "Alpha")
+    make_plugin(tmp_path, *nested_parts)
+    assert list(discovery.find_plugin_files(str(tmp_path))) == [alpha]
+
+
+def test_find_plugin_files_ignores_plugin_named_dirs(tmp_path: Any) -> None:
+    alpha = make_plugin(tmp_path, "Odd.uplugin", "Alpha")
+    assert list(discovery.find_plugin_files(str(tmp_path))) == [alpha]
+
+
+def test_default_cache_dir(monkeypatch: Any, tmp_path: Any) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert discovery.default_cache_dir() == str(tmp_path / "crazyhusk")
+
+
+def test_plugin_index_cold_and_warm(tmp_path: Any, monkeypatch: Any) -> None:
+    plugins_dir = tmp_path / "Plugins"
+    alpha = make_plugin(plugins_dir, "Runtime", "Alpha")
+    beta = make_plugin(plugins_dir, "Beta")
+    index = discovery.PluginIndex.for_directory(str(plugins_dir), str(tmp_path))
+    assert repr(index).startswith("<PluginIndex")
+    assert sorted(index.plugin_files()) == sorted([alpha, beta])
+    assert index.descriptor_data(alpha) == {}
+    index.save()
+    assert os.path.isfile(index.cache_file)
+
+    def fail_scan(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError(f"Unexpected read of {args}")
+
+    monkeypatch.setattr(discovery, "scan_plugin_dir", fail_scan)
+    warm = discovery.PluginIndex.for_directory(str(plugins_dir), str(tmp_path))
+    assert sorted(warm.plugin_files()) == sorted([alpha, beta])
+    monkeypatch.setattr("builtins.open", fail_scan)
+    assert warm.descriptor_data(alpha) == {}
+
+
+def test_plugin_index_rescans_changed_dirs(tmp_path: Any) -> None:
+    plugins_dir = tmp_path / "Plugins"
+    alpha = make_plugin(plugins_dir, "Runtime", "Alpha")
+    index = discovery.PluginIndex.for_directory(str(plugins_dir), str(tmp_path))
+    assert index.plugin_files() == [alpha]
+    index.save()
+
+    gamma = make_plugin(plugins_dir, "Runtime", "Gamma")
+    os.utime(plugins_dir / "Runtime", ns=(0, 1))
+    warm = discovery.PluginIndex.for_directory(str(plugins_dir), str(tmp_path))
+    assert sorted(warm.plugin_files()) == sorted([alpha, gamma])
+
+
+def test_plugin_index_descriptor_data_changed(tmp_path: Any) -> None:
+    plugins_dir = tmp_path / "Plugins"
+    alpha = make_plugin(plugins_dir, "Alpha")
+    index = discovery.PluginIndex.for_directory(str(plugins_dir), str(tmp_path))
+    assert index.descriptor_data(alpha) == {}
+    with open(alpha, "w", encoding="utf-8") as plugin_file:
+        plugin_file.write('{"FriendlyName": "Alpha"}')
+    assert index.descriptor_data(alpha) == {"FriendlyName": "Alpha"}
+    with open(alpha, "w", encoding="utf-8") as plugin_file:
+        plugin_file.write("[]")
+    assert index.descriptor_data(alpha) is None
+    assert index.descriptor_data(str(plugins_dir / "Missing.uplugin")) is None
+
+
+@pytest.mark.parametrize(
+    "cache_content",
+    ["", "[]", '{"Version": 0}', '{"Version": 1, "PluginsDir": "elsewhere"}'],
+)
+def test_plugin_index_discards_invalid_cache(tmp_path: Any, cache_content: str) -> None:
+    cache_file = tmp_path / "index.json"
+    cache_file.write_text(cache_content)
+    plugins_dir = tmp_path / "Plugins"
+    alpha = make_plugin(plugins_dir, "Alpha")
+    index = discovery.PluginIndex(str(plugins_dir), str(cache_file))
+    assert index.plugin_files() == [alpha]
+
+
+def make_source_file(source_dir: Any, *parts: str) -> str:
+    source_file = source_dir.joinpath(*parts)
+    source_file.parent.mkdir(parents=True, exist_ok=True)
+    source_file.write_text("")
+    return os.path.realpath(str(source_file))
+
+
+def test_source_index(tmp_path: Any) -> None:
+    source_dir = tmp_path / "Source"
+    alpha = make_source_file(source_dir, "Runtime", "Alpha", "Alpha.Build.cs")
+    beta = make_source_file(source_dir, "Editor", "Beta", "Beta.Build.cs")
+    duplicate = make_source_file(source_dir, "Programs", "Alpha", "Alpha.Build.cs")
+    target = make_source_file(source_dir, "MyGame.Target.cs")
+    make_source_file(source_dir, ".hidden", "Hidden.Build.cs")
+
+    index = discovery.SourceIndex(os.path.realpath(str(source_dir)))
+    assert repr(index).startswith("<SourceIndex")
+    assert index.build_files("Beta") == [beta]
+    assert sorted(index.build_files("Alpha")) == sorted([alpha, duplicate])
+    assert index.build_files("Hidden") == []
+    assert index.target_files() == {"MyGame": target}
+
+
+def test_source_index_refresh(tmp_path: Any, monkeypatch: Any) -> None:
+    source_dir = tmp_path / "Source"
+    alpha = make_source_file(source_dir, "Alpha", "Alpha.Build.cs")
+    index = discovery.SourceIndex.for_directory(str(source_dir))
+    assert discovery.SourceIndex.for_directory(str(source_dir)) is index
+    assert index.build_files("Alpha") == [alpha]
+
+    gamma = make_source_file(source_dir, "Gamma", "Gamma.Build.cs")
+    assert index.build_files("Gamma") == []
+    index.refresh()
+    assert index.build_files("Gamma") == [gamma]
+
+    discovery.SourceIndex.clear_instances()
+    assert discovery.SourceIndex.for_directory(str(source_dir)) is not index
+
+
+def test_source_index_missing_dir(tmp_path: Any) -> None:
+    index = discovery.SourceIndex(str(tmp_path / "Missing"))
+    assert index.build_files("Alpha") == []
+    assert index.target_files() == {}
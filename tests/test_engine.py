@@ -1,13 +1,19 @@
 # Standard Library
+import asyncio
+import gzip
+import logging
 import os
+import subprocess  # nosec
+import sys
+import time
 import types
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 
 # Third Party
 import pytest
 
 # CrazyHusk
-from crazyhusk import config, engine
+from crazyhusk import config, engine, logs, process
 from crazyhusk.code import CodeTemplate
 from crazyhusk.plugin import UnrealPlugin
 
@@ -199,6 +205,35 @@ def test_unreal_engine_context(engine_empty: engine.UnrealEngine) -> None:
         assert engine_empty
 
 
+@pytest.mark.skipif(sys.platform != "linux", reason="reads process state from /proc")
+def test_unreal_engine_context_kills_process_tree(
+    engine_empty: engine.UnrealEngine,
+) -> None:
+    def is_running(pid: int) -> bool:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as _stat_file:
+                return _stat_file.read().rsplit(")", 1)[1].split()[0] != "Z"
+        except OSError:
+            return False
+
+    process = subprocess.Popen(
+        ["sh", "-c", "sleep 30 & echo $!; wait"],
+        stdout=subprocess.PIPE,
+        start_new_session=True,
+    )
+    grandchild = int(process.stdout.readline())  # type: ignore
+    with pytest.raises(KeyboardInterrupt):
+        with engine_empty:
+            engine_empty._UnrealEngine__process = process  # type: ignore
+            raise KeyboardInterrupt()
+    assert process.wait(timeout=10) != 0
+    process.stdout.close()  # type: ignore
+    deadline = time.monotonic() + 10
+    while is_running(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not is_running(grandchild)
+
+
 def test_unreal_engine_dir_properties(
     engine_empty_version_egl_4_26_2: engine.UnrealEngine,
 ) -> None:
@@ -506,3 +541,388 @@ def test_unreal_engine_config(
         engine_empty_version_egl_4_26_2.config("Engine", "Windows"),
         config.UnrealConfigParser,
     )
+    assert isinstance(
+        engine_empty_version_egl_4_26_2.config_snapshot("Engine", "Windows"),
+        config.ConfigSnapshot,
+    )
+
+
+def test_unreal_engine_config_cached(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine, monkeypatch: Any
+) -> None:
+    base_config_file = os.path.join(
+        engine_empty_version_egl_4_26_2.config_dir, "Base.ini"
+    )
+    with open(base_config_file, "w") as _config_file:
+        _config_file.write("[Core.Log]\nLogTemp=Verbose\n")
+
+    parsed = []
+    parse = config.ConfigLayer.parse
+    monkeypatch.setattr(
+        config.ConfigLayer, "parse", lambda text: parsed.append(text) or parse(text)
+    )
+    for _ in range(3):
+        assert (
+            engine_empty_version_egl_4_26_2.config("Engine", "Linux").get(
+                "Core.Log", "LogTemp"
+            )
+            == "Verbose"
+        )
+    assert len(parsed) == 1
+
+
+def test_unreal_engine_plugins_cached(tmp_path: Any) -> None:
+    plugin_dir = tmp_path / "Engine" / "Engine" / "Plugins" / "Basic"
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "Basic.uplugin").write_text(
+        '{"FriendlyName": "Basic", "VersionName": "1.0"}'
+    )
+    cache_dir = tmp_path / "Cache"
+    cold = engine.UnrealEngine(tmp_path / "Engine", cache_dir=str(cache_dir))
+    assert list(cold.plugins.keys()) == ["Basic"]
+    assert len(os.listdir(cache_dir)) == 1
+
+    warm = engine.UnrealEngine(tmp_path / "Engine", cache_dir=str(cache_dir))
+    assert warm.plugins["Basic"].descriptor.friendly_name == "Basic"
+
+
+def test_unreal_engine_get_engine_interned(
+    tmp_path: Any, interned_engines: None
+) -> None:
+    base_dir = tmp_path / "Interned"
+    (base_dir / "Engine" / "Build").mkdir(parents=True)
+    first = engine.UnrealEngine.get_engine(str(base_dir))
+    assert engine.UnrealEngine.get_engine(str(base_dir / "Engine" / "..")) is first
+    assert engine.UnrealEngine.intern_engine(engine.UnrealEngine(base_dir)) is first
+
+    (base_dir / "Engine" / "Build" / "Build.version").write_text("{}")
+    changed = engine.UnrealEngine.get_engine(str(base_dir))
+    assert changed is not first
+    assert engine.UnrealEngine.get_engine(str(base_dir)) is changed
+
+    engine.UnrealEngine.invalidate_engines(str(base_dir))
+    assert engine.UnrealEngine.get_interned_engine(str(base_dir)) is None
+    assert engine.UnrealEngine.get_engine(str(base_dir)) is not changed
+    engine.UnrealEngine.invalidate_engines()
+    assert engine.UnrealEngine.get_interned_engine(str(base_dir)) is None
+
+
+def test_unreal_engine_intern_engine_types() -> None:
+    with pytest.raises(TypeError):
+        assert engine.UnrealEngine.intern_engine(None)
+
+
+def test_unreal_engine_find_engine_interned(
+    tmp_path: Any, monkeypatch: Any, interned_engines: None
+) -> None:
+    calls = []
+
+    def finder(association: str) -> engine.UnrealEngine:
+        calls.append(association)
+        return engine.UnrealEngine(tmp_path / "Found", association)
+
+    monkeypatch.setattr(engine, "load_entry_points", lambda group: (finder,))
+    found = engine.UnrealEngine.find_engine("4.26")
+    assert engine.UnrealEngine.find_engine("4.26") is found
+    assert engine.UnrealEngine.get_engine(str(tmp_path / "Found")) is found
+    assert calls == ["4.26"]
+
+    engine.UnrealEngine.invalidate_engines(str(tmp_path / "Found"))
+    assert engine.UnrealEngine.find_engine("4.26") is not found
+    assert calls == ["4.26", "4.26"]
+
+
+def test_unreal_engine_build_targets(tmp_path: Any) -> None:
+    target_file = tmp_path / "Engine" / "Source" / "Programs" / "Tool.Target.cs"
+    target_file.parent.mkdir(parents=True)
+    target_file.write_text("")
+    unreal_engine = engine.UnrealEngine(tmp_path)
+    assert unreal_engine.build_targets == {"Tool": os.path.realpath(str(target_file))}
+    assert unreal_engine.is_valid_build_target("Tool")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+    caplog: Any,
+) -> None:
+    logger = logging.getLogger("UnrealEngine.run")
+    with caplog.at_level(logging.INFO, logger="UnrealEngine.run"):
+        for _ in range(3):
+            with engine_empty_version_egl_4_26_2 as unreal_engine:
+                assert (
+                    unreal_engine.run(fake_executable, "-stdout=hello", "-stderr=oops")
+                    == 0
+                )
+            assert logger.filters == []
+            assert unreal_engine.log_metrics is not None
+            assert unreal_engine.log_metrics.processed == 3
+            assert unreal_engine.log_metrics.dropped == 0
+
+        with pytest.raises(engine.UnrealExecutionError):
+            with engine_empty_version_egl_4_26_2 as unreal_engine:
+                unreal_engine.run(fake_executable, "-exit=3")
+        assert logger.filters == []
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages.count("hello") == 3
+    assert messages.count("oops") == 3
+    assert {
+        record.getMessage(): record.stream
+        for record in caplog.records
+        if hasattr(record, "stream")
+    } == {"hello": "stdout", "oops": "stderr"}
+    assert all(record.executable == fake_executable for record in caplog.records)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_output_tail(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+    tmp_path: Any,
+) -> None:
+    args = [f"-stdout=line {index}" for index in range(5)]
+    output_file = str(tmp_path / "output.log.gz")
+    with pytest.raises(engine.UnrealExecutionError) as raised:
+        with engine_empty_version_egl_4_26_2 as unreal_engine:
+            unreal_engine.run(
+                fake_executable,
+                *args,
+                "-stdout=fatal",
+                "-exit=3",
+                tail_lines=2,
+                output_file=output_file,
+            )
+    assert str(raised.value).endswith("Last 2 of 6 lines of output:\nline 4\nfatal")
+    with gzip.open(output_file, "rt", encoding="utf-8") as _output_file:
+        assert _output_file.read().splitlines() == [
+            f"line {index}" for index in range(5)
+        ] + ["fatal"]
+
+    with pytest.raises(engine.UnrealExecutionError) as raised:
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(
+                fake_executable, "-stdout=only", "-exit=3"
+            )
+        )
+    assert str(raised.value).endswith("Output (1 lines):\nonly")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_abort_patterns(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+) -> None:
+    args = [
+        "-stdout=LogInit: Display: starting",
+        "-stdout=LogWindows: Error: === Critical error: ===",
+        "-sleep=30",
+    ]
+    start = time.perf_counter()
+    with pytest.raises(engine.UnrealExecutionAbortedError) as raised:
+        with engine_empty_version_egl_4_26_2 as unreal_engine:
+            unreal_engine.run(
+                fake_executable, *args, abort_patterns=logs.DEFAULT_ABORT_PATTERNS
+            )
+    assert raised.value.line == "LogWindows: Error: === Critical error: ==="
+    assert raised.value.matched == "=== Critical error: ==="
+    assert "LogInit: Display: starting" in str(raised.value)
+
+    with pytest.raises(engine.UnrealExecutionAbortedError) as raised:
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(
+                fake_executable, *args, abort_patterns=logs.DEFAULT_ABORT_PATTERNS
+            )
+        )
+    assert raised.value.line == "LogWindows: Error: === Critical error: ==="
+    assert time.perf_counter() - start < 20
+
+    with engine_empty_version_egl_4_26_2 as unreal_engine:
+        assert (
+            unreal_engine.run(
+                fake_executable,
+                "-stdout=LogTemp: Error: not fatal",
+                abort_patterns=logs.DEFAULT_ABORT_PATTERNS,
+            )
+            == 0
+        )
+
+
+@pytest.mark.parametrize(
+    "args,kwargs,limit",
+    [
+        (["-stdout=starting", "-sleep=30"], {"timeout": 0.5}, "timeout"),
+        (
+            ["-stdout=starting", "-sleep=0.3", "-stdout=still going", "-sleep=30"],
+            {"timeout": 30, "idle_timeout": 0.5},
+            "idle_timeout",
+        ),
+    ],
+)
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_timeouts(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+    args: List[str],
+    kwargs: Dict[str, float],
+    limit: str,
+) -> None:
+    start = time.perf_counter()
+    with pytest.raises(engine.UnrealExecutionTimeoutError) as raised:
+        with engine_empty_version_egl_4_26_2 as unreal_engine:
+            unreal_engine.run(fake_executable, *args, **kwargs)
+    assert raised.value.limit == limit
+    assert raised.value.seconds == kwargs[limit]
+    assert "starting" in str(raised.value)
+
+    with pytest.raises(engine.UnrealExecutionTimeoutError) as raised:
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(fake_executable, *args, **kwargs)
+        )
+    assert raised.value.limit == limit
+    assert time.perf_counter() - start < 20
+
+    with engine_empty_version_egl_4_26_2 as unreal_engine:
+        assert (
+            unreal_engine.run(
+                fake_executable, "-stdout=done", timeout=30, idle_timeout=30
+            )
+            == 0
+        )
+    assert (
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(
+                fake_executable, "-stdout=done", timeout=30, idle_timeout=30
+            )
+        )
+        == 0
+    )
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_timeout_detached_output(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+) -> None:
+    args = ["-stdout=starting", "-detach=10", "-sleep=30"]
+    kwargs = {"timeout": 0.2, "kill_grace": 0.2}
+    start = time.perf_counter()
+    with pytest.raises(engine.UnrealExecutionTimeoutError):
+        with engine_empty_version_egl_4_26_2 as unreal_engine:
+            unreal_engine.run(fake_executable, *args, **kwargs)
+    assert time.perf_counter() - start < 5
+
+    start = time.perf_counter()
+    with pytest.raises(engine.UnrealExecutionTimeoutError):
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(fake_executable, *args, **kwargs)
+        )
+    assert time.perf_counter() - start < 5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_result(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+) -> None:
+    reported: List[process.RunResult] = []
+
+    def reporter(unreal_engine: engine.UnrealEngine, result: process.RunResult) -> None:
+        assert unreal_engine is engine_empty_version_egl_4_26_2
+        reported.append(result)
+
+    with engine_empty_version_egl_4_26_2 as unreal_engine:
+        result = unreal_engine.run(
+            fake_executable,
+            "-stdout=done",
+            "-sleep=0.3",
+            sample_interval=0.05,
+            reporters=[reporter],
+        )
+        with pytest.raises(engine.UnrealExecutionError):
+            unreal_engine.run(fake_executable, "-exit=3", reporters=[reporter])
+    assert result == 0
+    assert reported == [0, 3]
+    assert reported[0] is result
+    assert result.cmd[0] == fake_executable
+    assert result.wall_time >= 0.3
+    assert result.user_time is not None and result.system_time is not None
+    assert result.max_rss is not None and result.max_rss > 0
+    if os.path.isdir("/proc"):
+        assert result.samples and result.samples[0].rss > 0
+    assert not reported[1].samples
+
+    result = asyncio.run(
+        engine_empty_version_egl_4_26_2.run_async(
+            fake_executable, "-sleep=0.2", reporters=[reporter]
+        )
+    )
+    assert result == 0
+    assert reported[-1] is result
+    assert result.wall_time >= 0.2
+    assert result.user_time is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_reporter_errors(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+    caplog: Any,
+) -> None:
+    def broken_reporter(
+        unreal_engine: engine.UnrealEngine, result: process.RunResult
+    ) -> None:
+        raise KeyError(result.returncode)
+
+    with caplog.at_level(logging.ERROR):
+        with engine_empty_version_egl_4_26_2 as unreal_engine:
+            assert unreal_engine.run(fake_executable, reporters=[broken_reporter]) == 0
+            with pytest.raises(engine.UnrealExecutionError):
+                unreal_engine.run(
+                    fake_executable, "-exit=3", reporters=[broken_reporter]
+                )
+        with pytest.raises(engine.UnrealExecutionError):
+            asyncio.run(
+                engine_empty_version_egl_4_26_2.run_async(
+                    fake_executable, "-exit=3", reporters=[broken_reporter]
+                )
+            )
+    failures = [record for record in caplog.records if record.exc_info is not None]
+    assert len(failures) == 3
+    assert all(isinstance(record.exc_info[1], KeyError) for record in failures)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_unreal_engine_run_async(
+    engine_empty_version_egl_4_26_2: engine.UnrealEngine,
+    fake_executable: str,
+    caplog: Any,
+) -> None:
+    async def run_concurrently() -> List[int]:
+        return await asyncio.gather(
+            *[
+                engine_empty_version_egl_4_26_2.run_async(
+                    fake_executable, f"-stdout=run{index}", "-sleep=0.2"
+                )
+                for index in range(4)
+            ]
+        )
+
+    with caplog.at_level(logging.INFO, logger="UnrealEngine.run"):
+        assert asyncio.run(run_concurrently()) == [0, 0, 0, 0]
+    messages = {record.getMessage() for record in caplog.records}
+    assert {f"run{index}" for index in range(4)} <= messages
+
+    with pytest.raises(engine.UnrealExecutionError):
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(fake_executable, "-exit=1")
+        )
+    assert (
+        asyncio.run(
+            engine_empty_version_egl_4_26_2.run_async(
+                fake_executable, "-exit=1", expected_retcodes={1}
+            )
+        )
+        == 1
+    )
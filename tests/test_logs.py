@@ -1,6 +1,10 @@
 # Standard Library
+import json
 import logging
-from typing import Any, Optional, Tuple
+import os
+import threading
+import time
+from typing import Any, List, Optional, Tuple
 
 # Third Party
 import pytest
@@ -145,7 +149,7 @@ def test_filter_ubt_warnings(
             "[2021.11.29-21.06.49:745][  0]LogConfig: Setting CVar [[r.BloomQuality:5]]",
             logging.INFO,
             "INFO",
-            1638220009,
+            1638220009.745,
             "LogConfig",
             "Setting CVar [[r.BloomQuality:5]]",
         ),
@@ -155,7 +159,7 @@ def test_filter_ue4_logs(
     log_string: str,
     levelno: int,
     levelname: str,
-    created: Optional[int],
+    created: Optional[float],
     module: Optional[str],
     sub_msg: Optional[str],
     caplog: Any,
@@ -169,7 +173,632 @@ def test_filter_ue4_logs(
             assert record.levelname == levelname
             if created is not None:
                 assert record.created == created
+                assert record.msecs == pytest.approx(745)
             if module is not None:
                 assert record.module == module
             if sub_msg is not None:
                 assert record.sub_msg == sub_msg
+
+
+UNREAL_LOG_LINES = [
+    "[2021.11.29-21.06.49:745][  0]LogConfig: Setting CVar [[r.BloomQuality:5]]",
+    "[2021.11.29-21.06.49:746][123]LogInit: Warning: Incompatible or missing module",
+    "[2021.11.29-21.06.50:001][123]LogInit: Error: Failed to load",
+    "/path/to/myfile.cpp(32): error C3861: 'assert': identifier not found",
+    "C:\\Program Files (x86)\\MyFile.cpp(32,5): warning C4996: 'x': deprecated",
+    "C:\\MyFile.h(3) : note: see declaration of 'x'",
+    "@progress 'Compiling C++ source code...' 59%",
+    "[8/17] MainMenuPlayerController.gen.cpp",
+    "LogPluginManager: Mounting plugin SunPosition",
+    "",
+]
+
+
+@pytest.mark.parametrize("log_string", UNREAL_LOG_LINES)
+def test_filter_unreal_logs(log_string: str) -> None:
+    expected = logging.LogRecord(
+        "test", logging.INFO, "test_logs.py", 0, log_string, (), None
+    )
+    record = logging.LogRecord(
+        "test", logging.INFO, "test_logs.py", 0, log_string, (), None
+    )
+    expected.created = record.created
+    expected.msecs = record.msecs
+    logs.FilterUBTWarnings().filter(expected)
+    logs.FilterUE4Logs().filter(expected)
+
+    assert logs.FilterUnrealLogs().filter(record) is True
+    for attribute in (
+        "levelno",
+        "levelname",
+        "created",
+        "msecs",
+        "module",
+        "sub_msg",
+        "filename",
+        "linenumber",
+        "colnumber",
+    ):
+        assert getattr(record, attribute, None) == getattr(expected, attribute, None)
+
+
+@pytest.mark.parametrize(
+    "log_string,code",
+    [
+        (
+            "/path/to/myfile.cpp(32): error C3861: 'assert': identifier not found",
+            "C3861",
+        ),
+        ("C:\\MyFile.h(3) : note: see declaration of 'x'", None),
+        ("Module.cpp.obj (1 of 3)", None),
+        ("x" * 100000 + "(" + "1" * 100000, None),
+    ],
+)
+def test_filter_unreal_logs_ubt_code(log_string: str, code: Optional[str]) -> None:
+    record = logging.LogRecord(
+        "test", logging.INFO, "test_logs.py", 0, log_string, (), None
+    )
+    logs.FilterUnrealLogs().filter(record)
+    assert getattr(record, "code", None) == code
+
+
+@pytest.mark.parametrize(
+    "log_string,filename",
+    [
+        (
+            "C:\\Program Files (x86)\\A.h(3): warning C1: x",
+            "C:\\Program Files (x86)\\A.h",
+        ),
+        ("Foo(1)(2): error C2: x", "Foo(1)"),
+        ("(12): error C2: no file path", None),
+        ("see A.h (12): note: spaced", "see A.h "),
+    ],
+)
+def test_filter_unreal_logs_ubt_filename(
+    log_string: str, filename: Optional[str]
+) -> None:
+    record = logging.LogRecord(
+        "test", logging.INFO, "test_logs.py", 0, log_string, (), None
+    )
+    logs.FilterUnrealLogs().filter(record)
+    expected = logging.LogRecord(
+        "test", logging.INFO, "test_logs.py", 0, log_string, (), None
+    )
+    logs.FilterUBTWarnings().filter(expected)
+    assert record.filename == (filename or "test_logs.py")
+    assert record.filename == expected.filename
+
+
+@pytest.mark.parametrize(
+    "timestamp,created",
+    [
+        ("2021.11.29-21.06.49:745", 1638220009.745),
+        ("2021.11.29-21.06.49:007", 1638220009.007),
+        ("2021.11.29-21.06.49:5", 1638220009.5),
+        ("2021.12.31-23.59.59:999", 1640995199.999),
+        ("1970.01.01-00.00.00:000", 0.0),
+    ],
+)
+def test_parse_ue4_timestamp(timestamp: str, created: float) -> None:
+    assert logs.parse_ue4_timestamp(timestamp) == created
+    assert logs.parse_ue4_timestamp(timestamp) == created
+
+
+def test_parse_ue4_timestamp_errors() -> None:
+    with pytest.raises(ValueError):
+        logs.parse_ue4_timestamp("2021.11.29-21.06.49:abc")
+    with pytest.raises(ValueError):
+        logs.parse_ue4_timestamp("2021.11.29")
+    with pytest.raises(ValueError):
+        logs.parse_ue4_timestamp("2021.11.29-21.06.49")
+
+
+def test_run_log_pipeline(caplog: Any) -> None:
+    logger = logging.getLogger("test_run_log_pipeline")
+    with caplog.at_level(logging.INFO):
+        with logs.RunLogPipeline(
+            "UE4Editor",
+            "-arg",
+            logger=logger,
+            filters=[logs.FilterUBTWarnings(), lambda record: "skip" not in record.msg],
+        ) as run_log:
+            assert len(run_log.filters) == 3
+            run_log.log("/path/to/myfile.cpp(32): error C3861: 'assert': not found")
+            run_log.log("skip this line")
+            run_log.log("debug line", logging.DEBUG)
+        assert run_log.filters == ()
+
+    assert logger.filters == []
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelno == logging.ERROR
+    assert caplog.records[0].filename == "/path/to/myfile.cpp"
+    assert caplog.records[0].executable == "UE4Editor"
+    assert caplog.records[0].cmd_args == ("-arg",)
+
+
+class GateFilter(logging.Filter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def filter(self, record: Any) -> bool:
+        self.started.set()
+        assert self.release.wait(timeout=10)
+        return True
+
+
+@pytest.mark.parametrize(
+    "backpressure,expected_messages,dropped,spilled",
+    [
+        (
+            logs.BACKPRESSURE_DROP_DEBUG,
+            ["first", "queued1", "queued2", "LogTemp: Warning: kept"],
+            2,
+            0,
+        ),
+        (
+            logs.BACKPRESSURE_SPILL,
+            [
+                "first",
+                "queued1",
+                "queued2",
+                "spilled",
+                "debug",
+                "LogTemp: Warning: kept",
+            ],
+            0,
+            3,
+        ),
+    ],
+)
+def test_queued_run_log_pipeline_backpressure(
+    backpressure: str,
+    expected_messages: List[str],
+    dropped: int,
+    spilled: int,
+    caplog: Any,
+) -> None:
+    logger = logging.getLogger(f"test_queued_run_log_pipeline_{backpressure}")
+    gate = GateFilter()
+    with caplog.at_level(logging.DEBUG):
+        pipeline = logs.QueuedRunLogPipeline(
+            "UE4Editor",
+            logger=logger,
+            filters=[gate],
+            maxsize=2,
+            backpressure=backpressure,
+        )
+        pipeline.log("first")
+        assert gate.started.wait(timeout=10)
+        pipeline.log("queued1")
+        pipeline.log("queued2")
+        assert pipeline.depth == 2
+        pipeline.log("spilled")
+        pipeline.log("debug", logging.DEBUG)
+        if backpressure == logs.BACKPRESSURE_DROP_DEBUG:
+            threading.Timer(0.05, gate.release.set).start()
+        pipeline.log("LogTemp: Warning: kept")
+        gate.release.set()
+        pipeline.close()
+
+    assert [record.getMessage() for record in caplog.records] == expected_messages
+    assert pipeline.metrics.dropped == dropped
+    assert pipeline.metrics.spilled == spilled
+    assert pipeline.metrics.max_depth == 2
+    assert pipeline.metrics.processed == len(expected_messages)
+    assert pipeline.depth == 0
+    with pytest.raises(RuntimeError):
+        pipeline.log("closed")
+
+
+def test_queued_run_log_pipeline_spill_order(caplog: Any, tmp_path: Any) -> None:
+    logger = logging.getLogger("test_queued_run_log_pipeline_spill_order")
+
+    def slow_filter(record: Any) -> bool:
+        time.sleep(0.01)
+        return True
+
+    with caplog.at_level(logging.INFO):
+        pipeline = logs.QueuedRunLogPipeline(
+            "UE4Editor",
+            logger=logger,
+            filters=[slow_filter],
+            maxsize=2,
+            backpressure=logs.BACKPRESSURE_SPILL,
+            spill_file=str(tmp_path / "spill.jsonl"),
+        )
+        for index in range(9):
+            pipeline.log(f"line{index}")
+            if index in (3, 6):
+                time.sleep(0.015)
+        spill_file = tmp_path / "spill.jsonl"
+        deadline = time.monotonic() + 10
+        while (
+            pipeline.metrics.processed < 9 or os.path.getsize(spill_file)
+        ) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # spilled lines are emitted while the pipeline is still open, and the
+        # spill file is emptied once they are
+        assert pipeline.metrics.processed == 9
+        assert os.path.getsize(spill_file) == 0
+        pipeline.close()
+
+    assert [record.getMessage() for record in caplog.records] == [
+        f"line{index}" for index in range(9)
+    ]
+    assert pipeline.metrics.spilled > 0
+    assert pipeline.metrics.enqueued + pipeline.metrics.spilled == 9
+
+
+def test_queued_run_log_pipeline_block(caplog: Any) -> None:
+    logger = logging.getLogger("test_queued_run_log_pipeline_block")
+    with caplog.at_level(logging.INFO):
+        with logs.QueuedRunLogPipeline(
+            "UE4Editor", logger=logger, filters=[logs.FilterUBTWarnings()], maxsize=4
+        ) as pipeline:
+            for index in range(1000):
+                pipeline.log(f"line{index}", extra={"stream": "stdout"})
+
+    assert [record.getMessage() for record in caplog.records] == [
+        f"line{index}" for index in range(1000)
+    ]
+    assert all(record.stream == "stdout" for record in caplog.records)
+    assert pipeline.metrics.enqueued == 1000
+    assert pipeline.metrics.processed == 1000
+    assert pipeline.metrics.dropped == 0
+    assert pipeline.metrics.max_depth <= 4
+    assert logger.filters == []
+
+
+def test_queued_run_log_pipeline_errors() -> None:
+    with pytest.raises(ValueError):
+        logs.QueuedRunLogPipeline("UE4Editor", backpressure="unknown")
+
+    def broken_filter(record: Any) -> bool:
+        raise KeyError(record.msg)
+
+    logger = logging.getLogger("test_queued_run_log_pipeline_errors")
+    logger.setLevel(logging.INFO)
+    pipeline = logs.QueuedRunLogPipeline(
+        "UE4Editor", logger=logger, filters=[broken_filter]
+    )
+    pipeline.log("one")
+    pipeline.log("two")
+    with pytest.raises(KeyError):
+        pipeline.close()
+    assert pipeline.metrics.errors == 2
+    pipeline.close()
+
+
+UNREAL_LOG_FILE = """\ufeffLog file open, 11/29/21 21:06:49
+LogInit: Display: Running engine for game: MyProject
+LogInit: Build: ++UE4+Release-4.26
+[2021.11.29-21.06.49:745][  0]LogConfig: Setting CVar [[r.BloomQuality:5]]
+[2021.11.29-21.06.49:746][  0]LogInit: Warning: Incompatible or missing module
+[2021.11.29-21.06.50:112][ 12]LogWindows: Error: === Critical error: ===
+LogWindows: Error: Assertion failed: IsValid()\r
+[Callstack] 0x00007ffd UE4Editor-Core.dll!UnknownFunction []
+[2021.11.29-21.06.50:113][ 12]LogExit: Exiting.
+Log file closed, 11/29/21 21:06:50"""
+
+
+def test_read_unreal_log(tmp_path: Any) -> None:
+    log_file = tmp_path / "MyProject.log"
+    log_file.write_bytes(UNREAL_LOG_FILE.encode("utf-8"))
+
+    entries = list(logs.read_unreal_log(str(log_file)))
+    assert [
+        (entry.line, entry.timestamp, entry.frame, entry.category, entry.verbosity)
+        for entry in entries
+    ] == [
+        (1, None, None, None, "Log"),
+        (2, None, None, "LogInit", "Display"),
+        (3, None, None, "LogInit", "Log"),
+        (4, 1638220009.745, 0, "LogConfig", "Log"),
+        (5, 1638220009.746, 0, "LogInit", "Warning"),
+        (6, 1638220010.112, 12, "LogWindows", "Error"),
+        (9, 1638220010.113, 12, "LogExit", "Log"),
+    ]
+    assert entries[0].message == "Log file open, 11/29/21 21:06:49"
+    assert entries[2].message == "Build: ++UE4+Release-4.26"
+    assert entries[3].message == "Setting CVar [[r.BloomQuality:5]]"
+    assert entries[5].message == "\n".join(
+        [
+            "=== Critical error: ===",
+            "LogWindows: Error: Assertion failed: IsValid()",
+            "[Callstack] 0x00007ffd UE4Editor-Core.dll!UnknownFunction []",
+        ]
+    )
+    assert entries[6].message == "Exiting.\nLog file closed, 11/29/21 21:06:50"
+    with open(log_file, "rb") as _log_file:
+        for entry in entries:
+            _log_file.seek(entry.offset)
+            first_line = entry.message.split("\n")[0]
+            assert first_line in _log_file.readline().decode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        (b"", []),
+        (b"\n", [("", "Log")]),
+        (b"Just some text\nand more", [("Just some text\nand more", "Log")]),
+        (
+            b"[0000.53][  0]LogTemp: Verbose: since start\n",
+            [("since start", "Verbose")],
+        ),
+        (b"LogTemp: \xff\xfe bad bytes", [("�� bad bytes", "Log")]),
+    ],
+)
+def test_read_unreal_log_edge_cases(
+    content: bytes, expected: List[Tuple[str, str]], tmp_path: Any
+) -> None:
+    log_file = tmp_path / "Edge.log"
+    log_file.write_bytes(content)
+    assert [
+        (entry.message, entry.verbosity)
+        for entry in logs.read_unreal_log(str(log_file))
+    ] == expected
+
+
+@pytest.mark.parametrize("max_workers", [None, "2"])
+def test_unreal_logs_to_jsonl(max_workers: Optional[str], tmp_path: Any) -> None:
+    log_files = []
+    for index in range(3):
+        log_file = tmp_path / f"MyProject{index}.log"
+        log_file.write_bytes(
+            f"[2021.11.29-21.06.49:745][  0]LogTemp: Display: log {index}\n"
+            f"[2021.11.29-21.06.49:746][  1]LogTemp: Warning: second\nline\n".encode(
+                "utf-8"
+            )
+        )
+        log_files.append(str(log_file))
+
+    jsonl_file = str(tmp_path / "logs.jsonl")
+    logs.unreal_logs_to_jsonl(jsonl_file, *log_files, max_workers=max_workers)  # type: ignore
+    with open(jsonl_file, encoding="utf-8") as _jsonl_file:
+        records = [json.loads(line) for line in _jsonl_file]
+    assert [(record["file"], record["message"]) for record in records] == [
+        (log_file, message)
+        for log_file, index in zip(log_files, range(3))
+        for message in (f"log {index}", "second\nline")
+    ]
+    assert records[1] == {
+        "offset": 54,
+        "line": 2,
+        "timestamp": 1638220009.746,
+        "frame": 1,
+        "category": "LogTemp",
+        "verbosity": "Warning",
+        "message": "second\nline",
+        "file": log_files[0],
+    }
+
+    logs.unreal_logs_to_jsonl(jsonl_file, log_files[0])
+    with open(jsonl_file, encoding="utf-8") as _jsonl_file:
+        assert len(_jsonl_file.readlines()) == 2
+
+
+def test_unreal_log_index(tmp_path: Any) -> None:
+    log_file = tmp_path / "MyProject.log"
+    log_file.write_bytes(UNREAL_LOG_FILE.encode("utf-8") + b"\n")
+    index = logs.UnrealLogIndex.open(str(log_file))
+    assert index.index_file == f"{log_file}.index"
+    assert os.path.isfile(index.index_file)
+    assert len(index) == 7
+    assert index.categories == ["LogConfig", "LogExit", "LogInit", "LogWindows"]
+    assert index.verbosities == ["Display", "Error", "Log", "Warning"]
+    assert [entry.message for entry in index.query(verbosity="Error")] == [
+        list(logs.read_unreal_log(str(log_file)))[5].message
+    ]
+    assert [entry.line for entry in index.query(category="LogInit")] == [2, 3, 5]
+    assert [
+        entry.line for entry in index.query(category="LogInit", verbosity="Warning")
+    ] == [5]
+    assert [entry.line for entry in index.query(start=1638220010)] == [6, 9]
+    assert [
+        entry.line for entry in index.query(start=1638219960, end=1638220010.113)
+    ] == [4, 5, 6]
+    assert list(index.query(category="LogMissing")) == []
+    assert list(index.query(start=0, end=60)) == []
+    assert list(index.query()) == list(logs.read_unreal_log(str(log_file)))
+
+    with open(log_file, "ab") as _log_file:
+        _log_file.write(
+            b"[2021.11.29-21.08.00:000][ 13]LogExit: Error: Reopened\n"
+            b"[2021.11.29-21.08.00:001][ 13]LogInit: Partial"
+        )
+    with open(index.index_file, "rb") as _index_file:
+        index_bytes = _index_file.read()
+    reopened = logs.UnrealLogIndex.open(str(log_file))
+    assert len(reopened) == 8
+    with open(index.index_file, "rb") as _index_file:
+        assert _index_file.read(len(index_bytes)) == index_bytes
+    loaded = logs.UnrealLogIndex(str(log_file))
+    loaded.load()
+    assert loaded.to_dict() == reopened.to_dict()
+    assert [entry.line for entry in reopened.query(verbosity="Error")] == [6, 11]
+    assert reopened.update() == 0
+
+    with open(log_file, "ab") as _log_file:
+        _log_file.write(b" line\n")
+    assert reopened.update() == 1
+    assert [entry.message for entry in reopened.query(category="LogInit")][-1] == (
+        "Partial line"
+    )
+
+    log_file.write_bytes(b"[2021.11.29-21.06.49:745][  0]LogTemp: Replaced\n")
+    replaced = logs.UnrealLogIndex.open(str(log_file))
+    assert len(replaced) == 1
+    assert replaced.categories == ["LogTemp"]
+
+
+def test_unreal_log_index_load(tmp_path: Any) -> None:
+    log_file = tmp_path / "MyProject.log"
+    log_file.write_bytes(UNREAL_LOG_FILE.encode("utf-8") + b"\n")
+    index = logs.UnrealLogIndex(str(log_file), str(tmp_path / "index.json"))
+    assert index.update() == 7
+    index.dump()
+
+    loaded = logs.UnrealLogIndex(str(log_file), str(tmp_path / "index.json"))
+    loaded.load()
+    assert loaded.to_dict() == index.to_dict()
+    assert loaded.update() == 0
+
+    with open(tmp_path / "index.json", "w") as _index_file:
+        json.dump({"Version": 0}, _index_file)
+    with pytest.raises(ValueError):
+        loaded.load()
+    assert (
+        len(logs.UnrealLogIndex.open(str(log_file), str(tmp_path / "index.json"))) == 7
+    )
+
+    empty_file = tmp_path / "Empty.log"
+    empty_file.write_bytes(b"")
+    assert len(logs.UnrealLogIndex.open(str(empty_file))) == 0
+
+
+def test_unreal_log_index_shared_sidecar(tmp_path: Any) -> None:
+    log_file = tmp_path / "MyProject.log"
+    log_file.write_bytes(UNREAL_LOG_FILE.encode("utf-8") + b"\n")
+    first = logs.UnrealLogIndex.open(str(log_file))
+    second = logs.UnrealLogIndex.open(str(log_file))
+
+    with open(log_file, "ab") as _log_file:
+        _log_file.write(
+            b"[2021.11.29-21.08.00:000][ 13]LogB: Error: one\n"
+            b"[2021.11.29-21.08.00:001][ 13]LogB: Error: two\n"
+        )
+    for index in (first, second):
+        assert index.update() == 2
+        index.save()
+    with open(log_file, "ab") as _log_file:
+        _log_file.write(b"[2021.11.29-21.08.00:002][ 13]LogB: Error: three\n")
+    for index in (second, first):
+        assert index.update() == 1
+        index.save()
+
+    reopened = logs.UnrealLogIndex.open(str(log_file))
+    assert len(reopened) == 10
+    assert reopened.to_dict() == first.to_dict()
+    assert [entry.message for entry in reopened.query(category="LogB")] == [
+        "one",
+        "two",
+        "three",
+    ]
+    assert len(list(reopened.query(verbosity="Error"))) == 4
+
+
+UBT_DIAGNOSTIC_LINES = [
+    "Building MyProjectEditor...",
+    "C:\\MyProject\\Source\\Shared.h(12,5): warning C4996: 'Old': deprecated",
+    "C:\\MyProject\\Source\\Shared.h(12,5): warning C4996: 'Old': deprecated",
+    "/MyProject/Source/A.cpp(3): error C3861: 'assert': identifier not found",
+    "C:\\MyProject\\Source\\Shared.h(12,5): warning C4996: 'Old': deprecated",
+    "C:\\MyProject\\Source\\Shared.h(4) : note: see declaration of 'Old'",
+    "C:\\MyProject\\Source\\Shared.h(12,5): warning C4267: 'Old': conversion",
+]
+
+
+def test_filter_ubt_diagnostics(tmp_path: Any, caplog: Any) -> None:
+    logger = logging.getLogger("test_filter_ubt_diagnostics")
+    diagnostics = logs.FilterUBTDiagnostics()
+    with caplog.at_level(logging.INFO):
+        with logs.RunLogPipeline(
+            "UnrealBuildTool",
+            logger=logger,
+            filters=[logs.FilterUnrealLogs(), diagnostics],
+        ) as run_log:
+            for line in UBT_DIAGNOSTIC_LINES:
+                run_log.log(line)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        UBT_DIAGNOSTIC_LINES[index] for index in (0, 1, 3, 5, 6)
+    ]
+    assert len(diagnostics.diagnostics) == 4
+    assert diagnostics.suppressed == 2
+
+    summary = diagnostics.to_dict()
+    assert summary["Unique"] == 4
+    assert summary["Suppressed"] == 2
+    assert summary["Levels"] == {"warning": 2, "error": 1, "note": 1}
+    assert summary["Diagnostics"][0] == {
+        "File": "C:\\MyProject\\Source\\Shared.h",
+        "Line": "12",
+        "Column": "5",
+        "Code": "C4996",
+        "Level": "warning",
+        "Message": "'Old': deprecated",
+        "Count": 3,
+    }
+
+    sarif = diagnostics.to_sarif()
+    assert sarif["version"] == "2.1.0"
+    assert sarif["runs"][0]["tool"]["driver"]["rules"] == [
+        {"id": "C3861"},
+        {"id": "C4267"},
+        {"id": "C4996"},
+    ]
+    results = sarif["runs"][0]["results"]
+    assert results[0] == {
+        "ruleId": "C4996",
+        "level": "warning",
+        "message": {"text": "'Old': deprecated"},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": "file:///C:/MyProject/Source/Shared.h"},
+                    "region": {"startLine": 12, "startColumn": 5},
+                }
+            }
+        ],
+        "occurrenceCount": 3,
+    }
+    assert results[1]["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "file:///MyProject/Source/A.cpp"},
+        "region": {"startLine": 3},
+    }
+    assert "ruleId" not in results[2]
+
+    diagnostics.dump(str(tmp_path / "diagnostics.json"))
+    diagnostics.dump(str(tmp_path / "diagnostics.sarif"))
+    with open(tmp_path / "diagnostics.json", encoding="utf-8") as _summary_file:
+        assert json.load(_summary_file) == summary
+    with open(tmp_path / "diagnostics.sarif", encoding="utf-8") as _summary_file:
+        assert json.load(_summary_file) == sarif
+
+
+@pytest.mark.parametrize(
+    "patterns,line,matched",
+    [
+        ((), "Fatal error: boom", None),
+        ((r"Fatal error:",), "LogWindows: Fatal error: boom", "Fatal error:"),
+        ((r"Fatal error:",), "No fatal errors", None),
+        (
+            (r"foo", r"Assertion failed: \w+"),
+            "Assertion failed: IsValid",
+            "Assertion failed: IsValid",
+        ),
+    ],
+)
+def test_abort_patterns(
+    patterns: Tuple[str, ...], line: str, matched: Optional[str]
+) -> None:
+    abort_patterns = logs.AbortPatterns(*patterns)
+    assert bool(abort_patterns) == bool(patterns)
+    assert abort_patterns.search(line) == matched
+
+
+def test_default_abort_patterns() -> None:
+    for line in [
+        "[2021.11.29-21.06.50:112][ 12]LogWindows: Error: === Critical error: ===",
+        "[2021.11.29-21.06.50:112][ 12]LogWindows: Error: Fatal error: [File:Foo.cpp]",
+        "Assertion failed: IsValid() [File:Foo.cpp] [Line: 12]",
+    ]:
+        assert logs.DEFAULT_ABORT_PATTERNS.search(line) is not None
+    assert logs.DEFAULT_ABORT_PATTERNS.search("LogTemp: Error: not fatal") is None
+
+    combined = logs.DEFAULT_ABORT_PATTERNS + logs.AbortPatterns(r"not fatal")
+    assert combined.search("LogTemp: Error: not fatal") == "not fatal"
+    assert combined.patterns[:-1] == logs.DEFAULT_ABORT_PATTERNS.patterns
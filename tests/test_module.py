@@ -1,4 +1,5 @@
 # Standard Library
+import os
 from typing import Any, Type
 
 # Third Party
@@ -78,3 +79,21 @@ def test_module_descriptor_to_object(
     module_descriptor = request.getfixturevalue(module_descriptor_fixture)
     dct = module_descriptor.to_dict()
     assert isinstance(module.ModuleDescriptor.to_object(dct), expected_type)
+
+
+def test_module_descriptor_find_definition_file(
+    default_valid_module_descriptor: module.ModuleDescriptor, tmp_path: Any
+) -> None:
+    class Owner:
+        source_dir = str(tmp_path / "Source")
+
+    with pytest.raises(module.UnrealModuleError):
+        default_valid_module_descriptor.find_definition_file(object())
+
+    assert default_valid_module_descriptor.find_definition_file(Owner()) is None
+    build_file = tmp_path / "Source" / "DefaultValid" / "DefaultValid.Build.cs"
+    build_file.parent.mkdir(parents=True)
+    build_file.write_text("")
+    assert default_valid_module_descriptor.find_definition_file(
+        Owner()
+    ) == os.path.realpath(str(build_file))
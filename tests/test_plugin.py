@@ -339,9 +339,9 @@ def test_unreal_path_from_file_path(
 
 
 def test_unreal_plugin_code_templates(
-    empty_file_content_unreal_plugin: plugin.UnrealPlugin,
+    empty_file_content_unreal_plugin: plugin.UnrealPlugin, monkeypatch: Any
 ) -> None:
-    plugin.entry_points = lambda: {}
+    monkeypatch.setattr(plugin, "load_entry_points", lambda group: ())
     for _name, _plugin in empty_file_content_unreal_plugin.code_templates.items():
         assert isinstance(_name, str)
         assert isinstance(_plugin, code.CodeTemplate)
@@ -350,8 +350,9 @@ def test_unreal_plugin_code_templates(
 def test_unreal_plugin_properties_types(
     empty_file_content_unreal_plugin: plugin.UnrealPlugin,
     basic_unreal_plugin: plugin.UnrealPlugin,
+    monkeypatch: Any,
 ) -> None:
-    plugin.entry_points = lambda: {}
+    monkeypatch.setattr(plugin, "load_entry_points", lambda group: ())
     with pytest.raises(json.decoder.JSONDecodeError):
         assert empty_file_content_unreal_plugin.descriptor is None
 
@@ -376,12 +377,14 @@ def test_unreal_plugin_list_plugin_code_templates(
 def test_unreal_plugin_validate(
     basic_unreal_plugin: plugin.UnrealPlugin, monkeypatch: Any, test_entry_point: Any
 ) -> None:
-    monkeypatch.setattr(plugin, "entry_points", lambda: {})
+    monkeypatch.setattr(plugin, "load_entry_points", lambda group: ())
     assert basic_unreal_plugin.validate() is None
 
     monkeypatch.setattr(
         plugin,
-        "entry_points",
-        lambda: {"crazyhusk.plugin.validators": [test_entry_point]},
+        "load_entry_points",
+        lambda group: {"crazyhusk.plugin.validators": (test_entry_point.load(),)}.get(
+            group, ()
+        ),
     )
     assert basic_unreal_plugin.validate() is None
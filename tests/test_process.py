@@ -0,0 +1,429 @@
+# Standard Library
+import asyncio
+import gzip
+import lzma
+import os
+import signal
+import subprocess  # nosec
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Callable, List
+
+# Third Party
+import pytest
+
+# CrazyHusk
+from crazyhusk import process
+
+
+@pytest.mark.parametrize(
+    "chunks,lines,final",
+    [
+        ([], [], []),
+        ([b"line\n"], ["line"], []),
+        ([b"li", b"ne\r\n", b"next"], ["line"], ["next"]),
+        ([b"a\nb\n\nc\n"], ["a", "b", "", "c"], []),
+        (["é\n".encode("utf-8")[:1], "é\n".encode("utf-8")[1:]], ["é"], []),
+        ([b"\xff\n"], ["�"], []),
+    ],
+)
+def test_line_decoder(chunks: List[bytes], lines: List[str], final: List[str]) -> None:
+    decoder = process.LineDecoder("utf-8")
+    decoded = []
+    for chunk in chunks:
+        decoded.extend(decoder.feed(chunk))
+    assert decoded == lines
+    assert decoder.flush() == final
+    assert decoder.flush() == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_process_streams(fake_executable: str) -> None:
+    with subprocess.Popen(
+        [fake_executable, "-stderr=error", "-stdout=output", "-stderr=last"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+    ) as proc:
+        streams = process.ProcessStreams(proc, encoding="utf-8")
+        lines = list(streams)
+        assert streams.closed
+        assert streams.read() == []
+        assert proc.wait() == 0
+
+    assert [line for line in lines if line.stream == process.STDERR] == [
+        process.OutputLine(process.STDERR, "error"),
+        process.OutputLine(process.STDERR, "last"),
+    ]
+    assert [line for line in lines if line.stream == process.STDOUT] == [
+        process.OutputLine(process.STDOUT, "output"),
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_process_streams_flood(fake_executable: str) -> None:
+    megabytes = 100
+    counts = {process.STDOUT: 0, process.STDERR: 0}
+
+    proc = subprocess.Popen(
+        [fake_executable, f"-flood={megabytes}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+    )
+
+    def drain() -> None:
+        for line in process.ProcessStreams(proc, encoding="utf-8"):
+            assert len(line.text) == 1023
+            counts[line.stream] += 1
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    reader.join(timeout=120)
+    if reader.is_alive():
+        proc.kill()
+        pytest.fail("Reading process output did not finish; the child is blocked.")
+    assert proc.wait() == 0
+    assert counts == {
+        process.STDOUT: megabytes * 1024,
+        process.STDERR: megabytes * 1024,
+    }
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_async_process(fake_executable: str) -> None:
+    async def run() -> List[process.OutputLine]:
+        async with process.AsyncProcess(
+            fake_executable, "-stdout=output", "-stderr=error", "-exit=2"
+        ) as proc:
+            lines = [line async for line in proc]
+            assert await proc.wait() == 2
+            return lines
+
+    lines = asyncio.run(run())
+    assert sorted(lines) == [
+        process.OutputLine(process.STDERR, "error"),
+        process.OutputLine(process.STDOUT, "output"),
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_async_process_wait_unread(fake_executable: str) -> None:
+    async def run() -> int:
+        async with process.AsyncProcess(fake_executable, "-flood=8") as proc:
+            return await proc.wait()
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=60)) == 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_async_process_cancel(fake_executable: str) -> None:
+    proc = process.AsyncProcess(fake_executable, "-stdout=started", "-sleep=60")
+
+    async def read() -> None:
+        async with proc:
+            async for _line in proc:
+                pass
+
+    async def run() -> None:
+        task = asyncio.ensure_future(read())
+        while proc.process is None:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(run(), timeout=30))
+    assert proc.returncode is not None
+    assert proc.returncode != 0
+    with pytest.raises(RuntimeError):
+        asyncio.run(proc.start())
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake executable uses a shebang")
+def test_async_process_close_detached_output(fake_executable: str) -> None:
+    async def run() -> process.AsyncProcess:
+        proc = process.AsyncProcess(fake_executable, "-detach=10", "-sleep=60")
+        async with proc:
+            await asyncio.sleep(0.2)
+        return proc
+
+    start = time.perf_counter()
+    proc = asyncio.run(asyncio.wait_for(run(), timeout=30))
+    assert time.perf_counter() - start < 5
+    assert proc.process is not None
+    assert proc.process.stdout is not None and proc.process.stdout.at_eof()
+    transport = getattr(proc.process, "_transport", None)
+    if transport is not None:
+        # the pipes held by the detached process are closed
+        assert transport.is_closing()
+        assert all(
+            transport.get_pipe_transport(fd) is None
+            or transport.get_pipe_transport(fd).is_closing()
+            for fd in (1, 2)
+        )
+
+
+@pytest.mark.parametrize(
+    "tail_lines,lines,expected",
+    [
+        (3, [], "No output."),
+        (3, ["one", "", "three"], "Output (3 lines):\none\n\nthree"),
+        (2, ["one", "two", "three"], "Last 2 of 3 lines of output:\ntwo\nthree"),
+    ],
+)
+def test_output_capture_tail(tail_lines: int, lines: List[str], expected: str) -> None:
+    with process.OutputCapture(tail_lines) as capture:
+        for line in lines:
+            capture.write(line)
+    assert capture.lines == len(lines)
+    assert list(capture.tail) == lines[-tail_lines:]
+    assert capture.format_tail() == expected
+
+
+@pytest.mark.parametrize(
+    "capture_name,decompress",
+    [
+        ("output.log", lambda data: data),
+        ("output.log.gz", lambda data: zlib.decompressobj(wbits=31).decompress(data)),
+        ("output.log.xz", lzma.decompress),
+    ],
+)
+def test_output_capture_file(
+    capture_name: str, decompress: Callable[[bytes], bytes], tmp_path: Any
+) -> None:
+    capture_file = str(tmp_path / capture_name)
+    with process.OutputCapture(2, capture_file, flush_seconds=3600) as capture:
+        capture.write("first")
+        capture.write("é")
+        capture.flush()
+        with open(capture_file, "rb") as _capture_file:
+            assert decompress(_capture_file.read()) == "first\né\n".encode("utf-8")
+        for index in range(1000):
+            capture.write(f"line {index}")
+
+    assert list(capture.tail) == ["line 998", "line 999"]
+    with open(capture_file, "rb") as _capture_file:
+        data = _capture_file.read()
+    if capture_name.endswith(".gz"):
+        data = gzip.decompress(data)
+    elif capture_name.endswith(".xz"):
+        data = lzma.decompress(data)
+    assert data.decode("utf-8").splitlines() == ["first", "é"] + [
+        f"line {index}" for index in range(1000)
+    ]
+
+
+SPAWN_CHILD = """
+import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print(child.pid, flush=True)
+time.sleep(60)
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="checks POSIX process groups")
+def test_kill_process_tree() -> None:
+    with subprocess.Popen(
+        [sys.executable, "-c", SPAWN_CHILD],
+        stdout=subprocess.PIPE,
+        start_new_session=True,
+    ) as parent:
+        assert parent.stdout is not None
+        child_pid = int(parent.stdout.readline())
+        process.kill_process_tree(parent.pid)
+        assert parent.wait(timeout=10) == -signal.SIGKILL
+        for _ in range(100):
+            try:
+                os.kill(child_pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("child process was not killed")
+
+    process.kill_process_tree(parent.pid)
+
+
+SLEEP = """
+import time
+print("ready", flush=True)
+time.sleep(60)
+"""
+IGNORE_SIGTERM = """
+import signal, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+print("ready", flush=True)
+time.sleep(60)
+"""
+
+
+@pytest.mark.parametrize(
+    "code,kwargs,expired,returncode",
+    [
+        (SLEEP, {"timeout": 0.2}, "timeout", -signal.SIGTERM),
+        (
+            SLEEP,
+            {"timeout": 30, "idle_timeout": 0.2},
+            "idle_timeout",
+            -signal.SIGTERM,
+        ),
+        (
+            IGNORE_SIGTERM,
+            {"timeout": 0.2, "kill_grace": 0.2},
+            "timeout",
+            -signal.SIGKILL,
+        ),
+    ],
+)
+@pytest.mark.skipif(sys.platform == "win32", reason="checks POSIX signals")
+def test_watchdog(code: str, kwargs: Any, expired: str, returncode: int) -> None:
+    with subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        start_new_session=True,
+    ) as child:
+        assert child.stdout is not None
+        child.stdout.readline()
+        watchdog = process.Watchdog(**kwargs)
+        assert watchdog.check(child.pid) is None
+        while child.poll() is None:
+            try:
+                child.wait(watchdog.wait_time())
+            except subprocess.TimeoutExpired:
+                watchdog.check(child.pid)
+        assert watchdog.expired == expired
+        assert watchdog.limit == kwargs[expired]
+        assert child.returncode == returncode
+        assert watchdog.elapsed < 20
+
+
+def test_watchdog_unlimited() -> None:
+    watchdog = process.Watchdog()
+    assert watchdog.wait_time() is None
+    assert watchdog.check(os.getpid()) is None
+    assert watchdog.limit is None
+    assert not watchdog.abandoned
+
+    watchdog = process.Watchdog(timeout=60, idle_timeout="5")  # type: ignore
+    assert 4 < watchdog.wait_time() <= 5  # type: ignore
+    watchdog.output()
+    assert watchdog.check(os.getpid()) is None
+
+
+@pytest.mark.parametrize(
+    "code,returncode",
+    [
+        ("pass", 0),
+        ("import sys; sys.exit(3)", 3),
+        ("import os, signal; os.kill(os.getpid(), signal.SIGTERM)", -signal.SIGTERM),
+    ],
+)
+def test_wait_process(code: str, returncode: int) -> None:
+    with subprocess.Popen([sys.executable, "-c", code]) as child:
+        usage = process.wait_process(child)
+        assert child.returncode == returncode
+        assert child.wait() == returncode
+    if hasattr(os, "wait4"):
+        assert usage is not None
+        assert usage.user_time + usage.system_time > 0
+        assert usage.max_rss > 1024 * 1024
+    else:
+        assert usage is None
+
+
+def test_wait_process_timeout() -> None:
+    with subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"]
+    ) as child:
+        with pytest.raises(subprocess.TimeoutExpired):
+            process.wait_process(child, 0.1)
+        assert child.returncode is None
+        child.kill()
+        process.wait_process(child, 10)
+        assert child.returncode == -signal.SIGKILL
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="reaps with os.wait4")
+def test_wait_process_reaped_not_signalled(monkeypatch: Any) -> None:
+    with subprocess.Popen(
+        [sys.executable, "-c", "import sys; sys.stdin.read()"],
+        stdin=subprocess.PIPE,
+        start_new_session=True,
+    ) as child:
+        with pytest.raises(subprocess.TimeoutExpired):
+            process.wait_process(child, 0.1)
+        child.stdin.close()  # type: ignore
+        deadline = time.monotonic() + 10
+        while child.returncode is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert child.returncode == 0
+
+        signalled: List[int] = []
+        monkeypatch.setattr(os, "killpg", lambda pid, sig: signalled.append(pid))
+        monkeypatch.setattr(os, "kill", lambda pid, sig: signalled.append(pid))
+        process.kill_process_tree(child)
+        process.terminate_process_tree(child)
+        assert signalled == []
+        usage = process.wait_process(child)
+        assert usage is not None and usage.max_rss > 0
+        assert process.wait_process(child) is None
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="samples /proc")
+def test_process_sampler() -> None:
+    with subprocess.Popen(
+        [sys.executable, "-c", SPAWN_CHILD],
+        stdout=subprocess.PIPE,
+        start_new_session=True,
+    ) as parent:
+        assert parent.stdout is not None
+        parent.stdout.readline()
+        with process.ProcessSampler(parent.pid, 0.05) as sampler:
+            time.sleep(0.2)
+        process.kill_process_tree(parent.pid)
+        parent.wait()
+
+    assert len(sampler.samples) >= 2
+    sample = sampler.samples[-1]
+    assert sample.processes == 2
+    assert 0 < sample.rss <= sample.peak_rss
+    assert sampler.samples[0].elapsed < sample.elapsed
+    for _ in range(100):
+        if sampler.sample() is None:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("killed process tree was still sampled")
+
+
+def test_run_result() -> None:
+    usage = process.ProcessUsage(1.5, 0.25, 4096)
+    sample = process.ResourceSample(0.5, 2, 1024, 2048, 10, 20)
+    result = process.RunResult(3, ["UE4Editor-Cmd", "-run=Test"], 2.0, usage, [sample])
+    assert result == 3
+    assert result in {3}
+    assert result.returncode == 3
+    assert f"{result}" == "3"
+    assert repr(result) == "<RunResult 3 after 2.000 seconds>"
+    assert result.to_dict() == {
+        "returncode": 3,
+        "cmd": ["UE4Editor-Cmd", "-run=Test"],
+        "wall_time": 2.0,
+        "user_time": 1.5,
+        "system_time": 0.25,
+        "max_rss": 4096,
+        "samples": [
+            {
+                "elapsed": 0.5,
+                "processes": 2,
+                "rss": 1024,
+                "peak_rss": 2048,
+                "read_bytes": 10,
+                "write_bytes": 20,
+            }
+        ],
+    }
+    assert process.RunResult(0).user_time is None
@@ -232,7 +232,7 @@ def test_unreal_project_modules(
 def test_unreal_project_descriptor(
     basic_unreal_project: project.UnrealProject, monkeypatch: Any
 ) -> None:
-    monkeypatch.setattr(project, "entry_points", lambda: {})
+    monkeypatch.setattr(project, "load_entry_points", lambda group: ())
     assert isinstance(basic_unreal_project.descriptor, project.ProjectDescriptor)
 
 
@@ -333,10 +333,14 @@ def test_unreal_project_plugins(
 def test_unreal_project_code_templates(
     basic_unreal_project_realpath: project.UnrealProject, monkeypatch: Any
 ) -> None:
-    monkeypatch.setattr(project, "entry_points", lambda: {})
+    monkeypatch.setattr(project, "load_entry_points", lambda group: ())
     for _name, _plugin in basic_unreal_project_realpath.code_templates.items():
         assert isinstance(_name, str)
         assert isinstance(_plugin, code.CodeTemplate)
+    assert (
+        basic_unreal_project_realpath.code_templates.parent
+        is basic_unreal_project_realpath.engine.code_templates
+    )
 
 
 @pytest.mark.parametrize(
@@ -364,9 +368,15 @@ def test_unreal_project_config(
     empty_file_unreal_project: project.UnrealProject,
     monkeypatch: Any,
 ) -> None:
-    monkeypatch.setattr(project, "entry_points", lambda: {})
+    monkeypatch.setattr(project, "load_entry_points", lambda group: ())
     assert isinstance(basic_unreal_project_realpath.config(), config.UnrealConfigParser)
     assert isinstance(empty_file_unreal_project.config(), config.UnrealConfigParser)
+    assert isinstance(
+        basic_unreal_project_realpath.config_snapshot("Engine"), config.ConfigSnapshot
+    )
+    matrix = basic_unreal_project_realpath.config_matrix()
+    assert ("Engine", None) in matrix.snapshots
+    assert len(matrix.snapshots) == matrix.stats.combinations
 
 
 def test_unreal_project_engine(
@@ -374,7 +384,7 @@ def test_unreal_project_engine(
     null_engine_unreal_project: project.UnrealProject,
     monkeypatch: Any,
 ) -> None:
-    monkeypatch.setattr(project, "entry_points", lambda: {})
+    monkeypatch.setattr(project, "load_entry_points", lambda group: ())
     assert isinstance(basic_unreal_project_realpath.engine, engine.UnrealEngine)
     assert null_engine_unreal_project.engine is None
 
@@ -392,3 +402,28 @@ def test_unreal_project_list_project_code_templates(
         )
         == 0
     )
+
+
+def test_unreal_project_plugins_overlay(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.setattr(project, "load_entry_points", lambda group: ())
+    for plugins_dir, name in [
+        (tmp_path / "Engine" / "Plugins", "Shared"),
+        (tmp_path / "Engine" / "Plugins", "EngineOnly"),
+        (tmp_path / "MyProject" / "Plugins", "Shared"),
+        (tmp_path / "MyProject" / "Plugins", "ProjectOnly"),
+    ]:
+        (plugins_dir / name).mkdir(parents=True)
+        (plugins_dir / name / f"{name}.uplugin").write_text("{}")
+    project_file = tmp_path / "MyProject" / "MyProject.uproject"
+    project_file.write_text('{"EngineAssociation": ""}')
+
+    unreal_project = project.UnrealProject(str(project_file))
+    engine_plugins = unreal_project.engine.plugins
+    assert sorted(unreal_project.plugins) == ["EngineOnly", "ProjectOnly", "Shared"]
+    assert unreal_project.plugins["EngineOnly"] is engine_plugins["EngineOnly"]
+    assert unreal_project.plugins["Shared"] is not engine_plugins["Shared"]
+    assert unreal_project.plugins["Shared"].plugin_dir == str(
+        tmp_path / "MyProject" / "Plugins" / "Shared"
+    )
+    with pytest.raises(TypeError):
+        unreal_project.plugins["New"] = unreal_project.plugins["Shared"]
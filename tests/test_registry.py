@@ -0,0 +1,35 @@
+# Standard Library
+from typing import Any, List
+
+# CrazyHusk
+from crazyhusk import registry
+
+
+def test_load_entry_points_installed() -> None:
+    registry.refresh_entry_points()
+    validators = registry.load_entry_points("crazyhusk.plugin.validators")
+    assert isinstance(validators, tuple)
+    assert all(callable(validator) for validator in validators)
+    assert registry.load_entry_points("crazyhusk.nonexistent.group") == ()
+
+
+def test_load_entry_points_cached(monkeypatch: Any, test_entry_point: Any) -> None:
+    calls: List[int] = []
+
+    def fake_entry_points() -> Any:
+        calls.append(1)
+        return {"crazyhusk.test": [test_entry_point]}
+
+    monkeypatch.setattr(registry, "entry_points", fake_entry_points)
+    registry.refresh_entry_points()
+    try:
+        first = registry.load_entry_points("crazyhusk.test")
+        assert first == (test_entry_point.load(),)
+        assert registry.load_entry_points("crazyhusk.test") is first
+        assert len(calls) == 1
+
+        registry.refresh_entry_points("crazyhusk.test")
+        assert registry.load_entry_points("crazyhusk.test") == first
+        assert len(calls) == 2
+    finally:
+        registry.refresh_entry_points()